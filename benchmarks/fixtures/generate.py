@@ -0,0 +1,445 @@
+"""Write NWS API fixtures for the offline benchmarks.
+
+The payloads follow the api.weather.gov GeoJSON schema with realistic
+sizes and vocabulary. They are generated from a fixed seed so the files
+only change when this script does.
+
+    python benchmarks/fixtures/generate.py
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+import json
+from pathlib import Path
+import random
+
+FIXTURES = Path(__file__).parent
+BASE_URL = "https://api.weather.gov"
+OFFICE = "CLE"
+GRID_X, GRID_Y = 77, 63
+ISSUED = datetime(2026, 10, 19, 9, 41, tzinfo=timezone.utc)
+FIRST_PERIOD = datetime(2026, 10, 19, 10, 0, tzinfo=timezone(timedelta(hours=-4)))
+
+DAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+COMPASS = ["N", "NNE", "NE", "ENE", "E", "ESE", "SE", "SSE",
+           "S", "SSW", "SW", "WSW", "W", "WNW", "NW", "NNW"]
+WEATHER = [
+    ("skc", "Sunny", "Clear"),
+    ("few", "Mostly Sunny", "Mostly Clear"),
+    ("sct", "Partly Sunny", "Partly Cloudy"),
+    ("bkn", "Mostly Cloudy", "Mostly Cloudy"),
+    ("ovc", "Cloudy", "Cloudy"),
+    ("rain_showers", "Chance Rain Showers", "Chance Rain Showers"),
+    ("rain", "Rain Likely", "Rain Likely"),
+    ("tsra_sct", "Chance Showers And Thunderstorms", "Chance Showers And Thunderstorms"),
+    ("snow", "Chance Snow Showers", "Chance Snow Showers"),
+    ("fog", "Patchy Fog", "Patchy Fog"),
+]
+
+rng = random.Random(20261019)
+
+
+def _polygon(lon: float, lat: float, size: float = 0.02) -> dict:
+    return {
+        "type": "Polygon",
+        "coordinates": [[
+            [round(lon, 4), round(lat, 4)],
+            [round(lon + size, 4), round(lat, 4)],
+            [round(lon + size, 4), round(lat + size, 4)],
+            [round(lon, 4), round(lat + size, 4)],
+            [round(lon, 4), round(lat, 4)],
+        ]],
+    }
+
+
+def _quantity(unit: str, value) -> dict:
+    return {"unitCode": f"wmoUnit:{unit}", "value": value}
+
+
+def _detailed(short: str, temperature: int, is_day: bool, wind: str, direction: str, pop) -> str:
+    high_low = "high" if is_day else "low"
+    text = f"{short}. {'Sunny' if 'Sunny' in short else 'Mostly cloudy'}, with a {high_low} near {temperature}. "
+    text += f"{direction} wind {wind}."
+    if pop:
+        text += f" Chance of precipitation is {pop}%."
+        if pop > 50:
+            text += " New rainfall amounts between a tenth and quarter of an inch possible."
+    return text
+
+
+def _period(number: int, start: datetime, hours: int, is_day: bool, name: str) -> dict:
+    icon_token, day_text, night_text = rng.choice(WEATHER)
+    short = day_text if is_day else night_text
+    pop = rng.choice([None, None, 10, 20, 30, 40, 60, 80])
+    temperature = rng.randint(55, 75) if is_day else rng.randint(35, 55)
+    low_wind = rng.randint(0, 15)
+    wind = f"{low_wind} mph" if rng.random() < 0.4 else f"{low_wind} to {low_wind + 5} mph"
+    direction = rng.choice(COMPASS)
+    time_of_day = "day" if is_day else "night"
+    icon = f"{BASE_URL}/icons/land/{time_of_day}/{icon_token}"
+    if pop:
+        icon += f",{pop}"
+    return {
+        "number": number,
+        "name": name,
+        "startTime": start.isoformat(),
+        "endTime": (start + timedelta(hours=hours)).isoformat(),
+        "isDaytime": is_day,
+        "temperature": temperature,
+        "temperatureUnit": "F",
+        "temperatureTrend": None,
+        "probabilityOfPrecipitation": _quantity("percent", pop),
+        "dewpoint": _quantity("degC", round(rng.uniform(-2, 15), 4)),
+        "relativeHumidity": _quantity("percent", rng.randint(40, 100)),
+        "windSpeed": wind,
+        "windDirection": direction,
+        "icon": icon + "?size=medium",
+        "shortForecast": short,
+        "detailedForecast": _detailed(short, temperature, is_day, wind, direction, pop)
+        if hours > 1
+        else "",
+    }
+
+
+def _forecast_properties(periods: list[dict]) -> dict:
+    return {
+        "units": "us",
+        "forecastGenerator": "BaselineForecastGenerator",
+        "generatedAt": (ISSUED + timedelta(minutes=20)).isoformat(),
+        "updateTime": ISSUED.isoformat(),
+        "validTimes": f"{ISSUED.isoformat()}/P7DT15H",
+        "elevation": {"unitCode": "wmoUnit:m", "value": 201.168},
+        "periods": periods,
+    }
+
+
+def forecast() -> dict:
+    periods = []
+    start = FIRST_PERIOD
+    for number in range(1, 15):
+        is_day = number % 2 == 1
+        day = DAY_NAMES[(start.weekday()) % 7]
+        if number == 1:
+            name = "Today"
+        elif number == 2:
+            name = "Tonight"
+        else:
+            name = day if is_day else f"{day} Night"
+        hours = 8 if number == 1 else 12
+        periods.append(_period(number, start, hours, is_day, name))
+        start = start + timedelta(hours=hours)
+    return {
+        "@context": ["https://geojson.org/geojson-ld/geojson-context.jsonld"],
+        "type": "Feature",
+        "geometry": _polygon(-81.69, 41.49),
+        "properties": _forecast_properties(periods),
+    }
+
+
+def forecast_hourly() -> dict:
+    periods = []
+    for number in range(1, 157):
+        start = FIRST_PERIOD + timedelta(hours=number - 1)
+        periods.append(_period(number, start, 1, 6 <= start.hour < 18, ""))
+    return {
+        "@context": ["https://geojson.org/geojson-ld/geojson-context.jsonld"],
+        "type": "Feature",
+        "geometry": _polygon(-81.69, 41.49),
+        "properties": _forecast_properties(periods),
+    }
+
+
+def _layer(unit: str, hours: int, step: int, low: float, high: float, digits: int = 2) -> dict:
+    values = []
+    start = ISSUED.replace(minute=0)
+    for offset in range(0, hours, step):
+        duration = f"PT{step}H"
+        values.append({
+            "validTime": f"{(start + timedelta(hours=offset)).isoformat()}/{duration}",
+            "value": round(rng.uniform(low, high), digits),
+        })
+    return {"uom": f"wmoUnit:{unit}", "values": values}
+
+
+def gridpoints() -> dict:
+    hours = 168
+    weather_values = []
+    start = ISSUED.replace(minute=0)
+    for offset in range(0, hours, 3):
+        weather_values.append({
+            "validTime": f"{(start + timedelta(hours=offset)).isoformat()}/PT3H",
+            "value": [{
+                "coverage": rng.choice(["chance", "likely", "slight_chance", None]),
+                "weather": rng.choice(["rain_showers", "thunderstorms", "snow_showers", None]),
+                "intensity": rng.choice(["light", None]),
+                "visibility": {"unitCode": "wmoUnit:km", "value": None},
+                "attributes": [],
+            }],
+        })
+    properties = {
+        "@id": f"{BASE_URL}/gridpoints/{OFFICE}/{GRID_X},{GRID_Y}",
+        "@type": "wx:Gridpoint",
+        "updateTime": ISSUED.isoformat(),
+        "validTimes": f"{ISSUED.isoformat()}/P7DT15H",
+        "elevation": {"unitCode": "wmoUnit:m", "value": 201.168},
+        "forecastOffice": f"{BASE_URL}/offices/{OFFICE}",
+        "gridId": OFFICE,
+        "gridX": GRID_X,
+        "gridY": GRID_Y,
+        "temperature": _layer("degC", hours, 1, 2, 24),
+        "dewpoint": _layer("degC", hours, 1, -2, 15),
+        "maxTemperature": _layer("degC", hours, 24, 12, 24),
+        "minTemperature": _layer("degC", hours, 24, 0, 12),
+        "relativeHumidity": _layer("percent", hours, 1, 40, 100, 0),
+        "apparentTemperature": _layer("degC", hours, 1, 0, 24),
+        "heatIndex": _layer("degC", hours, 1, 10, 26),
+        "windChill": _layer("degC", hours, 1, -5, 10),
+        "skyCover": _layer("percent", hours, 1, 0, 100, 0),
+        "windDirection": _layer("degree_(angle)", hours, 1, 0, 359, 0),
+        "windSpeed": _layer("km_h-1", hours, 1, 0, 30),
+        "windGust": _layer("km_h-1", hours, 1, 5, 45),
+        "weather": {"values": weather_values},
+        "hazards": {"values": []},
+        "probabilityOfPrecipitation": _layer("percent", hours, 1, 0, 90, 0),
+        "quantitativePrecipitation": _layer("mm", hours, 6, 0, 8),
+        "iceAccumulation": _layer("mm", hours, 6, 0, 0.5),
+        "snowfallAmount": _layer("mm", hours, 6, 0, 20),
+        "ceilingHeight": _layer("m", hours, 1, 200, 3000, 0),
+        "visibility": _layer("m", hours, 1, 1000, 16000, 0),
+        "transportWindSpeed": _layer("km_h-1", hours, 3, 5, 40),
+        "transportWindDirection": _layer("degree_(angle)", hours, 3, 0, 359, 0),
+        "mixingHeight": _layer("m", hours, 3, 300, 2000, 0),
+        "hainesIndex": _layer("1", hours, 12, 2, 5, 0),
+        "lightningActivityLevel": _layer("1", hours, 12, 1, 3, 0),
+        "twentyFootWindSpeed": _layer("km_h-1", hours, 3, 0, 30),
+        "twentyFootWindDirection": _layer("degree_(angle)", hours, 3, 0, 359, 0),
+        "probabilityOfThunder": _layer("percent", hours, 3, 0, 40, 0),
+        "pressure": {"values": []},
+    }
+    return {
+        "@context": ["https://geojson.org/geojson-ld/geojson-context.jsonld"],
+        "id": properties["@id"],
+        "type": "Feature",
+        "geometry": _polygon(-81.69, 41.49),
+        "properties": properties,
+    }
+
+
+def points() -> dict:
+    gridpoint = f"{BASE_URL}/gridpoints/{OFFICE}/{GRID_X},{GRID_Y}"
+    return {
+        "@context": ["https://geojson.org/geojson-ld/geojson-context.jsonld"],
+        "id": f"{BASE_URL}/points/41.4932,-81.6827",
+        "type": "Feature",
+        "geometry": {"type": "Point", "coordinates": [-81.6827, 41.4932]},
+        "properties": {
+            "@id": f"{BASE_URL}/points/41.4932,-81.6827",
+            "@type": "wx:Point",
+            "cwa": OFFICE,
+            "forecastOffice": f"{BASE_URL}/offices/{OFFICE}",
+            "gridId": OFFICE,
+            "gridX": GRID_X,
+            "gridY": GRID_Y,
+            "forecast": f"{gridpoint}/forecast",
+            "forecastHourly": f"{gridpoint}/forecast/hourly",
+            "forecastGridData": gridpoint,
+            "observationStations": f"{gridpoint}/stations",
+            "relativeLocation": {
+                "type": "Feature",
+                "geometry": {"type": "Point", "coordinates": [-81.6856, 41.4993]},
+                "properties": {
+                    "city": "Cleveland",
+                    "state": "OH",
+                    "distance": {"unitCode": "wmoUnit:m", "value": 721.43},
+                    "bearing": {"unitCode": "wmoUnit:degree_(angle)", "value": 160},
+                },
+            },
+            "forecastZone": f"{BASE_URL}/zones/forecast/OHZ010",
+            "county": f"{BASE_URL}/zones/county/OHC035",
+            "fireWeatherZone": f"{BASE_URL}/zones/fire/OHZ010",
+            "timeZone": "America/New_York",
+            "radarStation": "KCLE",
+        },
+    }
+
+
+STATIONS = [
+    ("KCLE", "Cleveland-Hopkins International Airport", -81.8498, 41.4057),
+    ("KBKL", "Cleveland Burke Lakefront Airport", -81.6833, 41.5167),
+    ("KCGF", "Cuyahoga County Airport", -81.4864, 41.5651),
+    ("KLNN", "Willoughby Lost Nation Municipal Airport", -81.3897, 41.6839),
+]
+
+
+def stations() -> dict:
+    features = []
+    for identifier, name, lon, lat in STATIONS:
+        features.append({
+            "id": f"{BASE_URL}/stations/{identifier}",
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [lon, lat]},
+            "properties": {
+                "@id": f"{BASE_URL}/stations/{identifier}",
+                "@type": "wx:ObservationStation",
+                "elevation": _quantity("m", round(rng.uniform(170, 300), 4)),
+                "stationIdentifier": identifier,
+                "name": name,
+                "timeZone": "America/New_York",
+                "forecast": f"{BASE_URL}/zones/forecast/OHZ010",
+                "county": f"{BASE_URL}/zones/county/OHC035",
+                "fireWeatherZone": f"{BASE_URL}/zones/fire/OHZ010",
+            },
+        })
+    return {
+        "@context": ["https://geojson.org/geojson-ld/geojson-context.jsonld"],
+        "type": "FeatureCollection",
+        "features": features,
+        "observationStations": [f"{BASE_URL}/stations/{station[0]}" for station in STATIONS],
+    }
+
+
+def observations() -> dict:
+    """Hourly observations at the nearest station, newest first as NWS returns them."""
+    identifier, _, lon, lat = STATIONS[0]
+    features = []
+    start = ISSUED.replace(minute=51) - timedelta(days=1)
+    for hour in range(24 * 8):
+        time = start + timedelta(hours=hour)
+        local_hour = (time.hour - 4) % 24
+        temperature = round(12 + 7 * (1 - abs(local_hour - 15) / 12) + rng.uniform(-2, 2), 1)
+        raining = rng.random() < 0.15
+        observation_id = f"{BASE_URL}/stations/{identifier}/observations/{time.isoformat()}"
+        features.append({
+            "id": observation_id,
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [lon, lat]},
+            "properties": {
+                "@id": observation_id,
+                "@type": "wx:ObservationStation",
+                "elevation": _quantity("m", 245),
+                "station": f"{BASE_URL}/stations/{identifier}",
+                "timestamp": time.isoformat(),
+                "rawMessage": f"{identifier} {time:%d%H%M}Z AUTO",
+                "textDescription": "Light Rain" if raining else rng.choice(
+                    ["Clear", "Partly Cloudy", "Mostly Cloudy", "Cloudy"]
+                ),
+                "icon": f"{BASE_URL}/icons/land/day/{'rain' if raining else 'sct'}?size=medium",
+                "presentWeather": [
+                    {"intensity": "light", "modifier": None, "weather": "rain", "rawString": "-RA"}
+                ] if raining else [],
+                "temperature": _quantity("degC", temperature),
+                "dewpoint": _quantity("degC", round(temperature - rng.uniform(2, 10), 1)),
+                "windDirection": _quantity("degree_(angle)", rng.randrange(0, 360, 10)),
+                "windSpeed": _quantity("km_h-1", round(rng.uniform(0, 30), 3)),
+                "windGust": _quantity("km_h-1", None),
+                "barometricPressure": _quantity("Pa", rng.randint(100500, 102500)),
+                "seaLevelPressure": _quantity("Pa", rng.randint(100500, 102500)),
+                "visibility": _quantity("m", 16090),
+                "precipitationLastHour": _quantity(
+                    "mm", round(rng.uniform(0.2, 4), 1) if raining else 0
+                ),
+                "relativeHumidity": _quantity("percent", round(rng.uniform(40, 100), 4)),
+                "windChill": _quantity("degC", None),
+                "heatIndex": _quantity("degC", None),
+            },
+        })
+    features.reverse()
+    return {
+        "@context": ["https://geojson.org/geojson-ld/geojson-context.jsonld"],
+        "type": "FeatureCollection",
+        "features": features,
+    }
+
+
+ALERT_EVENTS = [
+    ("Wind Advisory", "Moderate", "Expected"),
+    ("Lake Effect Snow Warning", "Severe", "Expected"),
+    ("Dense Fog Advisory", "Minor", "Expected"),
+    ("Small Craft Advisory", "Minor", "Expected"),
+    ("Severe Thunderstorm Warning", "Severe", "Immediate"),
+    ("Flood Watch", "Moderate", "Future"),
+]
+
+
+def alerts() -> dict:
+    features = []
+    for index in range(24):
+        event, severity, urgency = ALERT_EVENTS[index % len(ALERT_EVENTS)]
+        zones = [f"OHZ{rng.randint(1, 99):03d}" for _ in range(rng.randint(1, 6))]
+        sent = ISSUED - timedelta(minutes=rng.randint(0, 600))
+        alert_id = f"urn:oid:2.49.0.1.840.0.{rng.getrandbits(128):032x}.001.1"
+        lon = rng.uniform(-84.8, -80.6)
+        lat = rng.uniform(38.5, 41.9)
+        has_polygon = event.endswith("Warning") and "Snow" not in event
+        description = (
+            f"* WHAT...{event.split()[0]} conditions expected. "
+            + "Visibilities and travel conditions could change rapidly. " * 6
+            + "\n\n* WHERE...Portions of northeast Ohio.\n\n* WHEN...Until 10 PM EDT this evening."
+        )
+        features.append({
+            "id": f"{BASE_URL}/alerts/{alert_id}",
+            "type": "Feature",
+            "geometry": _polygon(lon, lat, 0.4) if has_polygon else None,
+            "properties": {
+                "@id": f"{BASE_URL}/alerts/{alert_id}",
+                "@type": "wx:Alert",
+                "id": alert_id,
+                "areaDesc": "; ".join(f"County {zone}" for zone in zones),
+                "geocode": {
+                    "SAME": [f"039{rng.randint(1, 175):03d}" for _ in zones],
+                    "UGC": zones,
+                },
+                "affectedZones": [f"{BASE_URL}/zones/forecast/{zone}" for zone in zones],
+                "references": [],
+                "sent": sent.isoformat(),
+                "effective": sent.isoformat(),
+                "onset": sent.isoformat(),
+                "expires": (sent + timedelta(hours=6)).isoformat(),
+                "ends": (sent + timedelta(hours=12)).isoformat(),
+                "status": "Actual",
+                "messageType": "Alert",
+                "category": "Met",
+                "severity": severity,
+                "certainty": "Likely",
+                "urgency": urgency,
+                "event": event,
+                "sender": "w-nws.webmaster@noaa.gov",
+                "senderName": f"NWS {OFFICE}",
+                "headline": f"{event} issued by NWS {OFFICE}",
+                "description": description,
+                "instruction": "Use caution while traveling. " * 3,
+                "response": "Execute",
+                "parameters": {
+                    "AWIPSidentifier": ["WSWCLE"],
+                    "WMOidentifier": ["WWUS41 KCLE 191341"],
+                    "NWSheadline": [f"{event.upper()} IN EFFECT UNTIL 10 PM EDT THIS EVENING"],
+                    "BLOCKCHANNEL": ["EAS", "NWEM", "CMAS"],
+                },
+            },
+        })
+    return {
+        "@context": ["https://geojson.org/geojson-ld/geojson-context.jsonld"],
+        "type": "FeatureCollection",
+        "features": features,
+        "title": "Current watches, warnings, and advisories for Ohio",
+        "updated": ISSUED.isoformat(),
+    }
+
+
+def main() -> None:
+    for name, build in (
+        ("forecast", forecast),
+        ("forecast_hourly", forecast_hourly),
+        ("gridpoints", gridpoints),
+        ("alerts", alerts),
+        ("points", points),
+        ("stations", stations),
+        ("observations", observations),
+    ):
+        path = FIXTURES / f"{name}.json"
+        path.write_text(json.dumps(build(), indent=4) + "\n")
+        print(f"{path.name}: {path.stat().st_size} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""Import-time benchmark for the NWS Detailed Forecast package.
+
+Each target is imported in a fresh interpreter after the modules Home
+Assistant has already loaded by the time it imports that part of the
+integration, so only the integration's own cost is measured. The median
+over several runs is compared with a budget, and the modules that cost
+the most (from ``python -X importtime``) are listed.
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --budget weather=20 --runs 15
+
+Exits with status 1 when any target is over its budget.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import statistics
+import subprocess
+import sys
+from typing import Any
+
+ROOT = Path(__file__).resolve().parent.parent
+PACKAGE = "custom_components.nwsdetailedforecast"
+
+# Loaded by Home Assistant core and the integration's dependencies
+CORE = [
+    "aiohttp",
+    "voluptuous",
+    "homeassistant.core",
+    "homeassistant.config_entries",
+    "homeassistant.helpers.config_validation",
+    "homeassistant.helpers.entity_platform",
+    "homeassistant.helpers.update_coordinator",
+    "homeassistant.components.http",
+    "homeassistant.components.websocket_api",
+]
+
+# Target module, modules loaded before it, budget in milliseconds
+TARGETS: dict[str, tuple[str, list[str], float]] = {
+    "integration": (PACKAGE, CORE, 60.0),
+    "weather": (
+        f"{PACKAGE}.weather",
+        [*CORE, PACKAGE, "homeassistant.components.weather"],
+        25.0,
+    ),
+    "sensor": (
+        f"{PACKAGE}.sensor",
+        [*CORE, PACKAGE, "homeassistant.components.sensor"],
+        25.0,
+    ),
+    "config_flow": (f"{PACKAGE}.config_flow", [*CORE, PACKAGE], 15.0),
+}
+
+PROBE = """\
+import importlib, json, sys, time
+for name in {baseline!r}:
+    importlib.import_module(name)
+before = set(sys.modules)
+start = time.perf_counter()
+importlib.import_module({target!r})
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "modules": sorted(set(sys.modules) - before)}}))
+"""
+
+
+def _probe(target: str, baseline: list[str], importtime: bool = False) -> tuple[dict[str, Any], str]:
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += ["-c", PROBE.format(baseline=baseline, target=target)]
+    result = subprocess.run(
+        command, cwd=ROOT, capture_output=True, text=True, check=False
+    )
+    if result.returncode:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return json.loads(result.stdout.strip().splitlines()[-1]), result.stderr
+
+
+def _heaviest(importtime: str, modules: set[str], count: int) -> list[dict[str, Any]]:
+    """Return the modules with the highest self time from -X importtime output."""
+    rows = []
+    for line in importtime.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = (
+            part.strip() for part in line[len("import time:"):].split("|")
+        )
+        if not self_us.isdigit() or name.strip() not in modules:
+            continue
+        rows.append(
+            {
+                "module": name.strip(),
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+            }
+        )
+    return sorted(rows, key=lambda row: row["self_ms"], reverse=True)[:count]
+
+
+def measure(name: str, runs: int, budget: float, top: int) -> dict[str, Any]:
+    target, baseline, _ = TARGETS[name]
+    try:
+        samples = [_probe(target, baseline)[0] for _ in range(runs)]
+        probe, importtime = _probe(target, baseline, importtime=True)
+    except RuntimeError as err:
+        return {"target": target, "error": str(err)}
+    median_ms = statistics.median(sample["seconds"] for sample in samples) * 1000
+    return {
+        "target": target,
+        "median_ms": median_ms,
+        "min_ms": min(sample["seconds"] for sample in samples) * 1000,
+        "budget_ms": budget,
+        "within_budget": median_ms <= budget,
+        "new_modules": len(probe["modules"]),
+        "third_party_modules": sorted(
+            module
+            for module in probe["modules"]
+            if not module.startswith(("custom_components", "homeassistant"))
+            and module.split(".")[0] not in sys.stdlib_module_names
+        ),
+        "heaviest": _heaviest(importtime, set(probe["modules"]), top),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=9)
+    parser.add_argument("--top", type=int, default=10, help="heaviest modules to list")
+    parser.add_argument(
+        "--budget",
+        action="append",
+        default=[],
+        metavar="TARGET=MS",
+        help=f"override a budget, targets: {', '.join(TARGETS)}",
+    )
+    parser.add_argument("--output", type=Path, help="write the JSON results here")
+    args = parser.parse_args()
+
+    budgets = {name: budget for name, (_, _, budget) in TARGETS.items()}
+    for override in args.budget:
+        name, _, value = override.partition("=")
+        if name not in TARGETS:
+            parser.error(f"unknown target {name}")
+        budgets[name] = float(value)
+
+    report = {
+        name: measure(name, args.runs, budgets[name], args.top) for name in TARGETS
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+
+    failed = [
+        name
+        for name, result in report.items()
+        if "error" in result or not result["within_budget"]
+    ]
+    for name in failed:
+        result = report[name]
+        reason = result.get("error") or (
+            f"{result['median_ms']:.1f}ms over the {result['budget_ms']:.0f}ms budget"
+        )
+        print(f"{name}: {reason}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
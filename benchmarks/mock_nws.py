@@ -0,0 +1,347 @@
+"""Local stand-in for api.weather.gov serving the benchmark fixtures.
+
+Serves the points, gridpoint, forecast, hourly forecast, zone forecast,
+station, observation, alert and icon routes with ETag / Last-Modified validation, and can inject latency,
+error statuses and Retry-After throttling so coordinator behaviour can be
+exercised without the real API.
+
+    python benchmarks/mock_nws.py --port 8765 --latency lognormal:-2.5,0.6 \\
+        --error-rate 0.05 --errors 500,503,429 --retry-after 30
+
+then point the integration's base URL at ``http://127.0.0.1:8765``. The
+server can also be embedded with :class:`MockNWSServer`, and its settings
+changed while running through ``POST /_mock/config``; ``GET /_mock/stats``
+returns request counts.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter
+from dataclasses import asdict, dataclass, field, fields
+from datetime import datetime
+from email.utils import formatdate
+import hashlib
+import json
+from pathlib import Path
+import random
+import time
+from typing import Any, Callable
+
+from aiohttp import web
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+NWS_BASE_URL = "https://api.weather.gov"
+
+# 1x1 transparent PNG returned for every icon
+ICON_PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000b49444154789c6360000200000500017a5eab3f0000000049454e44ae426082"
+)
+RETRY_AFTER_STATUSES = {429, 503}
+
+
+def _parse_time(value: str | None) -> datetime | None:
+    return datetime.fromisoformat(value.replace("Z", "+00:00")) if value else None
+
+
+def latency_distribution(spec: str) -> Callable[[random.Random], float]:
+    """Return a sampler for a latency spec in seconds.
+
+    ``fixed:S``, ``uniform:LOW,HIGH``, ``exponential:MEAN`` or
+    ``lognormal:MU,SIGMA`` (parameters of the underlying normal).
+    """
+    kind, _, params = spec.partition(":")
+    values = [float(value) for value in params.split(",") if value]
+    if kind in ("", "none"):
+        return lambda rng: 0.0
+    if kind == "fixed" and len(values) == 1:
+        return lambda rng: values[0]
+    if kind == "uniform" and len(values) == 2:
+        return lambda rng: rng.uniform(*values)
+    if kind == "exponential" and len(values) == 1:
+        return lambda rng: rng.expovariate(1 / values[0]) if values[0] else 0.0
+    if kind == "lognormal" and len(values) == 2:
+        return lambda rng: rng.lognormvariate(*values)
+    raise ValueError(f"Invalid latency distribution: {spec}")
+
+
+@dataclass
+class MockConfig:
+    """Behaviour of the mock server, adjustable while it runs."""
+
+    latency: str = "none"
+    error_rate: float = 0.0
+    errors: list[int] = field(default_factory=lambda: [500, 502, 503])
+    retry_after: int | None = None
+    # Routes errors are injected on, every route when empty
+    error_routes: list[str] = field(default_factory=list)
+    # Seconds between forecast reissues, which change the validators
+    reissue: float = 3600.0
+    seed: int | None = None
+
+
+class MockNWSServer:
+    """aiohttp application replaying the NWS fixtures."""
+
+    def __init__(self, config: MockConfig | None = None) -> None:
+        """Initialize the server."""
+        self.config = config or MockConfig()
+        self.requests: Counter[str] = Counter()
+        self.statuses: Counter[int] = Counter()
+        self.base_url: str | None = None
+        self._payloads: dict[str, str] = {
+            path.stem: path.read_text() for path in FIXTURES.glob("*.json")
+        }
+        # The newest observation, as /observations/latest returns it
+        self._payloads["observation_latest"] = json.dumps(
+            json.loads(self._payloads["observations"])["features"][0]
+        )
+        # The zone forecast only has the names and text of the periods
+        self._payloads["zone_forecast"] = json.dumps(
+            {
+                "type": "Feature",
+                "geometry": None,
+                "properties": {
+                    "zone": f"{NWS_BASE_URL}/zones/forecast/OHZ010",
+                    "updated": json.loads(self._payloads["forecast"])["properties"][
+                        "updateTime"
+                    ],
+                    "periods": [
+                        {
+                            "number": period["number"],
+                            "name": period["name"],
+                            "detailedForecast": period["detailedForecast"],
+                        }
+                        for period in json.loads(self._payloads["forecast"])[
+                            "properties"
+                        ]["periods"]
+                    ],
+                },
+            }
+        )
+        self._bodies: dict[str, bytes] = {}
+        self._runner: web.AppRunner | None = None
+        self._apply_config()
+
+        self.app = web.Application()
+        self.app.add_routes(
+            [
+                web.get("/points/{point}", self._handler("points")),
+                web.get("/gridpoints/{wfo}/{xy}", self._handler("gridpoints")),
+                web.get("/gridpoints/{wfo}/{xy}/forecast", self._handler("forecast")),
+                web.get(
+                    "/gridpoints/{wfo}/{xy}/forecast/hourly",
+                    self._handler("forecast_hourly"),
+                ),
+                web.get(
+                    "/gridpoints/{wfo}/{xy}/stations", self._handler("stations")
+                ),
+                web.get("/stations/{station}/observations", self._observations),
+                web.get(
+                    "/stations/{station}/observations/latest",
+                    self._handler("observation_latest"),
+                ),
+                web.get(
+                    "/zones/forecast/{zone}/forecast", self._handler("zone_forecast")
+                ),
+                web.get("/alerts/active", self._handler("alerts")),
+                web.get("/alerts/active/zone/{zone}", self._handler("alerts")),
+                web.get("/icons/{path:.*}", self._icon),
+                web.get("/_mock/stats", self._stats),
+                web.post("/_mock/config", self._update_config),
+            ]
+        )
+
+    def _apply_config(self) -> None:
+        self._rng = random.Random(self.config.seed)
+        self._latency = latency_distribution(self.config.latency)
+
+    def _body(self, name: str) -> bytes:
+        """Return a fixture with its links pointing back at this server."""
+        if (body := self._bodies.get(name)) is None:
+            text = self._payloads[name]
+            if self.base_url:
+                text = text.replace(NWS_BASE_URL, self.base_url)
+            body = self._bodies[name] = text.encode()
+        return body
+
+    def _validators(self, name: str) -> tuple[str, str]:
+        """Return the ETag and Last-Modified of the current issue of a payload."""
+        issued = int(time.time() // self.config.reissue * self.config.reissue)
+        digest = hashlib.sha1(f"{name}:{issued}".encode()).hexdigest()[:16]
+        return f'"{digest}"', formatdate(issued, usegmt=True)
+
+    def _expires(self) -> str:
+        """Return when the current issue of every payload is replaced."""
+        reissue = self.config.reissue
+        return formatdate((time.time() // reissue + 1) * reissue, usegmt=True)
+
+    async def _inject(self, route: str) -> web.Response | None:
+        """Apply the configured latency and maybe return an error response."""
+        self.requests[route] += 1
+        if (delay := self._latency(self._rng)) > 0:
+            await asyncio.sleep(delay)
+        config = self.config
+        if (
+            config.error_rate
+            and (not config.error_routes or route in config.error_routes)
+            and self._rng.random() < config.error_rate
+        ):
+            status = self._rng.choice(config.errors)
+            headers = {}
+            if config.retry_after is not None and status in RETRY_AFTER_STATUSES:
+                headers["Retry-After"] = str(config.retry_after)
+            self.statuses[status] += 1
+            return web.json_response(
+                {
+                    "correlationId": f"{self._rng.getrandbits(32):08x}",
+                    "title": "Injected error",
+                    "type": "https://api.weather.gov/problems/Unexpected",
+                    "status": status,
+                },
+                status=status,
+                headers=headers,
+                content_type="application/problem+json",
+            )
+        return None
+
+    def _handler(self, name: str):
+        async def handle(request: web.Request) -> web.Response:
+            if (error := await self._inject(name)) is not None:
+                return error
+
+            etag, last_modified = self._validators(name)
+            headers = {
+                "ETag": etag,
+                "Last-Modified": last_modified,
+                "Cache-Control": "public, max-age=900",
+                "Expires": self._expires(),
+            }
+            if request.headers.get("If-None-Match") == etag or (
+                request.headers.get("If-Modified-Since") == last_modified
+                and "If-None-Match" not in request.headers
+            ):
+                self.statuses[304] += 1
+                return web.Response(status=304, headers=headers)
+
+            self.statuses[200] += 1
+            return web.Response(
+                body=self._body(name),
+                headers=headers,
+                content_type="application/geo+json",
+            )
+
+        return handle
+
+    async def _observations(self, request: web.Request) -> web.Response:
+        """Return the observations filtered by the start, end and limit parameters."""
+        if (error := await self._inject("observations")) is not None:
+            return error
+        query = request.query
+        try:
+            start = _parse_time(query.get("start"))
+            end = _parse_time(query.get("end"))
+            limit = int(query["limit"]) if "limit" in query else None
+        except ValueError as err:
+            return web.json_response({"title": str(err), "status": 400}, status=400)
+
+        payload = json.loads(self._body("observations"))
+        features = [
+            feature
+            for feature in payload["features"]
+            if (start is None or _parse_time(feature["properties"]["timestamp"]) >= start)
+            and (end is None or _parse_time(feature["properties"]["timestamp"]) <= end)
+        ]
+        payload["features"] = features[:limit]
+        self.statuses[200] += 1
+        return web.json_response(payload, content_type="application/geo+json")
+
+    async def _icon(self, request: web.Request) -> web.Response:
+        if (error := await self._inject("icons")) is not None:
+            return error
+        self.statuses[200] += 1
+        return web.Response(body=ICON_PNG, content_type="image/png")
+
+    async def _stats(self, request: web.Request) -> web.Response:
+        return web.json_response(self.stats())
+
+    async def _update_config(self, request: web.Request) -> web.Response:
+        changes = await request.json()
+        known = {item.name for item in fields(MockConfig)}
+        if unknown := set(changes) - known:
+            return web.json_response({"unknown": sorted(unknown)}, status=400)
+        for key, value in changes.items():
+            setattr(self.config, key, value)
+        try:
+            self._apply_config()
+        except ValueError as err:
+            return web.json_response({"error": str(err)}, status=400)
+        return web.json_response(asdict(self.config))
+
+    def stats(self) -> dict[str, Any]:
+        """Return request counts per route and per status."""
+        return {
+            "requests": dict(self.requests),
+            "statuses": {str(status): count for status, count in self.statuses.items()},
+            "config": asdict(self.config),
+        }
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start listening and return the base URL to configure."""
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = site._server.sockets[0].getsockname()[1]  # noqa: SLF001
+        self.base_url = f"http://{host}:{bound_port}"
+        self._bodies.clear()
+        return self.base_url
+
+    async def stop(self) -> None:
+        """Stop the server."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+async def _serve(server: MockNWSServer, host: str, port: int) -> None:
+    base_url = await server.start(host, port)
+    print(f"Mock NWS API listening on {base_url}", flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", default="none", help="e.g. fixed:0.2, uniform:0.1,0.8, lognormal:-2.5,0.6")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests that fail")
+    parser.add_argument("--errors", default="500,502,503", help="statuses to inject, e.g. 500,503,403,429")
+    parser.add_argument("--retry-after", type=int, help="Retry-After seconds sent with 429 and 503")
+    parser.add_argument("--error-routes", default="", help="routes that fail, e.g. forecast,zone_forecast (all when empty)")
+    parser.add_argument("--reissue", type=float, default=3600.0, help="seconds between forecast reissues")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    config = MockConfig(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        errors=[int(status) for status in args.errors.split(",")],
+        retry_after=args.retry_after,
+        error_routes=[route for route in args.error_routes.split(",") if route],
+        reissue=args.reissue,
+        seed=args.seed,
+    )
+    latency_distribution(config.latency)
+    try:
+        asyncio.run(_serve(MockNWSServer(config), args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,375 @@
+"""Offline micro-benchmarks of the NWS Detailed Forecast hot paths.
+
+Replays the recorded NWS payloads in ``benchmarks/fixtures`` through the
+integration's parsing, model and entity code and prints the timings as
+JSON, so runs from different versions can be diffed.
+
+    python benchmarks/run.py --output before.json
+    python benchmarks/run.py --compare before.json
+
+Nothing touches the network; entities are built against a coordinator
+stand-in holding the replayed data.
+"""
+from __future__ import annotations
+
+import argparse
+import copy
+import json
+from pathlib import Path
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
+import timeit
+from typing import Any, Callable
+
+ROOT = Path(__file__).resolve().parent.parent
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+PAYLOADS = ("forecast", "forecast_hourly", "gridpoints", "alerts")
+
+sys.path.insert(0, str(ROOT))
+
+
+class Skip(Exception):
+    """Raised by a benchmark setup that cannot run in this environment."""
+
+
+def _load(name: str) -> bytes:
+    return (FIXTURES / f"{name}.json").read_bytes()
+
+
+def _model(name: str):
+    """Return an ingested NWSForecast built from a fixture."""
+    from custom_components.nwsdetailedforecast.parsing import ingest_periods
+    from custom_components.nwsdetailedforecast.weather_update_coordinator import (
+        NWSForecast,
+    )
+
+    data = json.loads(_load(name))
+    ingest_periods(data["properties"]["periods"])
+    return NWSForecast(data, 200, {})
+
+
+def _coordinator(data) -> SimpleNamespace:
+    """Return a stand-in exposing what entities read from the coordinator."""
+    from custom_components.nwsdetailedforecast.metrics import PerfStats
+
+    return SimpleNamespace(
+        data=data,
+        perf_stats=PerfStats(),
+        last_update_success=True,
+        async_add_listener=lambda *args: lambda: None,
+    )
+
+
+def bench_decode(name: str) -> Callable[[], Callable[[], Any]]:
+    def setup():
+        body = _load(name)
+        return lambda: json.loads(body)
+
+    return setup
+
+
+def bench_ingest(name: str) -> Callable[[], Callable[[], Any]]:
+    def setup():
+        from custom_components.nwsdetailedforecast.parsing import ingest_periods
+
+        periods = json.loads(_load(name))["properties"]["periods"]
+        # Ingest annotates in place, so each run starts from a fresh copy
+        return lambda: ingest_periods(copy.deepcopy(periods))
+
+    return setup
+
+
+def bench_pipeline(name: str) -> Callable[[], Callable[[], Any]]:
+    def setup():
+        from custom_components.nwsdetailedforecast.pipeline import TransformPipeline
+        from custom_components.nwsdetailedforecast.weather_update_coordinator import (
+            FORECAST_STAGES,
+        )
+
+        body = _load(name)
+        pipeline = TransformPipeline(FORECAST_STAGES)
+        # The executor job of an update, without the card product
+        return lambda: pipeline.run(body, pipeline.stages, {})
+
+    return setup
+
+
+def bench_model(name: str) -> Callable[[], Callable[[], Any]]:
+    def setup():
+        from custom_components.nwsdetailedforecast.weather_update_coordinator import (
+            NWSForecast,
+        )
+
+        data = json.loads(_load(name))
+        return lambda: NWSForecast(data, 200, {})
+
+    return setup
+
+
+def bench_map_forecast(name: str) -> Callable[[], Callable[[], Any]]:
+    def setup():
+        try:
+            from custom_components.nwsdetailedforecast.weather import (
+                _map_twicedaily_forecast,
+            )
+        except Exception as err:  # noqa: BLE001
+            raise Skip(f"weather platform does not import: {err!r}") from err
+
+        periods = _model(name).twicedaily().data
+        return lambda: [_map_twicedaily_forecast(period) for period in periods]
+
+    return setup
+
+
+def bench_sensor(key: str, units: str = "us") -> Callable[[], Callable[[], Any]]:
+    def setup():
+        try:
+            from custom_components.nwsdetailedforecast.const import DOMAIN
+            from custom_components.nwsdetailedforecast.sensor import (
+                SENSOR_TYPES,
+                NWSDetailedForecastSensor,
+            )
+        except Exception as err:  # noqa: BLE001
+            raise Skip(f"sensor platform does not import: {err!r}") from err
+
+        coordinator = _coordinator(_model("forecast"))
+        sensors = [
+            NWSDetailedForecastSensor(
+                coordinator, key, "Bench", f"bench_{key}_{hour}", hour,
+                SENSOR_TYPES[key], units,
+            )
+            for hour in range(14)
+        ]
+        for sensor in sensors:
+            sensor.hass = SimpleNamespace(data={DOMAIN: {}})
+
+        def run():
+            return [sensor.native_value for sensor in sensors]
+
+        run()
+        return run
+
+    return setup
+
+
+def bench_weather_properties() -> Callable[[], Any]:
+    try:
+        from custom_components.nwsdetailedforecast.weather import NWSDetailedForecast
+    except Exception as err:  # noqa: BLE001
+        raise Skip(f"weather platform does not import: {err!r}") from err
+
+    entity = NWSDetailedForecast(
+        "Bench", "bench", "twicedaily", _coordinator(_model("forecast"))
+    )
+
+    def run():
+        return (
+            entity.available,
+            entity.native_temperature,
+            entity.relativeHumidity,
+            entity.native_wind_speed,
+            entity.native_wind_speed_unit,
+            entity.wind_bearing,
+            entity.condition,
+        )
+
+    run()
+    return run
+
+
+def bench_archive_valid_at(issuances: int) -> Callable[[], Callable[[], Any]]:
+    def setup():
+        from datetime import timedelta
+        import tempfile
+
+        from custom_components.nwsdetailedforecast.archive import (
+            ForecastArchive,
+            period_row,
+        )
+
+        periods = _model("forecast_hourly").twicedaily().data
+        rows = [period_row(period.d) for period in periods]
+        directory = tempfile.mkdtemp(prefix="nws-archive-")
+        archive = ForecastArchive(
+            None, None, str(Path(directory) / "bench.nwsa"), timedelta(days=365)
+        )
+        archive._load()  # noqa: SLF001
+        # One issuance an hour, each shifted forward like a real reissue
+        for hour in range(issuances):
+            shift = hour * 3600
+            archive.append(
+                rows[0][0] + shift,
+                [(start + shift, end + shift, *rest) for start, end, *rest in rows],
+                rows[0][0] + shift,
+            )
+        when = rows[0][0] + issuances * 3600 + 1800
+        return lambda: archive.valid_at(when)
+
+    return setup
+
+
+def bench_precipitation_total(hours: int) -> Callable[[], Callable[[], Any]]:
+    def setup():
+        from custom_components.nwsdetailedforecast.precipitation import (
+            PrecipitationTotals,
+        )
+
+        totals = PrecipitationTotals.from_gridpoint(
+            json.loads(_load("gridpoints"))["properties"]
+        )
+        start = totals.start + 5400
+        return lambda: totals.total("precipitation", start, start + hours * 3600)
+
+    return setup
+
+
+def bench_alerts_match(locations: int) -> Callable[[], Callable[[], Any]]:
+    def setup():
+        from custom_components.nwsdetailedforecast.alerts import AlertIndex
+
+        index = AlertIndex(json.loads(_load("alerts"))["features"])
+        # Points spread over the state the alerts cover
+        points = [
+            (38.5 + 3.4 * (i * 7 % locations) / locations, -84.8 + 4.2 * i / locations)
+            for i in range(locations)
+        ]
+        return lambda: [index.match(lat, lon, ["OHZ022"]) for lat, lon in points]
+
+    return setup
+
+
+BENCHMARKS: dict[str, Callable[[], Callable[[], Any]]] = {
+    **{f"decode.{name}": bench_decode(name) for name in PAYLOADS},
+    "ingest.forecast": bench_ingest("forecast"),
+    "ingest.forecast_hourly": bench_ingest("forecast_hourly"),
+    "model.forecast": bench_model("forecast"),
+    "model.forecast_hourly": bench_model("forecast_hourly"),
+    "pipeline.forecast": bench_pipeline("forecast"),
+    "pipeline.forecast_hourly": bench_pipeline("forecast_hourly"),
+    "weather.map_twicedaily_forecast": bench_map_forecast("forecast"),
+    "weather.properties": bench_weather_properties,
+    "archive.valid_at.100": bench_archive_valid_at(100),
+    "precipitation.total.72h": bench_precipitation_total(72),
+    "alerts.match.100": bench_alerts_match(100),
+    **{
+        f"sensor.native_value.{key}": bench_sensor(key)
+        for key in (
+            "shortForecast",
+            "temperature",
+            "dewpoint",
+            "windSpeed",
+            "relativeHumidity",
+            "feels_like_temperature",
+            "icon",
+        )
+    },
+}
+
+
+def measure(run: Callable[[], Any], repeat: int, min_time: float) -> dict[str, Any]:
+    """Time a callable, scaling the loop count to at least min_time per repeat."""
+    timer = timeit.Timer(run)
+    number = 1
+    while True:
+        if timer.timeit(number) >= min_time:
+            break
+        number *= 2
+    samples = [total / number for total in timer.repeat(repeat, number)]
+    return {
+        "loops": number,
+        "repeat": repeat,
+        "min_us": min(samples) * 1e6,
+        "median_us": statistics.median(samples) * 1e6,
+        "mean_us": statistics.fmean(samples) * 1e6,
+        "stdev_us": statistics.stdev(samples) * 1e6 if repeat > 1 else 0.0,
+    }
+
+
+def _environment() -> dict[str, Any]:
+    manifest = json.loads(
+        (ROOT / "custom_components" / "nwsdetailedforecast" / "manifest.json").read_text()
+    )
+    try:
+        revision = subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = None
+    return {
+        "version": manifest.get("version"),
+        "revision": revision,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "fixtures": {
+            name: (FIXTURES / f"{name}.json").stat().st_size for name in PAYLOADS
+        },
+    }
+
+
+def run_all(selected: list[str], repeat: int, min_time: float) -> dict[str, Any]:
+    results: dict[str, Any] = {}
+    for name in selected:
+        try:
+            run = BENCHMARKS[name]()
+        except Skip as err:
+            results[name] = {"skipped": str(err)}
+            continue
+        except ImportError as err:
+            results[name] = {"skipped": f"missing dependency: {err.name or err}"}
+            continue
+        except Exception as err:  # noqa: BLE001
+            results[name] = {"error": repr(err)}
+            continue
+        try:
+            results[name] = measure(run, repeat, min_time)
+        except Exception as err:  # noqa: BLE001
+            results[name] = {"error": repr(err)}
+    return {"environment": _environment(), "results": results}
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any]) -> str:
+    """Return a table of median ratios against a previous run."""
+    lines = [f"{'benchmark':<40} {'before us':>12} {'after us':>12} {'ratio':>8}"]
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name, {}).get("median_us")
+        after = result.get("median_us")
+        if before is None or after is None:
+            status = result.get("skipped") or result.get("error") or "new"
+            lines.append(f"{name:<40} {status}")
+            continue
+        lines.append(f"{name:<40} {before:>12.2f} {after:>12.2f} {after / before:>8.2f}")
+    return "\n".join(lines)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", "--filter", default="", help="only run benchmarks containing this text")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--min-time", type=float, default=0.05, help="seconds per repeat")
+    parser.add_argument("--output", type=Path, help="write the JSON results here")
+    parser.add_argument("--compare", type=Path, help="previous JSON results to compare with")
+    args = parser.parse_args()
+
+    selected = [name for name in BENCHMARKS if args.filter in name]
+    report = run_all(selected, args.repeat, args.min_time)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        print(compare(json.loads(args.compare.read_text()), report), file=sys.stderr)
+
+    return 1 if any("error" in result for result in report["results"].values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,374 @@
+"""Scale and load harness for NWS Detailed Forecast.
+
+Boots a Home Assistant core in a scratch config directory, starts the
+mock NWS server and adds config entries through the config flow in steps
+(for example 1, 10, 50, 100, 250 entries). At each step it measures:
+
+- setup time, from starting the flows until every new coordinator has
+  finished its first refresh
+- steady-state polling over a fixed window: event loop lag, state writes
+  per second, NWS requests per second and the time each update held the
+  event loop
+- resident memory after setup and after polling
+- time to reload every entry
+
+The results are printed as JSON, one object per step.
+
+    python benchmarks/scale.py --steps 1,10,50,100 --periods 4 --poll 60
+
+It needs ``homeassistant`` installed; no network access is used.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from contextlib import suppress
+import json
+import logging
+from pathlib import Path
+import resource
+import socket
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from mock_nws import MockConfig, MockNWSServer  # noqa: E402
+
+DOMAIN = "nwsdetailedforecast"
+CONFIGURATION = """\
+homeassistant:
+  name: Scale test
+  latitude: 41.4932
+  longitude: -81.6827
+  elevation: 201
+  unit_system: us_customary
+  time_zone: America/New_York
+http:
+  server_host: 127.0.0.1
+  server_port: {port}
+logger:
+  default: warning
+"""
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _rss_bytes() -> int:
+    """Return the current resident set size, or the peak where unavailable."""
+    with suppress(OSError):
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _percentile(samples: list[float], fraction: float) -> float | None:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class LoopLagMonitor:
+    """Measure how late the event loop wakes a task that sleeps a fixed time."""
+
+    def __init__(self, interval: float = 0.05) -> None:
+        self.interval = interval
+        self.samples: list[float] = []
+        self._task: asyncio.Task | None = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - start - self.interval))
+
+    def start(self) -> None:
+        self.samples = []
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> dict[str, Any]:
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+        return {
+            "samples": len(self.samples),
+            "mean_ms": statistics.fmean(self.samples) * 1000 if self.samples else None,
+            "p50_ms": (_percentile(self.samples, 0.5) or 0) * 1000,
+            "p99_ms": (_percentile(self.samples, 0.99) or 0) * 1000,
+            "max_ms": max(self.samples, default=0) * 1000,
+        }
+
+
+class ScaleHarness:
+    """Drive a Home Assistant instance with a growing number of entries."""
+
+    def __init__(self, args: argparse.Namespace, base_url: str) -> None:
+        self.args = args
+        self.base_url = base_url
+        self.hass = None
+        self.entry_ids: list[str] = []
+        self._config_dir = tempfile.TemporaryDirectory(prefix="nws-scale-")
+
+    async def async_start(self) -> float:
+        """Boot Home Assistant with the integration available, returning seconds taken."""
+        from homeassistant import bootstrap, runner
+
+        config_dir = Path(self._config_dir.name)
+        (config_dir / "configuration.yaml").write_text(
+            CONFIGURATION.format(port=_free_port())
+        )
+        (config_dir / "custom_components").mkdir()
+        (config_dir / "custom_components" / DOMAIN).symlink_to(
+            ROOT / "custom_components" / DOMAIN
+        )
+
+        start = time.perf_counter()
+        self.hass = await bootstrap.async_setup_hass(
+            runner.RuntimeConfig(config_dir=str(config_dir), skip_pip=True)
+        )
+        if self.hass is None:
+            raise RuntimeError("Home Assistant failed to start")
+        await self.hass.async_start()
+        # Keep the harness output readable over Home Assistant's own logging
+        logging.getLogger().setLevel(logging.WARNING)
+        return time.perf_counter() - start
+
+    async def async_stop(self) -> None:
+        if self.hass is not None:
+            await self.hass.async_stop()
+        self._config_dir.cleanup()
+
+    def _entry_data(self, index: int) -> dict[str, Any]:
+        args = self.args
+        return {
+            "name": f"Scale {index}",
+            "api_key": "scale-test",
+            "location": f"scale-{index}",
+            "scan_interval": args.scan_interval,
+            "stationID": "CLE",
+            "gridCoords": f"{index // 1000},{index % 1000}",
+            "nws_detailed_platform": ["Sensor", "Weather"],
+            "twicedaily_forecast": ",".join(str(hour) for hour in range(args.periods)),
+            "units": "us",
+            "deferred_startup": not args.await_first_refresh,
+            "expose_metrics": args.metrics,
+            "base_url": self.base_url,
+        }
+
+    def _coordinators(self, entry_ids: list[str]) -> list[Any]:
+        domain_data = self.hass.data[DOMAIN]
+        return [
+            domain_data[entry_id]["weather_coordinator"]
+            for entry_id in entry_ids
+            if entry_id in domain_data
+        ]
+
+    async def _async_wait_for_data(self, entry_ids: list[str], timeout: float) -> bool:
+        """Wait until every entry is loaded and has data."""
+        from homeassistant.config_entries import ConfigEntryState
+
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            states = [
+                self.hass.config_entries.async_get_entry(entry_id).state
+                for entry_id in entry_ids
+            ]
+            if any(
+                state in (ConfigEntryState.SETUP_ERROR, ConfigEntryState.NOT_LOADED)
+                for state in states
+            ):
+                return False
+            coordinators = self._coordinators(entry_ids)
+            if (
+                all(state is ConfigEntryState.LOADED for state in states)
+                and len(coordinators) == len(entry_ids)
+                and all(coordinator.data is not None for coordinator in coordinators)
+            ):
+                return True
+            await asyncio.sleep(0.05)
+        return False
+
+    async def async_add_entries(self, count: int) -> dict[str, Any]:
+        """Add entries through the config flow until there are count of them."""
+        from homeassistant.config_entries import SOURCE_IMPORT
+
+        hass = self.hass
+        first = len(self.entry_ids)
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(
+                hass.config_entries.flow.async_init(
+                    DOMAIN, context={"source": SOURCE_IMPORT}, data=self._entry_data(index)
+                )
+                for index in range(first, count)
+            )
+        )
+        new_ids = [
+            result["result"].entry_id for result in results if result.get("type") == "create_entry"
+        ]
+        flows = time.perf_counter() - start
+        ready = await self._async_wait_for_data(new_ids, self.args.setup_timeout)
+        self.entry_ids.extend(new_ids)
+        return {
+            "added": len(new_ids),
+            "failed_flows": (count - first) - len(new_ids),
+            "flows_seconds": flows,
+            "setup_seconds": time.perf_counter() - start,
+            "all_ready": ready,
+        }
+
+    def _state_writes(self) -> int:
+        return sum(
+            coordinator.perf_stats.counters["state_writes"]
+            for coordinator in self._coordinators(self.entry_ids)
+        )
+
+    async def async_poll(self, seconds: float, mock: MockNWSServer) -> dict[str, Any]:
+        """Let the coordinators poll and measure loop lag and throughput."""
+        from homeassistant.const import EVENT_STATE_CHANGED
+
+        hass = self.hass
+        state_changes = 0
+
+        def count(event) -> None:
+            nonlocal state_changes
+            state_changes += 1
+
+        unsub = hass.bus.async_listen(EVENT_STATE_CHANGED, count)
+        writes_before = self._state_writes()
+        requests_before = sum(mock.requests.values())
+        monitor = LoopLagMonitor()
+        monitor.start()
+        start = time.perf_counter()
+        await asyncio.sleep(seconds)
+        elapsed = time.perf_counter() - start
+        lag = await monitor.stop()
+        unsub()
+
+        coordinators = self._coordinators(self.entry_ids)
+        return {
+            "seconds": elapsed,
+            "loop_lag": lag,
+            "state_writes_per_second": (self._state_writes() - writes_before) / elapsed,
+            "state_changed_per_second": state_changes / elapsed,
+            "requests_per_second": (sum(mock.requests.values()) - requests_before)
+            / elapsed,
+            "failing_coordinators": sum(
+                not coordinator.last_update_success for coordinator in coordinators
+            ),
+            # Worst coordinator, each update from its start through publishing
+            "loop_blocked_p99_ms": max(
+                (
+                    histogram.percentile(0.99) * 1000
+                    for coordinator in coordinators
+                    if (histogram := coordinator.perf_stats.histograms.get("loop_blocked"))
+                    and histogram.last is not None
+                ),
+                default=None,
+            ),
+        }
+
+    async def async_reload(self) -> dict[str, Any]:
+        """Reload every entry at once and wait for them to have data again."""
+        monitor = LoopLagMonitor()
+        monitor.start()
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(
+                self.hass.config_entries.async_reload(entry_id)
+                for entry_id in self.entry_ids
+            )
+        )
+        ready = await self._async_wait_for_data(self.entry_ids, self.args.setup_timeout)
+        return {
+            "seconds": time.perf_counter() - start,
+            "all_ready": ready,
+            "loop_lag": await monitor.stop(),
+        }
+
+
+async def async_main(args: argparse.Namespace) -> list[dict[str, Any]]:
+    mock = MockNWSServer(
+        MockConfig(
+            latency=args.latency,
+            error_rate=args.error_rate,
+            reissue=args.reissue,
+            seed=0,
+        )
+    )
+    base_url = await mock.start()
+    harness = ScaleHarness(args, base_url)
+    report: list[dict[str, Any]] = []
+    try:
+        boot = await harness.async_start()
+        print(f"Home Assistant started in {boot:.2f}s", file=sys.stderr)
+        for step in args.steps:
+            result: dict[str, Any] = {"entries": step}
+            result["setup"] = await harness.async_add_entries(step)
+            result["entities"] = len(harness.hass.states.async_all())
+            result["rss_after_setup"] = _rss_bytes()
+            result["poll"] = await harness.async_poll(args.poll, mock)
+            result["rss_after_poll"] = _rss_bytes()
+            if not args.skip_reload:
+                result["reload"] = await harness.async_reload()
+            report.append(result)
+            print(
+                f"{step} entries: setup {result['setup']['setup_seconds']:.2f}s, "
+                f"loop lag p99 {result['poll']['loop_lag']['p99_ms']:.1f}ms, "
+                f"update loop time p99 {result['poll']['loop_blocked_p99_ms'] or 0:.1f}ms, "
+                f"{result['poll']['state_writes_per_second']:.1f} writes/s, "
+                f"rss {result['rss_after_poll'] / 2**20:.0f} MiB",
+                file=sys.stderr,
+            )
+    finally:
+        await harness.async_stop()
+        await mock.stop()
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--steps",
+        type=lambda value: [int(step) for step in value.split(",")],
+        default=[1, 10, 50, 100],
+        help="total entry counts to measure, in increasing order",
+    )
+    parser.add_argument("--periods", type=int, default=4, help="forecast period sensors per condition")
+    parser.add_argument("--scan-interval", type=int, default=10, help="seconds between coordinator polls")
+    parser.add_argument("--poll", type=float, default=30.0, help="seconds of steady-state polling per step")
+    parser.add_argument("--latency", default="lognormal:-2.5,0.6", help="mock NWS latency distribution")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--reissue", type=float, default=10.0, help="seconds between mock forecast reissues")
+    parser.add_argument("--setup-timeout", type=float, default=300.0)
+    parser.add_argument("--await-first-refresh", action="store_true", help="disable deferred startup")
+    parser.add_argument("--metrics", action="store_true", help="enable the Prometheus metrics option")
+    parser.add_argument("--skip-reload", action="store_true")
+    parser.add_argument("--output", type=Path, help="write the JSON results here")
+    args = parser.parse_args()
+    if args.steps != sorted(args.steps):
+        parser.error("--steps must be increasing")
+
+    report = asyncio.run(async_main(args))
+    text = json.dumps({"arguments": {**vars(args), "output": None}, "steps": report}, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,9 @@
 from __future__ import annotations
 
 import logging
+import time
+
+import voluptuous as vol
 
 from typing   import Any
 from datetime import timedelta
@@ -15,8 +18,10 @@ from homeassistant.const import (
     CONF_NAME,
     CONF_MONITORED_CONDITIONS,
     CONF_SCAN_INTERVAL,
+    EVENT_HOMEASSISTANT_STOP,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import Event, HomeAssistant
+from homeassistant.helpers.typing import ConfigType
 
 from .const import (
     DOMAIN,
@@ -25,22 +30,129 @@ from .const import (
     PLATFORMS,
     UPDATE_LISTENER,
     CONF_UNITS,
+    CONF_STATION_IDENTIFIER,
+    CONF_GRID_IDENTIFIER,
+    CONF_TWICEDAILY_FORECAST,
     NWS_PLATFORMS,
     NWS_PLATFORM,
+    CONF_DEFERRED_STARTUP,
+    DEFAULT_DEFERRED_STARTUP,
+    DEFAULT_FORECAST_MODE,
+    DEFAULT_MONITORED_CONDITIONS,
+    DEFAULT_UNITS,
+    ENTRY_SETUP_METRICS,
+    DATA_ICON_CACHE,
+    ENTRY_CARD_PAYLOAD,
+    CONF_EXPOSE_METRICS,
+    DEFAULT_EXPOSE_METRICS,
+    DATA_METRICS_REGISTRY,
+    CONF_BASE_URL,
+    DEFAULT_BASE_URL,
+    CONF_ARCHIVE,
+    DEFAULT_ARCHIVE,
+    CONF_ARCHIVE_DAYS,
+    DEFAULT_ARCHIVE_DAYS,
+    ENTRY_ARCHIVE,
+    CONF_VERIFICATION,
+    DEFAULT_VERIFICATION,
+    ENTRY_VERIFIER,
+    CONF_OBSERVATIONS,
+    DEFAULT_OBSERVATIONS,
+    DATA_OBSERVATION_HUB,
+    ENTRY_CURRENT_OBSERVATION,
+    CONF_PRECIPITATION,
+    DEFAULT_PRECIPITATION,
+    ENTRY_PRECIPITATION,
+    CONF_MEMORY_BUDGET,
+    DEFAULT_MEMORY_BUDGET,
+    DATA_FORECAST_STORE,
+    DATA_LOOKUP_CACHE,
+    CONF_ZONE_FALLBACK,
+    DEFAULT_ZONE_FALLBACK,
+    CONF_ALERTS,
+    DEFAULT_ALERTS,
+    DATA_ALERT_HUB,
+    ENTRY_ALERTS,
 )
 
-from .weather_update_coordinator import WeatherUpdateCoordinator
+from .alerts import AlertHub
+from .archive import ForecastArchive, archive_path, async_setup_archive
 
-CONF_TWICEDAILY_FORECAST = "twicedaily_forecast"
-CONF_STATION_IDENTIFIER = "stationID"
-CONF_GRID_IDENTIFIER = "gridCoords"
+from .card import CardPayloadCache, async_setup_card
+from .icon_cache import IconCache, NWSIconView
+from .lookup import async_setup_lookup
+from .observations import ObservationHub
+from .parsing import TEXT_POOL
+from .precipitation import PrecipitationCoordinator, async_setup_precipitation
+from .prometheus import MetricsRegistry, NWSMetricsView
+from .store import SHARED, ForecastData, ForecastStore
+from .subscription import async_setup_subscription
+from .verification import ForecastVerifier, ObservationCoordinator
+from .weather_update_coordinator import WeatherUpdateCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 ATTRIBUTION = "Powered by the National Weather Service"
 
+CONFIG_SCHEMA = vol.Schema(
+    {
+        vol.Optional(DOMAIN): vol.Schema(
+            {
+                vol.Optional(
+                    CONF_MEMORY_BUDGET, default=DEFAULT_MEMORY_BUDGET
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            }
+        )
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the resources shared by all NWS Detailed Forecast entries."""
+    hass.data.setdefault(DOMAIN, {})
+
+    icon_cache = IconCache(hass, hass.config.path(".cache", DOMAIN, "icons"))
+    await icon_cache.async_load()
+    hass.data[DOMAIN][DATA_ICON_CACHE] = icon_cache
+    hass.http.register_view(NWSIconView(icon_cache))
+    async_setup_card(hass)
+    async_setup_subscription(hass)
+    async_setup_archive(hass)
+    async_setup_precipitation(hass)
+    async_setup_lookup(hass)
+
+    observation_hub = hass.data[DOMAIN][DATA_OBSERVATION_HUB] = ObservationHub(hass)
+    alert_hub = hass.data[DOMAIN][DATA_ALERT_HUB] = AlertHub(
+        hass, hass.data[DOMAIN][DATA_LOOKUP_CACHE]
+    )
+
+    # The memory budget is in MiB
+    budget = config.get(DOMAIN, {}).get(CONF_MEMORY_BUDGET, DEFAULT_MEMORY_BUDGET)
+    store = ForecastStore(hass, budget * 2**20)
+    hass.data[DOMAIN][DATA_FORECAST_STORE] = store
+    store.async_register(
+        SHARED, {"lookup": hass.data[DOMAIN][DATA_LOOKUP_CACHE], "text": TEXT_POOL}
+    )
+    stop_store = store.async_start()
+
+    async def _async_shutdown(event: Event) -> None:
+        """Stop the shared hubs and the memory checks."""
+        await observation_hub.async_shutdown()
+        await alert_hub.async_shutdown()
+        stop_store()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_shutdown)
+
+    metrics_registry = MetricsRegistry()
+    hass.data[DOMAIN][DATA_METRICS_REGISTRY] = metrics_registry
+    hass.http.register_view(NWSMetricsView(metrics_registry))
+
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up NWS Detailed Weather as config entry."""
+    setup_start = time.monotonic()
     name = entry.data[CONF_NAME]
     api_key = entry.data[CONF_API_KEY]
     location = entry.data.get(CONF_LOCATION, hass.config.location_name)
@@ -49,6 +161,29 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     forecast_twicedaily = _get_config_value(entry, CONF_TWICEDAILY_FORECAST)
     nws_entity_platform = _get_config_value(entry, NWS_PLATFORM)
     nws_scan_Int = entry.data[CONF_SCAN_INTERVAL]
+    units = _get_config_option(entry, CONF_UNITS, DEFAULT_UNITS)
+    monitored_conditions = _get_config_option(
+        entry, CONF_MONITORED_CONDITIONS, DEFAULT_MONITORED_CONDITIONS
+    )
+    deferred_startup = _get_config_option(
+        entry, CONF_DEFERRED_STARTUP, DEFAULT_DEFERRED_STARTUP
+    )
+    expose_metrics = _get_config_option(
+        entry, CONF_EXPOSE_METRICS, DEFAULT_EXPOSE_METRICS
+    )
+    base_url = _get_config_option(entry, CONF_BASE_URL, DEFAULT_BASE_URL)
+    archive_forecasts = _get_config_option(entry, CONF_ARCHIVE, DEFAULT_ARCHIVE)
+    verify_forecasts = _get_config_option(
+        entry, CONF_VERIFICATION, DEFAULT_VERIFICATION
+    )
+    current_observations = _get_config_option(
+        entry, CONF_OBSERVATIONS, DEFAULT_OBSERVATIONS
+    )
+    precipitation_totals = _get_config_option(
+        entry, CONF_PRECIPITATION, DEFAULT_PRECIPITATION
+    )
+    zone_fallback = _get_config_option(entry, CONF_ZONE_FALLBACK, DEFAULT_ZONE_FALLBACK)
+    area_alerts = _get_config_option(entry, CONF_ALERTS, DEFAULT_ALERTS)
 
     # _LOGGER.warning(forecast_days)
     if isinstance(forecast_twicedaily, str):
@@ -65,14 +200,116 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unique_location = f"nws-{location}"
 
     hass.data.setdefault(DOMAIN, {})
-    # Create and link weather WeatherUpdateCoordinator
+    # Create and link weather WeatherUpdateCoordinator. Zone forecasts go
+    # through the lookup cache, so entries in the same zone share them
     weather_coordinator = WeatherUpdateCoordinator(
-        api_key, station, grid, timedelta(seconds=nws_scan_Int), hass
+        api_key,
+        station,
+        grid,
+        timedelta(seconds=nws_scan_Int),
+        hass,
+        base_url,
+        hass.data[DOMAIN].get(DATA_LOOKUP_CACHE) if zone_fallback else None,
     )
     hass.data[DOMAIN][unique_location] = weather_coordinator
 
-    # await weather_coordinator.async_refresh()
-    await weather_coordinator.async_config_entry_first_refresh()
+    setup_metrics = {
+        "deferred_startup": deferred_startup,
+        "setup_duration": None,
+        "first_refresh_duration": None,
+        "first_refresh_success": None,
+    }
+
+    # Without deferred startup the entry is not set up until NWS has answered
+    if not deferred_startup:
+        refresh_start = time.monotonic()
+        await weather_coordinator.async_config_entry_first_refresh()
+        setup_metrics["first_refresh_duration"] = time.monotonic() - refresh_start
+        setup_metrics["first_refresh_success"] = True
+
+    card_cache = CardPayloadCache(
+        weather_coordinator, hass.data[DOMAIN].get(DATA_ICON_CACHE)
+    )
+    entry.async_on_unload(card_cache.async_start())
+
+    # Current conditions come from the nearest station, polled with the
+    # stations of the other entries
+    current_observation = None
+    if current_observations:
+        current_observation, untrack = hass.data[DOMAIN][
+            DATA_OBSERVATION_HUB
+        ].async_track(station, grid, base_url)
+        entry.async_on_unload(untrack)
+
+    # Alerts are fetched once per state for every entry and matched to the
+    # gridpoint locally
+    location_alerts = None
+    if area_alerts:
+        location_alerts, untrack = hass.data[DOMAIN][DATA_ALERT_HUB].async_track(
+            weather_coordinator, base_url
+        )
+        entry.async_on_unload(untrack)
+
+    # Verification scores the archived forecasts, so it needs the archive
+    archive = None
+    if archive_forecasts or verify_forecasts:
+        archive = ForecastArchive(
+            hass,
+            weather_coordinator,
+            archive_path(hass, station, grid),
+            timedelta(
+                days=_get_config_option(entry, CONF_ARCHIVE_DAYS, DEFAULT_ARCHIVE_DAYS)
+            ),
+        )
+        await archive.async_load()
+        entry.async_on_unload(archive.async_start())
+
+    verifier = None
+    if verify_forecasts:
+        verifier = ForecastVerifier(
+            hass,
+            archive,
+            ObservationCoordinator(hass, station, grid, base_url),
+            f"{DOMAIN}.verification.{entry.entry_id}",
+        )
+        await verifier.async_load()
+        entry.async_on_unload(verifier.async_start())
+        entry.async_create_background_task(
+            hass,
+            verifier.coordinator.async_refresh(),
+            f"{DOMAIN} first observations {name}",
+        )
+
+    precipitation = None
+    if precipitation_totals:
+        precipitation = PrecipitationCoordinator(hass, station, grid, base_url)
+        entry.async_on_unload(precipitation.async_start())
+        entry.async_create_background_task(
+            hass,
+            precipitation.async_refresh(),
+            f"{DOMAIN} first gridpoint layers {name}",
+        )
+
+    # The archive and card history can be rebuilt, so they go first when
+    # the locations together outgrow the memory budget
+    parts = {"forecast": ForecastData(weather_coordinator), "card": card_cache}
+    if archive is not None:
+        parts["archive"] = archive
+    if precipitation is not None:
+        parts["precipitation"] = ForecastData(precipitation)
+    entry.async_on_unload(
+        hass.data[DOMAIN][DATA_FORECAST_STORE].async_register(
+            entry.entry_id, parts, weather_coordinator.perf_stats
+        )
+    )
+
+    if expose_metrics:
+        entry.async_on_unload(
+            hass.data[DOMAIN][DATA_METRICS_REGISTRY].async_register(
+                {"station": str(station), "grid": str(grid), "source": "forecast"},
+                weather_coordinator,
+            )
+        )
 
     hass.data[DOMAIN][entry.entry_id] = {
         ENTRY_NAME: name,
@@ -83,6 +320,16 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         CONF_TWICEDAILY_FORECAST: forecast_twicedaily,
         NWS_PLATFORM: nws_entity_platform,
         CONF_SCAN_INTERVAL: nws_scan_Int,
+        CONF_UNITS: units,
+        CONF_MONITORED_CONDITIONS: monitored_conditions,
+        CONF_MODE: DEFAULT_FORECAST_MODE,
+        ENTRY_SETUP_METRICS: setup_metrics,
+        ENTRY_CARD_PAYLOAD: card_cache,
+        ENTRY_ARCHIVE: archive,
+        ENTRY_VERIFIER: verifier,
+        ENTRY_CURRENT_OBSERVATION: current_observation,
+        ENTRY_PRECIPITATION: precipitation,
+        ENTRY_ALERTS: location_alerts,
     }
 
     # If both platforms
@@ -99,9 +346,42 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     update_listener = entry.add_update_listener(async_update_options)
     hass.data[DOMAIN][entry.entry_id][UPDATE_LISTENER] = update_listener
+
+    # Entities are registered at this point and start unavailable (or from
+    # restored state); the first fetch runs without holding up setup.
+    if deferred_startup:
+        entry.async_create_background_task(
+            hass,
+            _async_deferred_first_refresh(weather_coordinator, setup_metrics, name),
+            f"{DOMAIN} first refresh {name}",
+        )
+
+    setup_metrics["setup_duration"] = time.monotonic() - setup_start
+    _LOGGER.debug(
+        "NWS Detailed Forecast setup of %s took %.3fs (first refresh %s)",
+        name,
+        setup_metrics["setup_duration"],
+        "deferred" if deferred_startup else "awaited",
+    )
     return True
 
 
+async def _async_deferred_first_refresh(
+    coordinator: WeatherUpdateCoordinator, setup_metrics: dict[str, Any], name: str
+) -> None:
+    """Run the first coordinator refresh in the background."""
+    refresh_start = time.monotonic()
+    await coordinator.async_refresh()
+    setup_metrics["first_refresh_duration"] = time.monotonic() - refresh_start
+    setup_metrics["first_refresh_success"] = coordinator.last_update_success
+    _LOGGER.debug(
+        "NWS Detailed Forecast first refresh of %s took %.3fs (success: %s)",
+        name,
+        setup_metrics["first_refresh_duration"],
+        coordinator.last_update_success,
+    )
+
+
 async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Update options."""
     await hass.config_entries.async_reload(entry.entry_id)
@@ -145,5 +425,10 @@ def _get_config_value(config_entry: ConfigEntry, key: str) -> Any:
     return config_entry.data[key]
 
 
+def _get_config_option(config_entry: ConfigEntry, key: str, default: Any) -> Any:
+    """Return an optional setting, falling back to the data and then default."""
+    return config_entry.options.get(key, config_entry.data.get(key, default))
+
+
 def _filter_domain_configs(elements, domain):
     return list(filter(lambda elem: elem["platform"] == domain, elements))
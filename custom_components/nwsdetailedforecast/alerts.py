@@ -0,0 +1,366 @@
+"""Active alerts of whole states, matched to every location locally."""
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+import json
+import logging
+import math
+from typing import Any, NamedTuple
+
+import aiohttp
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.update_coordinator import UpdateFailed
+import homeassistant.util.dt as dt_util
+
+from .api import alerts_url
+from .const import ALERT_INDEX_CELL, ALERTS_SCAN_INTERVAL, DOMAIN
+from .hub import SharedHub
+from .lookup import LookupCache
+from .metrics import PerfStats
+from .observations import async_get_json, response_validators
+from .pipeline import TransformPipeline
+
+_LOGGER = logging.getLogger(__name__)
+
+# (base URL, forecast office, grid)
+LocationKey = tuple[str, str, str]
+# (base URL, state)
+AreaKey = tuple[str, str]
+# Rings of [longitude, latitude] vertices, the outer ring first
+Polygon = list[list[list[float]]]
+
+# Shapes spanning more cells than this are kept out of the grid and only
+# checked against their bounding box
+_MAX_CELLS = 1024
+
+
+class Alert(NamedTuple):
+    """An active alert, with the fields the alerts sensor shows."""
+
+    title: str
+    description: str
+    severity: str
+    time: int | None
+    expires: int | None
+    uri: str
+    regions: list[str]
+
+
+def _epoch(value: str | None) -> int | None:
+    if (parsed := dt_util.parse_datetime(value or "")) is None:
+        return None
+    return int(parsed.timestamp())
+
+
+def _alert(properties: dict[str, Any]) -> Alert:
+    return Alert(
+        title=properties.get("headline") or properties.get("event") or "",
+        description=properties.get("description") or "",
+        severity=properties.get("severity") or "Unknown",
+        time=_epoch(
+            properties.get("onset")
+            or properties.get("effective")
+            or properties.get("sent")
+        ),
+        expires=_epoch(properties.get("ends") or properties.get("expires")),
+        uri=properties.get("@id") or properties.get("id") or "",
+        regions=[
+            region.strip()
+            for region in (properties.get("areaDesc") or "").split(";")
+            if region.strip()
+        ],
+    )
+
+
+def _polygons(geometry: dict[str, Any] | None) -> list[Polygon]:
+    if not geometry:
+        return []
+    if geometry.get("type") == "Polygon":
+        return [geometry["coordinates"]]
+    if geometry.get("type") == "MultiPolygon":
+        return list(geometry["coordinates"])
+    return []
+
+
+def _in_ring(ring: list[list[float]], longitude: float, latitude: float) -> bool:
+    """Return whether a point is inside a ring, by ray casting."""
+    inside = False
+    x_prev, y_prev = ring[-1][0], ring[-1][1]
+    for vertex in ring:
+        x, y = vertex[0], vertex[1]
+        if (y > latitude) != (y_prev > latitude) and longitude < (
+            x_prev - x
+        ) * (latitude - y) / (y_prev - y) + x:
+            inside = not inside
+        x_prev, y_prev = x, y
+    return inside
+
+
+def _in_polygon(polygon: Polygon, longitude: float, latitude: float) -> bool:
+    """Return whether a point is inside the outer ring and outside the holes."""
+    return _in_ring(polygon[0], longitude, latitude) and not any(
+        _in_ring(hole, longitude, latitude) for hole in polygon[1:]
+    )
+
+
+def _cell(value: float) -> int:
+    return math.floor(value / ALERT_INDEX_CELL)
+
+
+class AlertIndex:
+    """Alerts of an area, indexed for matching to locations.
+
+    Alerts with a polygon match the points inside it. Each polygon is
+    entered in the cells of a coarse grid its bounding box covers, so a
+    point is only tested against the few polygons of its cell. Alerts
+    without a polygon match the locations in their listed zones.
+    """
+
+    def __init__(self, features: list[dict[str, Any]]) -> None:
+        """Build the index from the features of an alerts response."""
+        self.alerts: list[Alert] = []
+        # Alert, bounding box (west, south, east, north) and polygon
+        self._shapes: list[tuple[int, tuple[float, float, float, float], Polygon]] = []
+        self._cells: dict[tuple[int, int], list[int]] = defaultdict(list)
+        self._wide: list[int] = []
+        self._zones: dict[str, list[int]] = defaultdict(list)
+
+        for feature in features:
+            properties = feature.get("properties") or {}
+            if properties.get("status", "Actual") != "Actual":
+                continue
+            index = len(self.alerts)
+            self.alerts.append(_alert(properties))
+            if polygons := _polygons(feature.get("geometry")):
+                for polygon in polygons:
+                    self._add_shape(index, polygon)
+            else:
+                for zone in (properties.get("geocode") or {}).get("UGC") or ():
+                    self._zones[zone].append(index)
+
+    def _add_shape(self, alert: int, polygon: Polygon) -> None:
+        longitudes = [vertex[0] for vertex in polygon[0]]
+        latitudes = [vertex[1] for vertex in polygon[0]]
+        box = (min(longitudes), min(latitudes), max(longitudes), max(latitudes))
+        shape = len(self._shapes)
+        self._shapes.append((alert, box, polygon))
+
+        columns = range(_cell(box[0]), _cell(box[2]) + 1)
+        rows = range(_cell(box[1]), _cell(box[3]) + 1)
+        if len(columns) * len(rows) > _MAX_CELLS:
+            self._wide.append(shape)
+            return
+        for column in columns:
+            for row in rows:
+                self._cells[(column, row)].append(shape)
+
+    def match(
+        self, latitude: float | None, longitude: float | None, zones: list[str]
+    ) -> list[Alert]:
+        """Return the alerts of a point and its zones, in the order NWS sent them."""
+        matched: set[int] = set()
+        if latitude is not None and longitude is not None:
+            for shape in (
+                *self._cells.get((_cell(longitude), _cell(latitude)), ()),
+                *self._wide,
+            ):
+                alert, (west, south, east, north), polygon = self._shapes[shape]
+                if (
+                    alert not in matched
+                    and west <= longitude <= east
+                    and south <= latitude <= north
+                    and _in_polygon(polygon, longitude, latitude)
+                ):
+                    matched.add(alert)
+        for zone in zones:
+            matched.update(self._zones.get(zone, ()))
+        return [self.alerts[alert] for alert in sorted(matched)]
+
+
+def _index(payload: dict[str, Any]) -> AlertIndex:
+    return AlertIndex(payload.get("features") or [])
+
+
+class AlertHub(SharedHub[dict[AreaKey, AlertIndex]]):
+    """Poll the active alerts of every state in use, one request per state.
+
+    Locations resolve their point to zones and a state once, through the
+    cached points lookup, and their alerts are then matched locally. The
+    polygons of a state are decoded and indexed in the executor.
+    """
+
+    def __init__(self, hass: HomeAssistant, cache: LookupCache) -> None:
+        """Initialize the hub."""
+        self.perf_stats = PerfStats()
+        self._cache = cache
+        self._locations: dict[LocationKey, int] = {}
+        self._resolved: dict[LocationKey, dict[str, Any]] = {}
+        self._points: dict[LocationKey, tuple[float, float]] = {}
+        self._validators: dict[AreaKey, dict[str, str]] = {}
+        self.pipeline = TransformPipeline(
+            [("json_parse", json.loads), ("index", _index)]
+        )
+
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN} alerts",
+            update_interval=ALERTS_SCAN_INTERVAL,
+        )
+        self.data = {}
+
+    @callback
+    def async_track(
+        self, coordinator, base_url: str
+    ) -> tuple[LocationAlerts, CALLBACK_TYPE]:
+        """Start matching alerts to the gridpoint of a forecast coordinator.
+
+        Returns its alerts and a function to stop tracking it.
+        """
+        key = (base_url, str(coordinator.station), str(coordinator.grid))
+        self._locations[key] = self._locations.get(key, 0) + 1
+
+        @callback
+        def _async_forecast_updated() -> None:
+            # The point comes from the forecast geometry
+            data = coordinator.data
+            if data is None or data.point is None or key in self._points:
+                return
+            self._points[key] = data.point
+            self._async_schedule_request()
+
+        _async_forecast_updated()
+        remove_listener = coordinator.async_add_listener(_async_forecast_updated)
+
+        @callback
+        def untrack() -> None:
+            remove_listener()
+            self._locations[key] -= 1
+            if not self._locations[key]:
+                del self._locations[key]
+                self._resolved.pop(key, None)
+                self._points.pop(key, None)
+
+        return LocationAlerts(self, key), untrack
+
+    def location(self, key: LocationKey) -> dict[str, Any] | None:
+        """Return the point, zones and state of a location, once resolved."""
+        return self._resolved.get(key)
+
+    async def _async_resolve(self, key: LocationKey) -> None:
+        latitude, longitude = self._points[key]
+        try:
+            gridpoint = await self._cache.async_gridpoint(latitude, longitude, key[0])
+        except (aiohttp.ClientError, asyncio.TimeoutError, KeyError) as err:
+            _LOGGER.warning(
+                "Could not find the alert zones of %s %s: %s", key[1], key[2], err
+            )
+            return
+        if key not in self._locations:
+            return
+        self._resolved[key] = {
+            "latitude": latitude,
+            "longitude": longitude,
+            "zones": gridpoint["zones"],
+            "state": gridpoint["state"],
+        }
+
+    async def _async_fetch(self, area: AreaKey) -> tuple[AreaKey, AlertIndex | None]:
+        """Return the alerts of a state, None when unchanged or failed."""
+        base_url, state = area
+        stats = self.perf_stats
+        stats.increment("requests")
+        try:
+            with stats.timer("request"):
+                status, payload, headers = await async_get_json(
+                    self.hass,
+                    alerts_url(base_url),
+                    {"area": state},
+                    self._validators.get(area),
+                    decode=False,
+                )
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            stats.increment("errors")
+            stats.statuses[getattr(err, "status", 0)] += 1
+            _LOGGER.debug("Alerts of %s failed: %s", state, err)
+            return area, None
+
+        stats.statuses[status] += 1
+        if status == 304:
+            stats.increment("not_modified")
+            return area, None
+        self._validators[area] = response_validators(headers)
+        with stats.timer("parse"):
+            index, _ = await self.pipeline.async_run(self.hass, stats, payload)
+        return area, index
+
+    async def _async_update_data(self) -> dict[AreaKey, AlertIndex]:
+        """Fetch the active alerts of each state in use once."""
+        if unresolved := [
+            key for key in self._points if key not in self._resolved
+        ]:
+            await asyncio.gather(*(self._async_resolve(key) for key in unresolved))
+
+        areas = {
+            (key[0], location["state"])
+            for key, location in self._resolved.items()
+            if location["state"]
+        }
+        results = await asyncio.gather(*(self._async_fetch(area) for area in areas))
+
+        data = {area: index for area, index in self.data.items() if area in areas}
+        changed = False
+        for area, index in results:
+            if index is not None:
+                data[area] = index
+                changed = True
+        self.perf_stats.set("areas", len(areas))
+        self.perf_stats.set("locations", len(self._resolved))
+        if areas and not any(area in data for area in areas):
+            raise UpdateFailed("No active alerts available")
+        # Keep the same object when nothing changed so entities skip writes
+        if not changed and data.keys() == self.data.keys():
+            return self.data
+        return data
+
+
+class LocationAlerts:
+    """The active alerts of one gridpoint."""
+
+    def __init__(self, hub: AlertHub, key: LocationKey) -> None:
+        """Initialize the location alerts."""
+        self.hub = hub
+        self._key = key
+        self._matched: tuple[AlertIndex | None, list[Alert] | None] = (None, None)
+
+    def alerts(self) -> list[Alert] | None:
+        """Return the active alerts, or None until they are known."""
+        if (location := self.hub.location(self._key)) is None:
+            return None
+        index = self.hub.data.get((self._key[0], location["state"]))
+        if index is None:
+            return None
+        # Matched once per alerts response
+        if self._matched[0] is not index:
+            self._matched = (
+                index,
+                index.match(
+                    location["latitude"], location["longitude"], location["zones"]
+                ),
+            )
+        return self._matched[1]
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return the resolved location and its alert count."""
+        alerts = self.alerts()
+        return {
+            "location": self.hub.location(self._key),
+            "alerts": None if alerts is None else len(alerts),
+        }
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Call update_callback whenever the hub has refreshed."""
+        return self.hub.async_add_listener(update_callback)
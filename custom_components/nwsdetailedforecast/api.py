@@ -0,0 +1,34 @@
+"""Endpoints of the NWS API."""
+from __future__ import annotations
+
+from .const import DEFAULT_BASE_URL
+
+
+def gridpoint_url(
+    station: str, grid: str, endpoint: str = "forecast", base_url: str = DEFAULT_BASE_URL
+) -> str:
+    """Return the URL of a gridpoint endpoint such as forecast or forecast/hourly."""
+    url = f"{base_url.rstrip('/')}/gridpoints/{station}/{grid}"
+    if endpoint:
+        url += f"/{endpoint}"
+    return url
+
+
+def observations_url(station_id: str, base_url: str = DEFAULT_BASE_URL) -> str:
+    """Return the URL of the observations of an observation station."""
+    return f"{base_url.rstrip('/')}/stations/{station_id}/observations"
+
+
+def points_url(point: str, base_url: str = DEFAULT_BASE_URL) -> str:
+    """Return the URL resolving a latitude,longitude point to its gridpoint."""
+    return f"{base_url.rstrip('/')}/points/{point}"
+
+
+def zone_forecast_url(zone: str, base_url: str = DEFAULT_BASE_URL) -> str:
+    """Return the URL of the text forecast of a public forecast zone."""
+    return f"{base_url.rstrip('/')}/zones/forecast/{zone}/forecast"
+
+
+def alerts_url(base_url: str = DEFAULT_BASE_URL) -> str:
+    """Return the URL of the active alerts, filtered by query parameters."""
+    return f"{base_url.rstrip('/')}/alerts/active"
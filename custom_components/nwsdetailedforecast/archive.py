@@ -0,0 +1,548 @@
+"""Append-only archive of forecast issuances in a columnar file per gridpoint.
+
+Every forecast issuance (one NWS ``updateTime``) is appended once as a
+block. A block is a fixed header followed by one packed column per field,
+each padded to 8 bytes so the columns of the memory-mapped file can be
+read in place::
+
+    file   := b"NWSA" version:u16 reserved:u16 block*
+    block  := issued:i64 first_start:i64 last_end:i64 count:u32 pad:u32
+              column[start:i64] column[end:i64] column[temperature:f32] ...
+
+Temperatures are stored in °C, wind speeds in km/h and missing values as
+NaN. Blocks past the retention are dropped by rewriting the file.
+"""
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from functools import lru_cache
+import logging
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.const import UnitOfSpeed, UnitOfTemperature
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+import homeassistant.helpers.config_validation as cv
+import homeassistant.util.dt as dt_util
+from homeassistant.util.unit_conversion import SpeedConverter, TemperatureConverter
+
+from .const import (
+    ARCHIVE_MAX_ISSUANCES,
+    ATTR_API_CONDITION_KEY,
+    ATTR_API_ENDTIME,
+    ATTR_API_ISDAYTIME,
+    ATTR_API_STARTTIME,
+    ATTR_API_WIND_BEARING,
+    ATTR_API_WIND_SPEED_MEAN,
+    ATTR_API_WIND_SPEED_UNIT,
+    DOMAIN,
+    ENTRY_ARCHIVE,
+    FORECAST_SOURCE_GRIDPOINT,
+    MAP_CONDITION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+WS_TYPE_ARCHIVE = f"{DOMAIN}/archive"
+
+ARCHIVE_MAGIC = b"NWSA"
+ARCHIVE_VERSION = 1
+ARCHIVE_SUFFIX = ".nwsa"
+
+_FILE_HEADER = struct.Struct("<4sHH")
+_BLOCK_HEADER = struct.Struct("<qqqI4x")
+
+# Column name and array typecode, in file order
+COLUMNS: tuple[tuple[str, str], ...] = (
+    ("start", "q"),
+    ("end", "q"),
+    ("temperature", "f"),
+    ("dewpoint", "f"),
+    ("humidity", "f"),
+    ("precipitation_probability", "f"),
+    ("wind_speed", "f"),
+    ("wind_bearing", "f"),
+    ("condition", "B"),
+    ("is_daytime", "B"),
+)
+
+# Condition keys are stored as their index, NO_CONDITION when unknown
+CONDITION_KEYS = tuple(MAP_CONDITION)
+NO_CONDITION = 255
+_CONDITION_INDEX = {key: index for index, key in enumerate(CONDITION_KEYS)}
+
+_TEMPERATURE_UNITS = {
+    "F": UnitOfTemperature.FAHRENHEIT,
+    "C": UnitOfTemperature.CELSIUS,
+    "wmoUnit:degF": UnitOfTemperature.FAHRENHEIT,
+    "wmoUnit:degC": UnitOfTemperature.CELSIUS,
+}
+
+
+def _padded(size: int) -> int:
+    return (size + 7) & ~7
+
+
+def _block_size(count: int) -> int:
+    """Return the bytes taken by a block of count periods."""
+    return _BLOCK_HEADER.size + sum(
+        _padded(count * array(typecode).itemsize) for _, typecode in COLUMNS
+    )
+
+
+@lru_cache(maxsize=64)
+def _column_offsets(count: int) -> tuple[tuple[str, str, int, int], ...]:
+    """Return the name, typecode, offset in the block and item size of each column."""
+    offsets = []
+    offset = _BLOCK_HEADER.size
+    for name, typecode in COLUMNS:
+        size = array(typecode).itemsize
+        offsets.append((name, "<" + typecode, offset, size))
+        offset += _padded(count * size)
+    return tuple(offsets)
+
+
+def _quantity(value: Any) -> tuple[float | None, str | None]:
+    """Return the value and unit code of a plain or NWS quantity value."""
+    if isinstance(value, dict):
+        return value.get("value"), value.get("unitCode")
+    return value, None
+
+
+def _celsius(value: Any, unit: str | None) -> float:
+    if value is None:
+        return math.nan
+    if (source_unit := _TEMPERATURE_UNITS.get(unit)) is None:
+        return float(value)
+    return TemperatureConverter.convert(value, source_unit, UnitOfTemperature.CELSIUS)
+
+
+def _number(value: Any) -> float:
+    return math.nan if value is None else float(value)
+
+
+def _timestamp(value: str | None) -> int:
+    parsed = dt_util.parse_datetime(value) if value else None
+    if parsed is None:
+        raise ValueError(f"Invalid period time: {value}")
+    return int(parsed.timestamp())
+
+
+def period_row(period: dict[str, Any]) -> tuple:
+    """Return the archived values of an ingested forecast period."""
+    temperature, unit = _quantity(period.get("temperature"))
+    dewpoint, dewpoint_unit = _quantity(period.get("dewpoint"))
+    wind_speed = period.get(ATTR_API_WIND_SPEED_MEAN)
+    wind_unit = period.get(ATTR_API_WIND_SPEED_UNIT)
+    if wind_speed is not None and wind_unit not in (
+        None,
+        UnitOfSpeed.KILOMETERS_PER_HOUR,
+    ):
+        wind_speed = SpeedConverter.convert(
+            wind_speed, wind_unit, UnitOfSpeed.KILOMETERS_PER_HOUR
+        )
+    return (
+        _timestamp(period.get(ATTR_API_STARTTIME)),
+        _timestamp(period.get(ATTR_API_ENDTIME)),
+        _celsius(temperature, unit or period.get("temperatureUnit")),
+        _celsius(dewpoint, dewpoint_unit),
+        _number(_quantity(period.get("relativeHumidity"))[0]),
+        _number(_quantity(period.get("probabilityOfPrecipitation"))[0]),
+        _number(wind_speed),
+        _number(period.get(ATTR_API_WIND_BEARING)),
+        _CONDITION_INDEX.get(period.get(ATTR_API_CONDITION_KEY), NO_CONDITION),
+        1 if period.get(ATTR_API_ISDAYTIME) else 0,
+    )
+
+
+def encode_block(issued: int, rows: list[tuple]) -> bytes:
+    """Pack the rows of one issuance, sorted by start time, into a block."""
+    rows = sorted(rows)
+    parts = [
+        _BLOCK_HEADER.pack(
+            issued,
+            rows[0][0] if rows else 0,
+            max((row[1] for row in rows), default=0),
+            len(rows),
+        )
+    ]
+    for index, (_, typecode) in enumerate(COLUMNS):
+        column = array(typecode, (row[index] for row in rows)).tobytes()
+        parts.append(column + bytes(_padded(len(column)) - len(column)))
+    return b"".join(parts)
+
+
+def _decode_value(name: str, value: Any) -> Any:
+    if name == "condition":
+        return CONDITION_KEYS[value] if value < len(CONDITION_KEYS) else None
+    if name == "is_daytime":
+        return bool(value)
+    if name in ("start", "end"):
+        return dt_util.utc_from_timestamp(value).isoformat()
+    if isinstance(value, float):
+        return None if math.isnan(value) else round(value, 2)
+    return value
+
+
+class ForecastArchive:
+    """Archive of the forecast issuances of one gridpoint."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator,
+        path: str,
+        max_age: timedelta,
+        max_issuances: int = ARCHIVE_MAX_ISSUANCES,
+    ) -> None:
+        """Initialize the archive."""
+        self.hass = hass
+        self.path = path
+        self.max_age = max_age
+        self.max_issuances = max_issuances
+        self._coordinator = coordinator
+        self._source = None
+
+        # (issued, first_start, last_end, offset, count) in file order
+        self._blocks: list[tuple[int, int, int, int, int]] = []
+        self._issued: set[int] = set()
+        self._size = 0
+        self._map: mmap.mmap | None = None
+        self._lock = threading.Lock()
+        # Monotonic time of the last query, the map is dropped when cold
+        self.last_used = 0.0
+
+    @property
+    def issuances(self) -> int:
+        """Return the number of archived issuances."""
+        return len(self._blocks)
+
+    @property
+    def size(self) -> int:
+        """Return the size of the archive file in bytes."""
+        return self._size
+
+    def _load(self) -> None:
+        """Index the blocks of the archive file, dropping a torn last block."""
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._blocks = []
+            if not os.path.exists(self.path):
+                with open(self.path, "wb") as file:
+                    file.write(_FILE_HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, 0))
+                self._size = _FILE_HEADER.size
+                return
+
+            with open(self.path, "r+b") as file:
+                magic, version, _ = _FILE_HEADER.unpack(file.read(_FILE_HEADER.size))
+                if magic != ARCHIVE_MAGIC or version != ARCHIVE_VERSION:
+                    raise ValueError(f"Unsupported forecast archive {self.path}")
+                file_size = os.fstat(file.fileno()).st_size
+                offset = _FILE_HEADER.size
+                while offset + _BLOCK_HEADER.size <= file_size:
+                    file.seek(offset)
+                    issued, first_start, last_end, count = _BLOCK_HEADER.unpack(
+                        file.read(_BLOCK_HEADER.size)
+                    )
+                    size = _block_size(count)
+                    if offset + size > file_size:
+                        break
+                    self._blocks.append((issued, first_start, last_end, offset, count))
+                    offset += size
+                if offset != file_size:
+                    _LOGGER.warning(
+                        "Dropping %d incomplete bytes from %s",
+                        file_size - offset,
+                        self.path,
+                    )
+                    file.truncate(offset)
+                self._size = offset
+            self._issued = {block[0] for block in self._blocks}
+            self._remap()
+
+    def _remap(self) -> None:
+        """Map the file again after it changed size."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._blocks:
+            with open(self.path, "rb") as file:
+                self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self) -> None:
+        """Release the memory map."""
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+
+    def memory_bytes(self) -> int:
+        """Return the size of the mapped file, nothing while it is unmapped."""
+        return self._size if self._map is not None else 0
+
+    def evict(self) -> None:
+        """Unmap the file until the next query, unless a query is running."""
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+        finally:
+            self._lock.release()
+
+    def _mapped(self) -> mmap.mmap | None:
+        """Return the map of the file, mapping it again after an eviction."""
+        self.last_used = time.monotonic()
+        if self._map is None and self._blocks:
+            self._remap()
+        return self._map
+
+    def append(self, issued: int, rows: list[tuple], now: int) -> bool:
+        """Append an issuance unless it is archived already."""
+        with self._lock:
+            if issued in self._issued or not rows:
+                return False
+            if issued < now - self.max_age.total_seconds():
+                return False
+            block = encode_block(issued, rows)
+            with open(self.path, "ab") as file:
+                file.write(block)
+                file.flush()
+                os.fsync(file.fileno())
+            self._blocks.append(
+                (issued, min(row[0] for row in rows), max(row[1] for row in rows),
+                 self._size, len(rows))
+            )
+            self._issued.add(issued)
+            self._size += len(block)
+            if not self._prune(now):
+                self._remap()
+        return True
+
+    def _prune(self, now: int) -> bool:
+        """Rewrite the file without the blocks past the retention."""
+        cutoff = now - int(self.max_age.total_seconds())
+        keep = [block for block in self._blocks if block[0] >= cutoff]
+        keep = keep[-self.max_issuances:]
+        # Rewriting costs the whole file, so wait until enough has expired
+        expired = len(self._blocks) - len(keep)
+        if not expired or expired < len(self._blocks) // 8:
+            return False
+
+        temp_path = f"{self.path}.tmp"
+        blocks = []
+        offset = _FILE_HEADER.size
+        with open(self.path, "rb") as source, open(temp_path, "wb") as target:
+            target.write(_FILE_HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, 0))
+            for issued, first_start, last_end, block_offset, count in keep:
+                source.seek(block_offset)
+                size = _block_size(count)
+                target.write(source.read(size))
+                blocks.append((issued, first_start, last_end, offset, count))
+                offset += size
+            target.flush()
+            os.fsync(target.fileno())
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        os.replace(temp_path, self.path)
+
+        self._blocks = blocks
+        self._issued = {block[0] for block in blocks}
+        self._size = offset
+        self._remap()
+        return True
+
+    def valid_at(self, when: int) -> list[dict[str, Any]]:
+        """Return every archived forecast for the period covering when.
+
+        Blocks are skipped on their header time span, the period is found by
+        bisecting the mapped start column and only that row is decoded.
+        """
+        forecasts = []
+        with self._lock:
+            if self._mapped() is None:
+                return forecasts
+            for issued, first_start, last_end, offset, count in self._blocks:
+                if not first_start <= when < last_end:
+                    continue
+                offsets = _column_offsets(count)
+                start = offset + offsets[0][2]
+                with memoryview(self._map) as view, view[
+                    start : start + count * 8
+                ].cast("q") as starts:
+                    row = bisect_right(starts, when) - 1
+                if row < 0:
+                    continue
+                values = {
+                    name: struct.unpack_from(
+                        typecode, self._map, offset + column_offset + row * size
+                    )[0]
+                    for name, typecode, column_offset, size in offsets
+                }
+                if values["end"] <= when:
+                    continue
+                forecast = {
+                    name: _decode_value(name, value) for name, value in values.items()
+                }
+                forecast["issued"] = dt_util.utc_from_timestamp(issued).isoformat()
+                forecasts.append(forecast)
+        return forecasts
+
+    def ended_between(
+        self, after: int, until: int, names: tuple[str, ...]
+    ) -> dict[str, array]:
+        """Return the named columns of every period ending in (after, until].
+
+        Periods do not overlap, so end times are sorted within a block and
+        each block is cut with two bisections. An ``issued`` column holds
+        the issue time of every row.
+        """
+        batch = {name: array(typecode) for name, typecode in COLUMNS if name in names}
+        batch["issued"] = array("q")
+        with self._lock:
+            if self._mapped() is None:
+                return batch
+            with memoryview(self._map) as view:
+                for issued, first_start, last_end, offset, count in self._blocks:
+                    if last_end <= after or first_start >= until:
+                        continue
+                    offsets = _column_offsets(count)
+                    columns = {
+                        name: view[
+                            offset + column_offset : offset + column_offset + count * size
+                        ].cast(typecode[-1])
+                        for name, typecode, column_offset, size in offsets
+                        if name in names or name == "end"
+                    }
+                    try:
+                        low = bisect_right(columns["end"], after)
+                        high = bisect_right(columns["end"], until)
+                        if low < high:
+                            for name in names:
+                                batch[name].extend(columns[name][low:high])
+                            batch["issued"].extend([issued] * (high - low))
+                    finally:
+                        for column in columns.values():
+                            column.release()
+        return batch
+
+    async def async_load(self) -> None:
+        """Index the archive file."""
+        await self.hass.async_add_executor_job(self._load)
+
+    async def async_valid_at(self, when: datetime) -> list[dict[str, Any]]:
+        """Return every archived forecast for the period covering when."""
+        return await self.hass.async_add_executor_job(
+            self.valid_at, int(when.timestamp())
+        )
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Archive each new issuance, returning a function to stop."""
+        remove_listener = self._coordinator.async_add_listener(self._async_updated)
+        self._async_updated()
+
+        @callback
+        def stop() -> None:
+            remove_listener()
+            self.hass.async_add_executor_job(self.close)
+
+        return stop
+
+    @callback
+    def _async_updated(self) -> None:
+        data = self._coordinator.data
+        if (
+            data is None
+            or data is self._source
+            or data.update_time is None
+            # Zone forecasts stand in for the gridpoint, they are not issuances
+            or data.source != FORECAST_SOURCE_GRIDPOINT
+        ):
+            return
+        self._source = data
+        updated = dt_util.parse_datetime(data.update_time)
+        if updated is None or int(updated.timestamp()) in self._issued:
+            return
+        try:
+            rows = [period_row(period.d) for period in data.twicedaily().data]
+        except (TypeError, ValueError) as err:
+            _LOGGER.warning("Not archiving forecast issued %s: %s", data.update_time, err)
+            return
+        self.hass.async_create_task(
+            self._async_append(int(updated.timestamp()), rows)
+        )
+
+    async def _async_append(self, issued: int, rows: list[tuple]) -> None:
+        try:
+            await self.hass.async_add_executor_job(
+                self.append, issued, rows, int(dt_util.utcnow().timestamp())
+            )
+        except OSError as err:
+            _LOGGER.error("Failed to archive forecast to %s: %s", self.path, err)
+
+
+def archive_path(hass: HomeAssistant, station: str, grid: str) -> str:
+    """Return the archive file of a gridpoint."""
+    name = "_".join(
+        part.strip() for part in (str(station), *str(grid).split(","))
+    )
+    return hass.config.path(".storage", DOMAIN, "archive", name + ARCHIVE_SUFFIX)
+
+
+@callback
+def async_get_archive(hass: HomeAssistant, entry_id: str) -> ForecastArchive | None:
+    """Return the forecast archive of a config entry."""
+    entry_data = hass.data.get(DOMAIN, {}).get(entry_id)
+    if not isinstance(entry_data, dict):
+        return None
+    return entry_data.get(ENTRY_ARCHIVE)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_TYPE_ARCHIVE,
+        vol.Required("entry_id"): str,
+        vol.Required("time"): cv.datetime,
+    }
+)
+@websocket_api.async_response
+async def websocket_archive(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return every archived forecast made for a point in time."""
+    archive = async_get_archive(hass, msg["entry_id"])
+    if archive is None:
+        connection.send_error(
+            msg["id"], websocket_api.const.ERR_NOT_FOUND, "Archive is not enabled"
+        )
+        return
+
+    when = dt_util.as_utc(msg["time"])
+    connection.send_result(
+        msg["id"],
+        {
+            "time": when.isoformat(),
+            "forecasts": await archive.async_valid_at(when),
+        },
+    )
+
+
+@callback
+def async_setup_archive(hass: HomeAssistant) -> None:
+    """Register the archive websocket command."""
+    websocket_api.async_register_command(hass, websocket_archive)
@@ -0,0 +1,407 @@
+"""Compact forecast payload for the NWS forecast card."""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import lru_cache
+import hashlib
+import time
+from typing import TYPE_CHECKING, Any
+
+from aiohttp import hdrs, web
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.json import json_dumps
+
+from .const import (
+    ATTR_API_CONDITION_KEY,
+    ATTR_API_FEELS_LIKE_TEMPERATURE,
+    ATTR_API_ISDAYTIME,
+    ATTR_API_NWSICONURL,
+    ATTR_API_WIND_BEARING,
+    ATTR_API_WIND_SPEED_MEAN,
+    ATTR_API_WIND_SPEED_UNIT,
+    CARD_DELTA_HISTORY,
+    CARD_TEXT_MAX_LENGTH,
+    DOMAIN,
+    ENTRY_CARD_PAYLOAD,
+    MAP_CONDITION,
+)
+from .icon_cache import IconCache, local_icon_url
+from .metrics import deep_sizeof
+
+if TYPE_CHECKING:
+    # The coordinator falls back to zone forecasts through the lookup cache,
+    # which builds card periods, so it is imported for type checking only
+    from .weather_update_coordinator import WeatherUpdateCoordinator
+
+CARD_VIEW_URL = "/api/nwsdetailedforecast/card/{entry_id}"
+WS_TYPE_CARD = "nwsdetailedforecast/card"
+# Name of the card build among the products of a forecast update
+CARD_PRODUCT = "card"
+
+
+@lru_cache(maxsize=256)
+def _trim(text: str | None, limit: int = CARD_TEXT_MAX_LENGTH) -> str | None:
+    """Shorten text to the last whole word within the limit.
+
+    Forecast text is pooled at ingest, so unchanged text keeps returning
+    the same trimmed object.
+    """
+    if text is None or len(text) <= limit:
+        return text
+    return text[:limit].rsplit(" ", 1)[0].rstrip(",.;") + "…"
+
+
+def _value(field: dict[str, Any] | None) -> Any:
+    """Return the value of an NWS quantitative value object."""
+    return field.get("value") if field else None
+
+
+def build_card_period(
+    period: dict[str, Any], local_url: Callable[[str], str] | None
+) -> dict[str, Any]:
+    """Return the card representation of one NWS forecast period.
+
+    local_url maps NWS icon URLs to the icons served locally, if any.
+    """
+    icon = period.get(ATTR_API_NWSICONURL)
+    if icon and local_url is not None:
+        icon = local_url(icon)
+
+    return {
+        "number": period.get("number"),
+        "name": period.get("name"),
+        "start": period.get("startTime"),
+        "end": period.get("endTime"),
+        "is_daytime": period.get(ATTR_API_ISDAYTIME),
+        "temperature": period.get("temperature"),
+        "temperature_unit": period.get("temperatureUnit"),
+        "feels_like": period.get(ATTR_API_FEELS_LIKE_TEMPERATURE),
+        "precipitation_probability": _value(period.get("probabilityOfPrecipitation")),
+        "humidity": _value(period.get("relativeHumidity")),
+        "dew_point": _value(period.get("dewpoint")),
+        "wind_speed": period.get(ATTR_API_WIND_SPEED_MEAN),
+        "wind_speed_unit": period.get(ATTR_API_WIND_SPEED_UNIT),
+        "wind_bearing": period.get(ATTR_API_WIND_BEARING),
+        "condition": MAP_CONDITION.get(period.get(ATTR_API_CONDITION_KEY)),
+        "icon": icon,
+        "short_forecast": period.get("shortForecast"),
+        "detailed_forecast": _trim(period.get("detailedForecast")),
+    }
+
+
+def diff_card_periods(
+    old: list[dict[str, Any]], new: list[dict[str, Any]]
+) -> dict[str, Any]:
+    """Return the per-period changes between two card period lists.
+
+    Periods are matched on their start time, so a period rolling off the
+    front shows up as one removal rather than every period changing.
+    """
+    old_by_start = {period["start"]: period for period in old}
+    new_starts = set()
+    changed = []
+    added = []
+    for period in new:
+        start = period["start"]
+        new_starts.add(start)
+        previous = old_by_start.get(start)
+        if previous is None:
+            added.append(period)
+            continue
+        fields = {
+            key: value
+            for key, value in period.items()
+            # Pooled text is unchanged when it is the same object
+            if (old_value := previous.get(key)) is not value and old_value != value
+        }
+        if fields:
+            fields["start"] = start
+            changed.append(fields)
+
+    removed = [start for start in old_by_start if start not in new_starts]
+    return {"changed": changed, "added": added, "removed": removed}
+
+
+@dataclass(frozen=True)
+class CardPayload:
+    """A serialized card payload and its entity tag."""
+
+    body: str
+    etag: str
+
+
+@dataclass(frozen=True)
+class CardBuild:
+    """The card payload of one forecast, built with it in the executor."""
+
+    periods: list[dict[str, Any]]
+    payload: CardPayload
+    # NWS icon URLs the payload points at locally
+    icons: frozenset[str]
+    # The version the delta goes from, and the serialized delta
+    base_version: int
+    delta: str | None
+
+
+class CardPayloadCache:
+    """Card payload rebuilt and serialized once per coordinator update."""
+
+    def __init__(
+        self, coordinator: WeatherUpdateCoordinator, icon_cache: IconCache | None
+    ) -> None:
+        """Initialize the payload cache."""
+        self._coordinator = coordinator
+        self._icon_cache = icon_cache
+        self._source = None
+        self.periods: list[dict[str, Any]] = []
+        self.payload: CardPayload | None = None
+        self.version = 0
+        # Replaced whole, builds on executor threads read it
+        self._latest: tuple[int, list[dict[str, Any]] | None] = (0, None)
+
+        self._history: deque[tuple[int, list[dict[str, Any]]]] = deque(
+            maxlen=CARD_DELTA_HISTORY
+        )
+        self._deltas: dict[int, str] = {}
+        self._listeners: list[CALLBACK_TYPE] = []
+        self._stop_listeners: list[CALLBACK_TYPE] = []
+        # Monotonic time a subscriber last asked for a delta or snapshot
+        self.last_used = 0.0
+        self._sized: tuple[tuple[int, int, int], int] = ((0, 0, 0), 0)
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Follow coordinator updates, returning a function to stop."""
+        self._async_rebuild()
+        remove_product = self._coordinator.pipeline.async_add_product(
+            CARD_PRODUCT, self.build
+        )
+        remove_listener = self._coordinator.async_add_listener(self._async_rebuild)
+
+        @callback
+        def stop() -> None:
+            remove_product()
+            remove_listener()
+            # A reload builds a new cache, followers must move over to it
+            for stop_callback in list(self._stop_listeners):
+                stop_callback()
+            self._stop_listeners.clear()
+
+        return stop
+
+    def build(self, data) -> CardBuild:
+        """Build the payload of a forecast and its delta from the latest version.
+
+        Runs in the executor with the rest of the update, so icons are only
+        registered with the icon cache once the build is published.
+        """
+        icons: set[str] = set()
+
+        def local_url(icon: str) -> str:
+            icons.add(icon)
+            return local_icon_url(icon)
+
+        periods = [
+            build_card_period(
+                point.d, local_url if self._icon_cache is not None else None
+            )
+            for point in data.twicedaily().data
+        ]
+        body = json_dumps({"updated": data.update_time, "periods": periods})
+        payload = CardPayload(body, f'"{hashlib.sha1(body.encode()).hexdigest()}"')
+
+        base_version, base = self._latest
+        delta = None
+        if base is not None:
+            changes = diff_card_periods(base, periods)
+            changes.update(
+                kind="delta",
+                version=base_version + 1,
+                base=base_version,
+                updated=data.update_time,
+            )
+            delta = json_dumps(changes)
+        return CardBuild(periods, payload, frozenset(icons), base_version, delta)
+
+    @callback
+    def _async_rebuild(self) -> None:
+        """Publish the payload when the coordinator has new data."""
+        data = self._coordinator.data
+        if data is None or data is self._source:
+            return
+        self._source = data
+
+        # Data from before the card started has no build yet
+        if (build := data.products.get(CARD_PRODUCT)) is None:
+            build = self.build(data)
+        if self._icon_cache is not None:
+            for icon in build.icons:
+                self._icon_cache.local_url(icon)
+        if self.payload is not None and self.payload.etag == build.payload.etag:
+            return
+        self.periods = build.periods
+        self.payload = build.payload
+
+        self.version += 1
+        self._latest = (self.version, self.periods)
+        self._history.append((self.version, self.periods))
+        self._deltas.clear()
+        if build.delta is not None and build.base_version == self.version - 1:
+            self._deltas[build.base_version] = build.delta
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Call update_callback whenever a new payload version is built."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def async_on_stop(self, stop_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Call stop_callback once the cache stops following the coordinator."""
+        self._stop_listeners.append(stop_callback)
+
+        @callback
+        def remove_listener() -> None:
+            if stop_callback in self._stop_listeners:
+                self._stop_listeners.remove(stop_callback)
+
+        return remove_listener
+
+    def delta(self, base_version: int) -> str | None:
+        """Return the serialized changes from base_version to the current one.
+
+        Deltas are computed once per base version and shared by every
+        subscriber. None means the base is too old and a snapshot is needed.
+        """
+        self.last_used = time.monotonic()
+        if (delta := self._deltas.get(base_version)) is not None:
+            return delta
+
+        base = next(
+            (periods for version, periods in self._history if version == base_version),
+            None,
+        )
+        if base is None:
+            return None
+
+        changes = diff_card_periods(base, self.periods)
+        changes.update(
+            kind="delta",
+            version=self.version,
+            base=base_version,
+            updated=self._source.update_time,
+        )
+        delta = self._deltas[base_version] = json_dumps(changes)
+        return delta
+
+    def snapshot(self) -> str:
+        """Return the serialized full payload as a snapshot event."""
+        self.last_used = time.monotonic()
+        return (
+            f'{{"kind":"snapshot","version":{self.version},'
+            f'"payload":{self.payload.body}}}'
+        )
+
+    def memory_bytes(self) -> int:
+        """Return the memory held by the payload and the delta history."""
+        key = (self.version, len(self._history), len(self._deltas))
+        if self._sized[0] != key:
+            self._sized = (
+                key,
+                deep_sizeof((self.payload, self.periods, self._history, self._deltas)),
+            )
+        return self._sized[1]
+
+    def evict(self) -> None:
+        """Drop the delta history, older subscribers then get a snapshot."""
+        if self._history:
+            latest = self._history[-1]
+            self._history.clear()
+            self._history.append(latest)
+        self._deltas.clear()
+
+
+@callback
+def async_get_card_cache(hass: HomeAssistant, entry_id: str) -> CardPayloadCache | None:
+    """Return the card payload cache of a config entry."""
+    entry_data = hass.data.get(DOMAIN, {}).get(entry_id)
+    if not isinstance(entry_data, dict):
+        return None
+    return entry_data.get(ENTRY_CARD_PAYLOAD)
+
+
+class NWSCardView(HomeAssistantView):
+    """Serve the card payload of a config entry with ETag support."""
+
+    url = CARD_VIEW_URL
+    name = "api:nwsdetailedforecast:card"
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the card view."""
+        self.hass = hass
+
+    async def get(self, request: web.Request, entry_id: str) -> web.Response:
+        """Return the card payload, or 304 when the client copy is current."""
+        card_cache = async_get_card_cache(self.hass, entry_id)
+        if card_cache is None:
+            return web.Response(status=404)
+
+        payload = card_cache.payload
+        if payload is None:
+            return web.Response(status=503)
+
+        headers = {hdrs.ETAG: payload.etag, hdrs.CACHE_CONTROL: "no-cache"}
+        if_none_match = request.headers.get(hdrs.IF_NONE_MATCH, "")
+        if payload.etag in (tag.strip() for tag in if_none_match.split(",")):
+            return web.Response(status=304, headers=headers)
+
+        return web.Response(
+            text=payload.body, content_type="application/json", headers=headers
+        )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_TYPE_CARD,
+        vol.Required("entry_id"): str,
+    }
+)
+@callback
+def websocket_card(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return the card payload of a config entry."""
+    card_cache = async_get_card_cache(hass, msg["entry_id"])
+    if card_cache is None or card_cache.payload is None:
+        connection.send_error(
+            msg["id"], websocket_api.const.ERR_NOT_FOUND, "No forecast available"
+        )
+        return
+
+    # The payload is already serialized, wrap it without decoding it again
+    connection.send_message(
+        f'{{"id":{msg["id"]},"type":"result","success":true,'
+        f'"result":{card_cache.payload.body}}}'
+    )
+
+
+@callback
+def async_setup_card(hass: HomeAssistant) -> None:
+    """Register the card view and websocket command."""
+    hass.http.register_view(NWSCardView(hass))
+    websocket_api.async_register_command(hass, websocket_card)
@@ -26,18 +26,39 @@ from .const import (
     DOMAIN,
     LANGUAGES,
     CONF_UNITS,
+    CONF_STATION_IDENTIFIER,
+    CONF_GRID_IDENTIFIER,
+    CONF_TWICEDAILY_FORECAST,
     DEFAULT_UNITS,
     ALL_CONDITIONS,
     NWS_PLATFORMS,
     NWS_PLATFORM,
+    CONF_DEFERRED_STARTUP,
+    DEFAULT_DEFERRED_STARTUP,
+    CONF_EXPOSE_METRICS,
+    DEFAULT_EXPOSE_METRICS,
+    CONF_BASE_URL,
+    DEFAULT_BASE_URL,
+    CONF_ARCHIVE,
+    DEFAULT_ARCHIVE,
+    CONF_ARCHIVE_DAYS,
+    DEFAULT_ARCHIVE_DAYS,
+    CONF_VERIFICATION,
+    DEFAULT_VERIFICATION,
+    CONF_OBSERVATIONS,
+    CONF_PRECIPITATION,
+    DEFAULT_OBSERVATIONS,
+    DEFAULT_PRECIPITATION,
+    CONF_ZONE_FALLBACK,
+    DEFAULT_ZONE_FALLBACK,
+    CONF_ALERTS,
+    DEFAULT_ALERTS,
 )
+from .api import gridpoint_url
 
 ATTRIBUTION = "Powered by the National Weather Forecast"
 _LOGGER = logging.getLogger(__name__)
 
-CONF_TWICEDAILY_FORECAST = "twicedaily_forecast"
-CONF_STATION_IDENTIFIER = "stationID"
-CONF_GRID_IDENTIFIER = "gridCoords"
 
 class NWSDetailedForecastConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Config flow for NWS Detailed Forecast."""
@@ -71,8 +92,32 @@ class NWSDetailedForecastConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 vol.Optional(CONF_UNITS, default=DEFAULT_UNITS): vol.In(
                     ["si", "us", "ca", "uk"]
                 ),
+                vol.Optional(
+                    CONF_DEFERRED_STARTUP, default=DEFAULT_DEFERRED_STARTUP
+                ): bool,
+                vol.Optional(
+                    CONF_EXPOSE_METRICS, default=DEFAULT_EXPOSE_METRICS
+                ): bool,
+                vol.Optional(CONF_ARCHIVE, default=DEFAULT_ARCHIVE): bool,
+                vol.Optional(
+                    CONF_ARCHIVE_DAYS, default=DEFAULT_ARCHIVE_DAYS
+                ): vol.All(int, vol.Range(min=1, max=365)),
+                vol.Optional(CONF_VERIFICATION, default=DEFAULT_VERIFICATION): bool,
+                vol.Optional(CONF_OBSERVATIONS, default=DEFAULT_OBSERVATIONS): bool,
+                vol.Optional(
+                    CONF_PRECIPITATION, default=DEFAULT_PRECIPITATION
+                ): bool,
+                vol.Optional(
+                    CONF_ZONE_FALLBACK, default=DEFAULT_ZONE_FALLBACK
+                ): bool,
+                vol.Optional(CONF_ALERTS, default=DEFAULT_ALERTS): bool,
             }
         )
+        # Only needed to point the integration at a mirror or a mock server
+        if self.show_advanced_options:
+            schema = schema.extend(
+                {vol.Optional(CONF_BASE_URL, default=DEFAULT_BASE_URL): str}
+            )
 
         if user_input is not None:
             station = user_input[CONF_STATION_IDENTIFIER]
@@ -100,7 +145,11 @@ class NWSDetailedForecastConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
             try:
                 api_status = await _is_nws_api_online(
-                    self.hass, user_input[CONF_API_KEY], station, grid
+                    self.hass,
+                    user_input[CONF_API_KEY],
+                    station,
+                    grid,
+                    user_input.get(CONF_BASE_URL, DEFAULT_BASE_URL),
                 )
 
                 if api_status == 403:
@@ -146,6 +195,24 @@ class NWSDetailedForecastConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             config[NWS_PLATFORM] = None
         if CONF_SCAN_INTERVAL not in config:
             config[CONF_SCAN_INTERVAL] = DEFAULT_SCAN_INTERVAL
+        if CONF_DEFERRED_STARTUP not in config:
+            config[CONF_DEFERRED_STARTUP] = DEFAULT_DEFERRED_STARTUP
+        if CONF_EXPOSE_METRICS not in config:
+            config[CONF_EXPOSE_METRICS] = DEFAULT_EXPOSE_METRICS
+        if CONF_ARCHIVE not in config:
+            config[CONF_ARCHIVE] = DEFAULT_ARCHIVE
+        if CONF_ARCHIVE_DAYS not in config:
+            config[CONF_ARCHIVE_DAYS] = DEFAULT_ARCHIVE_DAYS
+        if CONF_VERIFICATION not in config:
+            config[CONF_VERIFICATION] = DEFAULT_VERIFICATION
+        if CONF_OBSERVATIONS not in config:
+            config[CONF_OBSERVATIONS] = DEFAULT_OBSERVATIONS
+        if CONF_PRECIPITATION not in config:
+            config[CONF_PRECIPITATION] = DEFAULT_PRECIPITATION
+        if CONF_ZONE_FALLBACK not in config:
+            config[CONF_ZONE_FALLBACK] = DEFAULT_ZONE_FALLBACK
+        if CONF_ALERTS not in config:
+            config[CONF_ALERTS] = DEFAULT_ALERTS
         return await self.async_step_user(config)
 
 
@@ -229,19 +296,105 @@ class NWSDetailedForecastOptionsFlow(config_entries.OptionsFlow):
                             self.config_entry.data.get(CONF_UNITS, DEFAULT_UNITS),
                         ),
                     ): vol.In(["si", "us", "ca", "uk"]),
+                    vol.Optional(
+                        CONF_DEFERRED_STARTUP,
+                        default=self.config_entry.options.get(
+                            CONF_DEFERRED_STARTUP,
+                            self.config_entry.data.get(
+                                CONF_DEFERRED_STARTUP, DEFAULT_DEFERRED_STARTUP
+                            ),
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_EXPOSE_METRICS,
+                        default=self.config_entry.options.get(
+                            CONF_EXPOSE_METRICS,
+                            self.config_entry.data.get(
+                                CONF_EXPOSE_METRICS, DEFAULT_EXPOSE_METRICS
+                            ),
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_ARCHIVE,
+                        default=self.config_entry.options.get(
+                            CONF_ARCHIVE,
+                            self.config_entry.data.get(CONF_ARCHIVE, DEFAULT_ARCHIVE),
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_ARCHIVE_DAYS,
+                        default=self.config_entry.options.get(
+                            CONF_ARCHIVE_DAYS,
+                            self.config_entry.data.get(
+                                CONF_ARCHIVE_DAYS, DEFAULT_ARCHIVE_DAYS
+                            ),
+                        ),
+                    ): vol.All(int, vol.Range(min=1, max=365)),
+                    vol.Optional(
+                        CONF_VERIFICATION,
+                        default=self.config_entry.options.get(
+                            CONF_VERIFICATION,
+                            self.config_entry.data.get(
+                                CONF_VERIFICATION, DEFAULT_VERIFICATION
+                            ),
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_OBSERVATIONS,
+                        default=self.config_entry.options.get(
+                            CONF_OBSERVATIONS,
+                            self.config_entry.data.get(
+                                CONF_OBSERVATIONS, DEFAULT_OBSERVATIONS
+                            ),
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_PRECIPITATION,
+                        default=self.config_entry.options.get(
+                            CONF_PRECIPITATION,
+                            self.config_entry.data.get(
+                                CONF_PRECIPITATION, DEFAULT_PRECIPITATION
+                            ),
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_ZONE_FALLBACK,
+                        default=self.config_entry.options.get(
+                            CONF_ZONE_FALLBACK,
+                            self.config_entry.data.get(
+                                CONF_ZONE_FALLBACK, DEFAULT_ZONE_FALLBACK
+                            ),
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_ALERTS,
+                        default=self.config_entry.options.get(
+                            CONF_ALERTS,
+                            self.config_entry.data.get(CONF_ALERTS, DEFAULT_ALERTS),
+                        ),
+                    ): bool,
+                    **(
+                        {
+                            vol.Optional(
+                                CONF_BASE_URL,
+                                default=self.config_entry.options.get(
+                                    CONF_BASE_URL,
+                                    self.config_entry.data.get(
+                                        CONF_BASE_URL, DEFAULT_BASE_URL
+                                    ),
+                                ),
+                            ): str
+                        }
+                        if self.show_advanced_options
+                        else {}
+                    ),
                 }
             ),
         )
 
 
-async def _is_nws_api_online(hass, api_key, station, grid):
-    forecastString = (
-        "https://api.weather.gov/gridpoints/"
-        + str(station)
-        + "/"
-        + str(grid)
-        + "/forecast"
-    )
+async def _is_nws_api_online(hass, api_key, station, grid, base_url=DEFAULT_BASE_URL):
+    forecastString = gridpoint_url(str(station), str(grid), base_url=base_url)
 
     async with aiohttp.ClientSession(raise_for_status=False) as session, session.get(
         forecastString
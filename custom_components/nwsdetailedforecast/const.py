@@ -1,32 +1,9 @@
 """Consts for the NWS Detailed Forecasts."""
 from __future__ import annotations
 
-from homeassistant.components.sensor import (
-    SensorDeviceClass,
-    SensorEntityDescription,
-    SensorStateClass,
-)
+from datetime import timedelta
 
-from homeassistant.components.weather import (
-    ATTR_FORECAST_CONDITION,
-    ATTR_FORECAST_PRECIPITATION_PROBABILITY,
-    ATTR_FORECAST_TEMP,
-    ATTR_FORECAST_TIME,
-    ATTR_FORECAST_HUMIDITY,
-    ATTR_FORECAST_DEW_POINT,
-    ATTR_FORECAST_WIND_SPEED,
-    ATTR_FORECAST_WIND_BEARING,
-)
-from homeassistant.const import (
-    DEGREE,
-    UnitOfLength,
-    PERCENTAGE,
-    UnitOfPressure,
-    UnitOfSpeed,
-    UnitOfTemperature,
-    UV_INDEX,
-    Platform,
-)
+from homeassistant.const import Platform
 
 DOMAIN = "nwsdetailedforecast"
 DEFAULT_NAME = "NWSDetailedForecast"
@@ -37,6 +14,9 @@ ATTRIBUTION = "Data provided by NWS Forecast API"
 MANUFACTURER = "NWS"
 CONF_LANGUAGE = "language"
 CONF_UNITS = "units"
+CONF_STATION_IDENTIFIER = "stationID"
+CONF_GRID_IDENTIFIER = "gridCoords"
+CONF_TWICEDAILY_FORECAST = "twicedaily_forecast"
 CONFIG_FLOW_VERSION = 2
 ENTRY_NAME = "name"
 ENTRY_WEATHER_COORDINATOR = "weather_coordinator"
@@ -47,23 +27,119 @@ ATTR_API_STARTTIME = "startTime"
 ATTR_API_ENDTIME = "endTime"
 ATTR_API_DEW_POINT = "dewpoint"
 ATTR_API_TEMPERATURE = "temperature"
-ATTR_API_FEELS_LIKE_TEMPERATURE = "feels_like_temperature"
+ATTR_API_FEELS_LIKE_TEMPERATURE = "feelsLikeTemperature"
+ATTR_API_HEAT_INDEX = "heatIndex"
+ATTR_API_WIND_CHILL = "windChill"
+ATTR_API_DEWPOINT_DEPRESSION = "dewpointDepression"
 ATTR_API_WIND_SPEED = "windSpeed"
 ATTR_API_WIND_DIRECTION = "windDirection"
+ATTR_API_WIND_SPEED_MIN = "windSpeedMin"
+ATTR_API_WIND_SPEED_MAX = "windSpeedMax"
+ATTR_API_WIND_SPEED_MEAN = "windSpeedMean"
+ATTR_API_WIND_SPEED_UNIT = "windSpeedUnit"
+ATTR_API_WIND_BEARING = "windBearing"
 ATTR_API_HUMIDITY = "relativeHumidity"
 ATTR_API_SHORTFORECAST = "shortForecast"
 ATTR_API_DETAILEDFORECAST = "detailedForecast"
 ATTR_API_NWSICONURL = "icon"
+ATTR_API_ISDAYTIME = "isDaytime"
+ATTR_API_CONDITION_KEY = "conditionKey"
 UPDATE_LISTENER = "update_listener"
 PLATFORMS = [Platform.SENSOR, Platform.WEATHER]
 NWS_PLATFORMS = ["Sensor", "Weather"]
 NWS_PLATFORM = "nws_detailed_platform"
+CONF_DEFERRED_STARTUP = "deferred_startup"
+DEFAULT_DEFERRED_STARTUP = True
+ENTRY_SETUP_METRICS = "setup_metrics"
+RESTORE_STATE_MAX_AGE = timedelta(hours=12)
+DATA_ICON_CACHE = "icon_cache"
+DEFAULT_ICON_CACHE_SIZE = 10 * 1024 * 1024
+ENTRY_CARD_PAYLOAD = "card_payload"
+CARD_TEXT_MAX_LENGTH = 200
+CARD_DELTA_HISTORY = 4
+CARD_SUBSCRIPTION_THROTTLE = 5.0
+CONF_EXPOSE_METRICS = "expose_metrics"
+DEFAULT_EXPOSE_METRICS = False
+DATA_METRICS_REGISTRY = "metrics_registry"
+CIRCUIT_BREAKER_THRESHOLD = 3
+CONF_BASE_URL = "base_url"
+DEFAULT_BASE_URL = "https://api.weather.gov"
+CONF_ARCHIVE = "archive_forecasts"
+DEFAULT_ARCHIVE = False
+CONF_ARCHIVE_DAYS = "archive_days"
+DEFAULT_ARCHIVE_DAYS = 30
+ARCHIVE_MAX_ISSUANCES = 5000
+ENTRY_ARCHIVE = "archive"
+CONF_VERIFICATION = "verify_forecasts"
+DEFAULT_VERIFICATION = False
+ENTRY_VERIFIER = "verifier"
+OBSERVATION_SCAN_INTERVAL = timedelta(minutes=20)
+OBSERVATION_BACKFILL = timedelta(days=1)
+VERIFICATION_LEAD_HOURS = 12
+VERIFICATION_LEAD_BUCKETS = 14
+CONF_OBSERVATIONS = "current_observations"
+DEFAULT_OBSERVATIONS = True
+DATA_OBSERVATION_HUB = "observation_hub"
+ENTRY_CURRENT_OBSERVATION = "current_observation"
+OBSERVATION_LATEST_INTERVAL = timedelta(minutes=10)
+OBSERVATION_MAX_AGE = timedelta(hours=2)
+CONF_PRECIPITATION = "precipitation_totals"
+DEFAULT_PRECIPITATION = False
+ENTRY_PRECIPITATION = "precipitation"
+# The gridpoint layers are large and NWS updates them about hourly
+PRECIPITATION_SCAN_INTERVAL = timedelta(hours=1)
+# Hours ahead of the rolling precipitation total sensors
+PRECIPITATION_WINDOWS = (6, 24, 72)
+DATA_LOOKUP_CACHE = "lookup_cache"
+LOOKUP_CACHE_SIZE = 64
+# Freshness of lookups when NWS sends no Expires or max-age, and the cap
+LOOKUP_DEFAULT_TTL = timedelta(minutes=15)
+LOOKUP_MAX_TTL = timedelta(days=1)
+DATA_FORECAST_STORE = "forecast_store"
+# Memory budget in MiB of the forecast data of every location together
+CONF_MEMORY_BUDGET = "memory_budget"
+DEFAULT_MEMORY_BUDGET = 64
+MEMORY_CHECK_INTERVAL = timedelta(minutes=5)
+CONF_ZONE_FALLBACK = "zone_fallback"
+DEFAULT_ZONE_FALLBACK = True
+# Tiers of the forecast source chain, in the order they are tried
+FORECAST_SOURCE_GRIDPOINT = "gridpoint"
+FORECAST_SOURCE_ZONE = "zone"
+FORECAST_SOURCE_CACHED = "cached"
+# How long the last good forecast stands in when every source fails
+FALLBACK_MAX_AGE = timedelta(hours=12)
+CONF_ALERTS = "area_alerts"
+DEFAULT_ALERTS = False
+DATA_ALERT_HUB = "alert_hub"
+ENTRY_ALERTS = "alerts"
+ALERTS_SCAN_INTERVAL = timedelta(minutes=5)
+# Degrees of latitude and longitude per cell of the alert polygon index
+ALERT_INDEX_CELL = 0.5
+# Distinct forecast texts, names and icon URLs shared across locations
+TEXT_POOL_SIZE = 4096
+DEFAULT_FORECAST_MODE = "twicedaily"
+FORECAST_MODES = [DEFAULT_FORECAST_MODE]
+DEFAULT_MONITORED_CONDITIONS = [
+    "shortForecast",
+    "detailedForecast",
+    "icon",
+    "precip_probability",
+    "temperature",
+    "dewpoint",
+    "windSpeed",
+    "windDirection",
+    "relativeHumidity",
+]
 
 ALL_CONDITIONS = {
     "probabilityOfPrecipitation": "Precipitation Probability",
     "temperature": "Temperature",
     "dewpoint": "Dew Point",
     "relativeHumidity": "Relative Humidity",
+    "feels_like_temperature": "Feels Like Temperature",
+    "heat_index": "Heat Index",
+    "wind_chill": "Wind Chill",
+    "dewpoint_depression": "Dew Point Depression",
     "windSpeed": "Wind Speed",
     "windDirection": "Wind Direction",
     "shortForecast" : "Short Forecast",
@@ -71,66 +147,25 @@ ALL_CONDITIONS = {
     "updated": "Updated At",
 }
 
+# Weather entity condition values, spelled out so that loading the
+# integration does not import the weather component for sensor-only setups
+MAP_CONDITION = {
+    "clear-day": "sunny",
+    "clear-night": "clear-night",
+    "rain": "rainy",
+    "snow": "snowy",
+    "sleet": "snowy-rainy",
+    "wind": "windy",
+    "fog": "fog",
+    "cloudy": "cloudy",
+    "partly-cloudy-day": "partlycloudy",
+    "partly-cloudy-night": "partlycloudy",
+    "hail": "hail",
+    "thunderstorm": "lightning",
+    "tornado": "exceptional",
+}
+
 LANGUAGES = [
     "en",
 ]
 
-
-FORECAST_SENSOR_TYPES: tuple[SensorEntityDescription, ...] = (
-    SensorEntityDescription(
-        key=ATTR_FORECAST_PRECIPITATION_PROBABILITY,
-        name="Precipitation probability",
-        native_unit_of_measurement=PERCENTAGE,
-    ),
-    SensorEntityDescription(
-        key=ATTR_FORECAST_TEMP,
-        name="Temperature",
-        native_unit_of_measurement=UnitOfTemperature.FAHRENHEIT,
-        device_class=SensorDeviceClass.TEMPERATURE,
-    ),
-    SensorEntityDescription(
-        key=ATTR_FORECAST_DEW_POINT,
-        name="Dew Point",
-        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-        device_class=SensorDeviceClass.TEMPERATURE,
-    ),
-    SensorEntityDescription(
-        key=ATTR_FORECAST_HUMIDITY,
-        name="Relative Humidity",
-        native_unit_of_measurement=PERCENTAGE,
-    ),
-    SensorEntityDescription(
-        key=ATTR_FORECAST_TIME,
-        name="Time",
-        device_class=SensorDeviceClass.TIMESTAMP,
-    ),
-    SensorEntityDescription(
-        key=ATTR_API_WIND_SPEED,
-        name="Wind Speed",
-    ),
-    SensorEntityDescription(
-        key=ATTR_API_WIND_DIRECTION,
-        name="Wind Direction",
-    ),
-    SensorEntityDescription(
-        key=ATTR_API_SHORTFORECAST,
-        name="Short Forecast",
-    ),
-    SensorEntityDescription(
-        key=ATTR_API_DETAILEDFORECAST,
-        name="Detailed Forecast",
-    ),
-    SensorEntityDescription(
-        key=ATTR_API_PERIODNUMBER,
-        name="Period Number",
-    ),
-    SensorEntityDescription(
-        key=ATTR_API_PERIODNAME,
-        name="Period Name",
-    ),
-    SensorEntityDescription(
-        key=ATTR_API_NWSICONURL,
-        name="NWS Icon URL",
-    ),
-
-)
\ No newline at end of file
@@ -0,0 +1,141 @@
+"""Diagnostics support for NWS Detailed Forecast."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_API_KEY
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    DATA_ICON_CACHE,
+    DATA_LOOKUP_CACHE,
+    DOMAIN,
+    ENTRY_ARCHIVE,
+    ENTRY_CARD_PAYLOAD,
+    ENTRY_ALERTS,
+    ENTRY_CURRENT_OBSERVATION,
+    ENTRY_PRECIPITATION,
+    ENTRY_SETUP_METRICS,
+    ENTRY_VERIFIER,
+    ENTRY_WEATHER_COORDINATOR,
+)
+from .metrics import deep_sizeof
+from .parsing import TEXT_POOL, classify_icon, classify_phrase, parse_wind_speed
+from .store import SHARED, async_get_store
+
+TO_REDACT = {CONF_API_KEY}
+
+
+def _coordinator_diagnostics(coordinator) -> dict[str, Any]:
+    """Return the fetch history and figures of one coordinator."""
+    return {
+        "last_update_success": coordinator.last_update_success,
+        "source": getattr(coordinator, "source", None),
+        "update_interval": coordinator.update_interval.total_seconds(),
+        "fetches": list(coordinator.perf_stats.fetches),
+        "performance": coordinator.perf_stats.as_dict(),
+        "data_memory_bytes": deep_sizeof(coordinator.data)
+        if coordinator.data is not None
+        else 0,
+    }
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+
+    coordinators = {"forecast": entry_data[ENTRY_WEATHER_COORDINATOR]}
+    if (current := entry_data.get(ENTRY_CURRENT_OBSERVATION)) is not None:
+        coordinators["observations"] = current.hub
+    if (precipitation := entry_data.get(ENTRY_PRECIPITATION)) is not None:
+        coordinators["precipitation"] = precipitation
+    if (location_alerts := entry_data.get(ENTRY_ALERTS)) is not None:
+        coordinators["alerts"] = location_alerts.hub
+
+    caches: dict[str, Any] = {
+        name: parser.cache_info()._asdict()
+        for name, parser in (
+            ("wind_speed", parse_wind_speed),
+            ("condition_icon", classify_icon),
+            ("condition_phrase", classify_phrase),
+        )
+    }
+    caches["text_pool"] = {
+        "entries": TEXT_POOL.size,
+        "max_entries": TEXT_POOL.max_entries,
+        "bytes": TEXT_POOL.memory_bytes(),
+        "hits": TEXT_POOL.hits,
+        "misses": TEXT_POOL.misses,
+    }
+    if (icon_cache := hass.data[DOMAIN].get(DATA_ICON_CACHE)) is not None:
+        caches["icon_cache"] = {
+            "entries": icon_cache.size,
+            "bytes": icon_cache.total_bytes,
+            "max_bytes": icon_cache.max_bytes,
+            "hits": icon_cache.hits,
+            "misses": icon_cache.misses,
+        }
+    if (lookup_cache := hass.data[DOMAIN].get(DATA_LOOKUP_CACHE)) is not None:
+        caches["lookup"] = {
+            "entries": lookup_cache.size,
+            "max_entries": lookup_cache.max_entries,
+            "hits": lookup_cache.hits,
+            "misses": lookup_cache.misses,
+            "coalesced": lookup_cache.coalesced,
+        }
+    if (card_cache := entry_data.get(ENTRY_CARD_PAYLOAD)) is not None:
+        caches["card_payload"] = {
+            "version": card_cache.version,
+            "bytes": len(card_cache.payload.body) if card_cache.payload else 0,
+        }
+    if (archive := entry_data.get(ENTRY_ARCHIVE)) is not None:
+        caches["archive"] = {
+            "issuances": archive.issuances,
+            "bytes": archive.size,
+            "max_age_days": archive.max_age.days,
+        }
+
+    memory = None
+    if (store := async_get_store(hass)) is not None:
+        memory = {
+            "budget_bytes": store.budget,
+            "total_bytes": store.total(),
+            "evictions": store.evictions,
+            "location": store.memory(entry.entry_id),
+            "shared": store.memory(SHARED),
+        }
+
+    verification = None
+    if (verifier := entry_data.get(ENTRY_VERIFIER)) is not None:
+        verification = {
+            "station": verifier.coordinator.station_id,
+            "last_update_success": verifier.coordinator.last_update_success,
+            "verified_until": verifier.verified_until,
+            "periods": verifier.periods,
+            **verifier.summary(),
+        }
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "setup": entry_data.get(ENTRY_SETUP_METRICS),
+        "coordinators": {
+            name: _coordinator_diagnostics(coordinator)
+            for name, coordinator in coordinators.items()
+        },
+        "caches": caches,
+        "memory": memory,
+        "verification": verification,
+        "alerts": location_alerts.diagnostics()
+        if location_alerts is not None
+        else None,
+        "current_observation": {
+            "station": current.station_id,
+            "observation": current.period(),
+        }
+        if current is not None
+        else None,
+    }
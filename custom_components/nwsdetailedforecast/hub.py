@@ -0,0 +1,48 @@
+"""Coordinators polling on behalf of every config entry at once."""
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+import logging
+from typing import TypeVar
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+_DataT = TypeVar("_DataT")
+
+
+class SharedHub(DataUpdateCoordinator[_DataT]):
+    """A coordinator shared by the entries, outliving any one of them.
+
+    Entries starting to track something request a refresh, debounced so
+    entries set up together share it. The requests run as tasks of the hub,
+    cancelled when it shuts down.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        logger: logging.Logger,
+        *,
+        name: str,
+        update_interval: timedelta,
+    ) -> None:
+        """Initialize the hub."""
+        self._refresh_tasks: set[asyncio.Task] = set()
+        super().__init__(hass, logger, name=name, update_interval=update_interval)
+
+    @callback
+    def _async_schedule_request(self) -> None:
+        """Request a refresh in a task cancelled when the hub shuts down."""
+        task = self.hass.async_create_background_task(
+            self.async_request_refresh(), f"{self.name} refresh"
+        )
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    async def async_shutdown(self) -> None:
+        """Cancel pending refresh requests and stop polling."""
+        for task in list(self._refresh_tasks):
+            task.cancel()
+        await super().async_shutdown()
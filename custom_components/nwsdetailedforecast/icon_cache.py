@@ -0,0 +1,201 @@
+"""Local disk cache and HTTP view for NWS forecast icons."""
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from functools import lru_cache
+import hashlib
+import logging
+import os
+import re
+
+from aiohttp import hdrs, web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .const import DEFAULT_ICON_CACHE_SIZE
+
+_LOGGER = logging.getLogger(__name__)
+
+ICON_VIEW_URL = "/api/nwsdetailedforecast/icon/{icon_id}"
+ICON_CACHE_CONTROL = "public, max-age=31536000, immutable"
+ICON_SUFFIX = ".png"
+# URLs of icons are remembered well past their eviction from disk, so
+# pages and states still showing an evicted icon can have it fetched again
+MAX_ICON_URLS = 4096
+
+_ICON_ID_RE = re.compile(r"^[0-9a-f]{40}$")
+
+
+@lru_cache(maxsize=512)
+def icon_id(icon_url: str) -> str:
+    """Return the stable cache id for an NWS icon URL."""
+    return hashlib.sha1(icon_url.encode()).hexdigest()
+
+
+def local_icon_url(icon_url: str) -> str:
+    """Return the local URL serving an NWS icon, without caching it."""
+    return ICON_VIEW_URL.format(icon_id=icon_id(icon_url))
+
+
+class IconCache:
+    """Size bounded LRU cache of NWS icons stored on disk."""
+
+    def __init__(
+        self, hass: HomeAssistant, directory: str, max_bytes: int = DEFAULT_ICON_CACHE_SIZE
+    ) -> None:
+        """Initialize the icon cache."""
+        self.hass = hass
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+
+        # icon id -> file size, least recently used first
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        # icon id -> NWS URL, least recently used first
+        self._urls: OrderedDict[str, str] = OrderedDict()
+        self._pending: dict[str, asyncio.Task[bool]] = {}
+        self._total_bytes = 0
+
+    @property
+    def size(self) -> int:
+        """Return the number of cached icons."""
+        return len(self._entries)
+
+    @property
+    def total_bytes(self) -> int:
+        """Return the bytes used on disk."""
+        return self._total_bytes
+
+    def _path(self, icon_id: str) -> str:
+        return os.path.join(self.directory, icon_id + ICON_SUFFIX)
+
+    def _scan(self) -> list[tuple[str, int]]:
+        """Create the cache directory and list cached icons, oldest first."""
+        os.makedirs(self.directory, exist_ok=True)
+        found = []
+        for entry in os.scandir(self.directory):
+            name, suffix = os.path.splitext(entry.name)
+            if suffix == ICON_SUFFIX and _ICON_ID_RE.match(name):
+                stat = entry.stat()
+                found.append((stat.st_mtime, name, stat.st_size))
+        return [(name, size) for _, name, size in sorted(found)]
+
+    async def async_load(self) -> None:
+        """Index the icons already on disk."""
+        for cached_id, size in await self.hass.async_add_executor_job(self._scan):
+            self._entries[cached_id] = size
+            self._total_bytes += size
+        await self._async_evict()
+
+    @callback
+    def local_url(self, icon_url: str) -> str:
+        """Return the local URL serving an NWS icon and start caching it."""
+        cached_id = icon_id(icon_url)
+        if cached_id in self._urls:
+            self._urls.move_to_end(cached_id)
+        else:
+            self._urls[cached_id] = icon_url
+            if len(self._urls) > MAX_ICON_URLS:
+                self._urls.popitem(last=False)
+            if cached_id not in self._entries:
+                self._async_schedule_fetch(cached_id, icon_url)
+        return local_icon_url(icon_url)
+
+    @callback
+    def _async_schedule_fetch(
+        self, cached_id: str, icon_url: str
+    ) -> asyncio.Task[bool]:
+        """Start fetching an icon unless a fetch is already running."""
+        if (task := self._pending.get(cached_id)) is None:
+            task = self.hass.async_create_background_task(
+                self._async_fetch(cached_id, icon_url),
+                f"nwsdetailedforecast icon {cached_id}",
+            )
+            self._pending[cached_id] = task
+        return task
+
+    async def async_path(self, cached_id: str) -> str | None:
+        """Return the file for an icon id, fetching it if needed."""
+        if cached_id in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(cached_id)
+            return self._path(cached_id)
+
+        # Evicted icons still shown on pages or in states are fetched again
+        if (icon_url := self._urls.get(cached_id)) is None:
+            return None
+
+        if not await self._async_schedule_fetch(cached_id, icon_url):
+            return None
+        return self._path(cached_id)
+
+    def _write(self, cached_id: str, body: bytes) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._path(cached_id), "wb") as icon_file:
+            icon_file.write(body)
+
+    def _remove(self, cached_ids: list[str]) -> None:
+        for cached_id in cached_ids:
+            try:
+                os.remove(self._path(cached_id))
+            except FileNotFoundError:
+                pass
+
+    async def _async_fetch(self, cached_id: str, icon_url: str) -> bool:
+        """Download an icon once through the shared session."""
+        self.misses += 1
+        session = async_get_clientsession(self.hass)
+        try:
+            async with session.get(icon_url, raise_for_status=True) as resp:
+                body = await resp.read()
+            await self.hass.async_add_executor_job(self._write, cached_id, body)
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.debug("Could not cache NWS icon %s: %s", icon_url, err)
+            return False
+        finally:
+            self._pending.pop(cached_id, None)
+
+        self._entries[cached_id] = len(body)
+        self._total_bytes += len(body)
+        await self._async_evict()
+        return True
+
+    async def _async_evict(self) -> None:
+        """Drop the least recently used icons until within the size budget."""
+        evicted = []
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            cached_id, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            evicted.append(cached_id)
+        if evicted:
+            await self.hass.async_add_executor_job(self._remove, evicted)
+
+
+class NWSIconView(HomeAssistantView):
+    """Serve cached NWS icons with long lived cache headers."""
+
+    url = ICON_VIEW_URL
+    name = "api:nwsdetailedforecast:icon"
+    requires_auth = False
+
+    def __init__(self, icon_cache: IconCache) -> None:
+        """Initialize the icon view."""
+        self._icon_cache = icon_cache
+
+    async def get(self, request: web.Request, icon_id: str) -> web.StreamResponse:
+        """Return a cached icon."""
+        if not _ICON_ID_RE.match(icon_id):
+            return web.Response(status=404)
+
+        path = await self._icon_cache.async_path(icon_id)
+        if path is None:
+            return web.Response(status=404)
+
+        return web.FileResponse(
+            path, headers={hdrs.CACHE_CONTROL: ICON_CACHE_CONTROL}
+        )
@@ -0,0 +1,281 @@
+"""Forecast lookups for arbitrary locations, without a config entry."""
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Mapping
+from email.utils import parsedate_to_datetime
+import json
+import logging
+import re
+import time
+from typing import Any
+
+import aiohttp
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+
+from .api import gridpoint_url, points_url
+from .card import build_card_period
+from .const import (
+    DATA_LOOKUP_CACHE,
+    DEFAULT_BASE_URL,
+    DOMAIN,
+    LOOKUP_CACHE_SIZE,
+    LOOKUP_DEFAULT_TTL,
+    LOOKUP_MAX_TTL,
+)
+from .metrics import deep_sizeof
+from .observations import async_get_json
+from .parsing import ingest_periods
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_GET_FORECAST = "get_forecast"
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+def response_ttl(headers: Mapping[str, str], now: float) -> float:
+    """Return how many seconds a response stays fresh.
+
+    NWS sends an Expires header with every forecast; Cache-Control max-age
+    and then a default stand in when it is missing.
+    """
+    if expires := headers.get(aiohttp.hdrs.EXPIRES):
+        try:
+            ttl = parsedate_to_datetime(expires).timestamp() - now
+        except (TypeError, ValueError):
+            pass
+        else:
+            return min(max(ttl, 0.0), LOOKUP_MAX_TTL.total_seconds())
+    if match := _MAX_AGE_RE.search(headers.get(aiohttp.hdrs.CACHE_CONTROL, "")):
+        return min(float(match.group(1)), LOOKUP_MAX_TTL.total_seconds())
+    return LOOKUP_DEFAULT_TTL.total_seconds()
+
+
+def _forecast(body: bytes) -> dict[str, Any]:
+    """Decode a forecast and return its update time and card periods."""
+    properties = json.loads(body).get("properties") or {}
+    periods = properties.get("periods") or []
+    ingest_periods(periods)
+    return {
+        "updated": properties.get("updateTime"),
+        "forecast": [build_card_period(period, None) for period in periods],
+    }
+
+
+def _retrieve_exception(task: asyncio.Task) -> None:
+    """Mark the failure of a lookup as seen, for when every caller went away."""
+    if not task.cancelled():
+        task.exception()
+
+
+class LookupCache:
+    """Least recently used responses, each kept until it expires.
+
+    Concurrent lookups of the same key share one request, so a burst of
+    automations asking about one place costs NWS a single call.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        max_entries: int = LOOKUP_CACHE_SIZE,
+        base_url: str = DEFAULT_BASE_URL,
+    ) -> None:
+        """Initialize the cache."""
+        self.hass = hass
+        self.max_entries = max_entries
+        self.base_url = base_url
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.last_used = 0.0
+        # Key to (expiry on the monotonic clock, value, size in bytes)
+        self._entries: OrderedDict[tuple, tuple[float, Any, int]] = OrderedDict()
+        self._bytes = 0
+        self._pending: dict[tuple, asyncio.Task[Any]] = {}
+
+    @property
+    def size(self) -> int:
+        """Return the number of cached responses."""
+        return len(self._entries)
+
+    def memory_bytes(self) -> int:
+        """Return the memory held by the cached responses."""
+        return self._bytes
+
+    def _discard(self, key: tuple) -> None:
+        self._bytes -= self._entries.pop(key)[2]
+
+    def evict(self) -> None:
+        """Drop the expired responses and the least recently used half."""
+        now = time.monotonic()
+        for key in [key for key, entry in self._entries.items() if entry[0] <= now]:
+            self._discard(key)
+        for key in list(self._entries)[: len(self._entries) // 2 or len(self._entries)]:
+            self._discard(key)
+
+    async def async_get(
+        self, key: tuple, fetch: Callable[[], Awaitable[tuple[Any, float]]]
+    ) -> Any:
+        """Return the cached value of a key, fetching it when missing or expired.
+
+        fetch returns the value and how many seconds it stays fresh.
+        """
+        now = self.last_used = time.monotonic()
+        if (entry := self._entries.get(key)) is not None:
+            if entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self._discard(key)
+
+        if (task := self._pending.get(key)) is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            # Owned by the cache, so a caller going away does not cancel
+            # the lookup for the callers sharing it
+            task = self._pending[key] = self.hass.async_create_background_task(
+                self._async_fetch(key, fetch), f"{DOMAIN} lookup {key[0]}"
+            )
+            task.add_done_callback(_retrieve_exception)
+        return await asyncio.shield(task)
+
+    async def _async_fetch(
+        self, key: tuple, fetch: Callable[[], Awaitable[tuple[Any, float]]]
+    ) -> Any:
+        """Fetch the value of a key for every caller waiting on it and cache it."""
+        try:
+            value, ttl = await fetch()
+        finally:
+            del self._pending[key]
+
+        if ttl > 0:
+            if key in self._entries:
+                self._discard(key)
+            size = deep_sizeof(value)
+            self._entries[key] = (time.monotonic() + ttl, value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries:
+                self._discard(next(iter(self._entries)))
+        return value
+
+    async def async_gridpoint(
+        self, latitude: float, longitude: float, base_url: str | None = None
+    ) -> dict[str, Any]:
+        """Return the forecast office, grid, zones and state of a location."""
+        base_url = base_url or self.base_url
+        # NWS resolves points to four decimals
+        point = f"{latitude:.4f},{longitude:.4f}"
+
+        async def fetch() -> tuple[dict[str, Any], float]:
+            _, payload, headers = await async_get_json(
+                self.hass, points_url(point, base_url)
+            )
+            properties = payload.get("properties") or {}
+            relative = (properties.get("relativeLocation") or {}).get("properties")
+            return {
+                "station": properties["gridId"],
+                "grid": f"{properties['gridX']},{properties['gridY']}",
+                "time_zone": properties.get("timeZone"),
+                # Zone codes such as OHZ010 and OHC035, as alerts list them
+                "zones": list(
+                    dict.fromkeys(
+                        url.rstrip("/").rsplit("/", 1)[-1]
+                        for key in ("forecastZone", "county", "fireWeatherZone")
+                        if (url := properties.get(key))
+                    )
+                ),
+                "state": (relative or {}).get("state"),
+            }, response_ttl(headers, time.time())
+
+        return await self.async_get(("points", base_url, point), fetch)
+
+    async def async_forecast(
+        self, station: str, grid: str, hourly: bool = False
+    ) -> dict[str, Any]:
+        """Return the forecast periods of a gridpoint."""
+        endpoint = "forecast/hourly" if hourly else "forecast"
+
+        async def fetch() -> tuple[dict[str, Any], float]:
+            _, body, headers = await async_get_json(
+                self.hass,
+                gridpoint_url(station, grid, endpoint, self.base_url),
+                decode=False,
+            )
+            # Decoding and ingest stay off the event loop
+            forecast = await self.hass.async_add_executor_job(_forecast, body)
+            return {
+                "station": station,
+                "grid": grid,
+                "updated": forecast["updated"],
+                "expires": headers.get(aiohttp.hdrs.EXPIRES),
+                "forecast": forecast["forecast"],
+            }, response_ttl(headers, time.time())
+
+        return await self.async_get(
+            ("forecast", self.base_url, station, grid, hourly), fetch
+        )
+
+
+GET_FORECAST_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Inclusive("latitude", "coordinates"): cv.latitude,
+            vol.Inclusive("longitude", "coordinates"): cv.longitude,
+            vol.Inclusive("station", "gridpoint"): cv.string,
+            vol.Inclusive("grid", "gridpoint"): cv.string,
+            vol.Optional("hourly", default=False): cv.boolean,
+        }
+    ),
+    cv.has_at_least_one_key("latitude", "station"),
+)
+
+
+@callback
+def async_setup_lookup(hass: HomeAssistant) -> None:
+    """Register the forecast lookup service."""
+    cache = hass.data[DOMAIN][DATA_LOOKUP_CACHE] = LookupCache(hass)
+
+    async def async_get_forecast(call: ServiceCall) -> ServiceResponse:
+        """Return the forecast of a location or gridpoint."""
+        try:
+            if "station" in call.data:
+                station = call.data["station"].strip().upper()
+                grid = call.data["grid"].replace(" ", "")
+            else:
+                gridpoint = await cache.async_gridpoint(
+                    call.data["latitude"], call.data["longitude"]
+                )
+                station, grid = gridpoint["station"], gridpoint["grid"]
+            return await cache.async_forecast(station, grid, call.data["hourly"])
+        except aiohttp.ClientResponseError as err:
+            raise HomeAssistantError(
+                f"NWS could not provide a forecast ({err.status}): {err.message}"
+            ) from err
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            raise HomeAssistantError(f"Error fetching the forecast: {err}") from err
+        except KeyError as err:
+            raise HomeAssistantError(
+                f"NWS has no forecast grid for this location: {err}"
+            ) from err
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_FORECAST,
+        async_get_forecast,
+        schema=GET_FORECAST_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
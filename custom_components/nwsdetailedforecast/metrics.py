@@ -0,0 +1,181 @@
+"""Lightweight timing and counter instrumentation."""
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import Counter, deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+import sys
+import time
+from typing import Any
+
+import aiohttp
+
+from .parsing import classify_icon, classify_phrase, parse_wind_speed
+
+# Upper bounds in seconds, the last bucket catches everything above
+HISTOGRAM_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+HISTOGRAM_WINDOW = 100
+FETCH_HISTORY_SIZE = 50
+
+
+class RollingHistogram:
+    """Cumulative bucket counts plus a window of recent samples."""
+
+    def __init__(self, window: int = HISTOGRAM_WINDOW) -> None:
+        """Initialize the histogram."""
+        self.buckets = [0] * (len(HISTOGRAM_BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.recent: deque[float] = deque(maxlen=window)
+
+    @property
+    def last(self) -> float | None:
+        """Return the most recent sample."""
+        return self.recent[-1] if self.recent else None
+
+    def observe(self, value: float) -> None:
+        """Record a sample."""
+        self.buckets[bisect_left(HISTOGRAM_BUCKETS, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.recent.append(value)
+
+    def percentile(self, fraction: float) -> float | None:
+        """Return a percentile of the recent samples."""
+        if not self.recent:
+            return None
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a summary for attributes and diagnostics."""
+        return {
+            "last": self.last,
+            "count": self.count,
+            "mean": self.sum / self.count if self.count else None,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "buckets": dict(
+                zip([*map(str, HISTOGRAM_BUCKETS), "+Inf"], self.buckets)
+            ),
+        }
+
+
+class PerfStats:
+    """Timings and counters collected for one coordinator.
+
+    Everything runs on the event loop, so plain dicts need no locking.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the collection."""
+        self.histograms: dict[str, RollingHistogram] = {}
+        self.counters: Counter[str] = Counter()
+        self.gauges: dict[str, float] = {}
+        self.fetches: deque[dict[str, Any]] = deque(maxlen=FETCH_HISTORY_SIZE)
+        self.statuses: Counter[int] = Counter()
+
+    def observe(self, name: str, seconds: float) -> None:
+        """Record a duration."""
+        if (histogram := self.histograms.get(name)) is None:
+            histogram = self.histograms[name] = RollingHistogram()
+        histogram.observe(seconds)
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        """Increase a counter."""
+        self.counters[name] += amount
+
+    def set(self, name: str, value: float) -> None:
+        """Set a gauge to its current value."""
+        self.gauges[name] = value
+
+    def last(self, name: str) -> float | None:
+        """Return the last recorded duration."""
+        histogram = self.histograms.get(name)
+        return histogram.last if histogram else None
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """Time the enclosed block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return all timings and counters."""
+        return {
+            "timings": {
+                name: histogram.as_dict()
+                for name, histogram in self.histograms.items()
+            },
+            "counters": dict(self.counters),
+            "gauges": dict(self.gauges),
+            "statuses": dict(self.statuses),
+        }
+
+
+def trace_config(stats: PerfStats) -> aiohttp.TraceConfig:
+    """Return an aiohttp trace config recording DNS, connect and request time."""
+    trace = aiohttp.TraceConfig()
+
+    async def on_request_start(session, context, params) -> None:
+        context.request_start = time.perf_counter()
+
+    async def on_request_end(session, context, params) -> None:
+        stats.observe("request", time.perf_counter() - context.request_start)
+
+    async def on_dns_resolvehost_start(session, context, params) -> None:
+        context.dns_start = time.perf_counter()
+
+    async def on_dns_resolvehost_end(session, context, params) -> None:
+        stats.observe("dns", time.perf_counter() - context.dns_start)
+
+    async def on_connection_create_start(session, context, params) -> None:
+        context.connect_start = time.perf_counter()
+
+    async def on_connection_create_end(session, context, params) -> None:
+        stats.observe("connect", time.perf_counter() - context.connect_start)
+
+    trace.on_request_start.append(on_request_start)
+    trace.on_request_end.append(on_request_end)
+    trace.on_dns_resolvehost_start.append(on_dns_resolvehost_start)
+    trace.on_dns_resolvehost_end.append(on_dns_resolvehost_end)
+    trace.on_connection_create_start.append(on_connection_create_start)
+    trace.on_connection_create_end.append(on_connection_create_end)
+    return trace
+
+
+def cache_hits(icon_cache: Any | None) -> dict[str, int]:
+    """Return hit counts of the memoized parsers and the icon cache."""
+    hits = {
+        "wind_speed": parse_wind_speed.cache_info().hits,
+        "condition_icon": classify_icon.cache_info().hits,
+        "condition_phrase": classify_phrase.cache_info().hits,
+    }
+    if icon_cache is not None:
+        hits["icon_cache"] = icon_cache.hits
+    return hits
+
+
+def deep_sizeof(obj: Any, seen: set[int] | None = None) -> int:
+    """Estimate the memory held by an object graph of builtin containers."""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(
+            deep_sizeof(key, seen) + deep_sizeof(value, seen)
+            for key, value in obj.items()
+        )
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    elif hasattr(obj, "__dict__"):
+        size += deep_sizeof(vars(obj), seen)
+    return size
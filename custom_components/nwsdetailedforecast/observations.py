@@ -0,0 +1,327 @@
+"""Latest station observations as the source of the current conditions."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Mapping
+import logging
+from typing import Any
+
+import aiohttp
+import async_timeout
+
+from homeassistant.const import UnitOfSpeed, UnitOfTemperature
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.update_coordinator import UpdateFailed
+import homeassistant.util.dt as dt_util
+from homeassistant.util.unit_conversion import TemperatureConverter
+
+from .api import gridpoint_url, observations_url
+from .const import (
+    ATTR_API_CONDITION_KEY,
+    ATTR_API_ISDAYTIME,
+    ATTR_API_NWSICONURL,
+    ATTR_API_SHORTFORECAST,
+    ATTR_API_STARTTIME,
+    ATTR_API_WIND_BEARING,
+    ATTR_API_WIND_DIRECTION,
+    ATTR_API_WIND_SPEED_MAX,
+    ATTR_API_WIND_SPEED_MEAN,
+    ATTR_API_WIND_SPEED_MIN,
+    ATTR_API_WIND_SPEED_UNIT,
+    DOMAIN,
+    OBSERVATION_LATEST_INTERVAL,
+    OBSERVATION_MAX_AGE,
+)
+from .hub import SharedHub
+from .metrics import PerfStats
+from .parsing import COMPASS_BEARINGS, TEXT_POOL, classify_condition, derive_comfort
+
+_LOGGER = logging.getLogger(__name__)
+
+# (base URL, station id)
+StationKey = tuple[str, str]
+# (base URL, forecast office, grid)
+GridpointKey = tuple[str, str, str]
+
+_COMPASS_POINTS = tuple(COMPASS_BEARINGS)
+
+_WIND_SPEED_UNITS = {
+    "wmoUnit:km_h-1": UnitOfSpeed.KILOMETERS_PER_HOUR,
+    "wmoUnit:m_s-1": UnitOfSpeed.METERS_PER_SECOND,
+    "wmoUnit:kt": UnitOfSpeed.KNOTS,
+}
+
+
+async def async_get_json(
+    hass: HomeAssistant,
+    url: str,
+    params: dict[str, str] | None = None,
+    headers: dict[str, str] | None = None,
+    decode: bool = True,
+) -> tuple[int, Any, Mapping[str, str]]:
+    """Return the status, decoded body and headers of an NWS API request.
+
+    Without decode the body is returned as bytes, for callers decoding it
+    off the event loop. The headers are looked up case-insensitively.
+    """
+    session = async_get_clientsession(hass)
+    async with async_timeout.timeout(60), session.get(
+        url, params=params, headers=headers, raise_for_status=True
+    ) as resp:
+        if resp.status == 304:
+            return resp.status, None, resp.headers.copy()
+        if not decode:
+            return resp.status, await resp.read(), resp.headers.copy()
+        return resp.status, await resp.json(content_type=None), resp.headers.copy()
+
+
+def response_validators(headers: Mapping[str, str]) -> dict[str, str]:
+    """Return the headers asking for a response again only if it changed.
+
+    NWS answers them with 304 while the resource is unchanged.
+    """
+    validators = {}
+    if etag := headers.get(aiohttp.hdrs.ETAG):
+        validators[aiohttp.hdrs.IF_NONE_MATCH] = etag
+    if last_modified := headers.get(aiohttp.hdrs.LAST_MODIFIED):
+        validators[aiohttp.hdrs.IF_MODIFIED_SINCE] = last_modified
+    return validators
+
+
+async def async_nearest_station(
+    hass: HomeAssistant, station, grid, base_url: str
+) -> str:
+    """Return the identifier of the observation station nearest a gridpoint."""
+    _, stations, _ = await async_get_json(
+        hass, gridpoint_url(str(station), str(grid), "stations", base_url)
+    )
+    features = stations.get("features") or []
+    if not features:
+        raise UpdateFailed("No observation station near the gridpoint")
+    return features[0]["properties"]["stationIdentifier"]
+
+
+def _value(properties: dict[str, Any], key: str) -> Any:
+    return (properties.get(key) or {}).get("value")
+
+
+def observation_period(properties: dict[str, Any]) -> dict[str, Any]:
+    """Return an observation in the shape of an ingested forecast period.
+
+    Fields the station did not report are left out, so they can fall back
+    to the forecast.
+    """
+    icon = properties.get("icon")
+    is_daytime = "/night/" not in (icon or "")
+    period: dict[str, Any] = {
+        ATTR_API_STARTTIME: properties.get("timestamp"),
+        ATTR_API_ISDAYTIME: is_daytime,
+        ATTR_API_CONDITION_KEY: classify_condition(
+            icon, properties.get("textDescription"), is_daytime
+        ),
+    }
+    if text := properties.get("textDescription"):
+        period[ATTR_API_SHORTFORECAST] = TEXT_POOL.intern(text)
+    if icon:
+        period[ATTR_API_NWSICONURL] = TEXT_POOL.intern(icon)
+
+    if (temperature := _value(properties, "temperature")) is not None:
+        # Forecast periods are in Fahrenheit, keep the current one alike
+        period["temperature"] = round(
+            TemperatureConverter.convert(
+                temperature, UnitOfTemperature.CELSIUS, UnitOfTemperature.FAHRENHEIT
+            ),
+            1,
+        )
+        period["temperatureUnit"] = "F"
+    for key in ("dewpoint", "relativeHumidity"):
+        if _value(properties, key) is not None:
+            period[key] = properties[key]
+
+    wind = properties.get("windSpeed") or {}
+    if (speed := wind.get("value")) is not None:
+        period[ATTR_API_WIND_SPEED_MIN] = speed
+        period[ATTR_API_WIND_SPEED_MAX] = speed
+        period[ATTR_API_WIND_SPEED_MEAN] = speed
+        period[ATTR_API_WIND_SPEED_UNIT] = _WIND_SPEED_UNITS.get(
+            wind.get("unitCode"), UnitOfSpeed.KILOMETERS_PER_HOUR
+        )
+    if (bearing := _value(properties, "windDirection")) is not None:
+        period[ATTR_API_WIND_BEARING] = bearing
+        period[ATTR_API_WIND_DIRECTION] = _COMPASS_POINTS[
+            round(bearing / 22.5) % len(_COMPASS_POINTS)
+        ]
+    if "temperature" in period:
+        derive_comfort([period])
+    return period
+
+
+class ObservationHub(SharedHub[dict[StationKey, dict[str, Any]]]):
+    """Poll the latest observation of every station in use, as one batch.
+
+    Entries that share a station share its request, and requests made in
+    quick succession are debounced into one refresh. Each station keeps its
+    own validators, so an unchanged observation costs a 304.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the hub."""
+        self.perf_stats = PerfStats()
+        self._gridpoints: dict[GridpointKey, int] = {}
+        self._nearest: dict[GridpointKey, str] = {}
+        self._validators: dict[StationKey, dict[str, str]] = {}
+
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN} latest observations",
+            update_interval=OBSERVATION_LATEST_INTERVAL,
+        )
+        self.data = {}
+
+    @callback
+    def async_track(
+        self, station, grid, base_url: str
+    ) -> tuple[CurrentObservation, CALLBACK_TYPE]:
+        """Start polling the station nearest a gridpoint.
+
+        Returns its current observation and a function to stop tracking it.
+        """
+        key = (base_url, str(station), str(grid))
+        self._gridpoints[key] = self._gridpoints.get(key, 0) + 1
+        # The first refresh is debounced, so entries set up together share it
+        self._async_schedule_request()
+
+        @callback
+        def untrack() -> None:
+            self._gridpoints[key] -= 1
+            if not self._gridpoints[key]:
+                del self._gridpoints[key]
+                self._nearest.pop(key, None)
+
+        return CurrentObservation(self, key), untrack
+
+    def nearest_station(self, gridpoint: GridpointKey) -> str | None:
+        """Return the station nearest a gridpoint, once it is known."""
+        return self._nearest.get(gridpoint)
+
+    def station_key(self, gridpoint: GridpointKey) -> StationKey | None:
+        """Return the station tracked for a gridpoint, once it is known."""
+        if (station_id := self._nearest.get(gridpoint)) is None:
+            return None
+        return gridpoint[0], station_id
+
+    async def _async_resolve(self, gridpoint: GridpointKey) -> None:
+        base_url, station, grid = gridpoint
+        try:
+            self._nearest[gridpoint] = await async_nearest_station(
+                self.hass, station, grid, base_url
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError, UpdateFailed) as err:
+            _LOGGER.warning(
+                "Could not find the observation station of %s %s: %s",
+                station,
+                grid,
+                err,
+            )
+
+    async def _async_fetch(
+        self, key: StationKey
+    ) -> tuple[StationKey, dict[str, Any] | None]:
+        """Return the latest observation of a station, None when unchanged."""
+        base_url, station_id = key
+        stats = self.perf_stats
+        stats.increment("requests")
+        try:
+            with stats.timer("request"):
+                status, payload, headers = await async_get_json(
+                    self.hass,
+                    f"{observations_url(station_id, base_url)}/latest",
+                    headers=self._validators.get(key),
+                )
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            stats.increment("errors")
+            stats.statuses[getattr(err, "status", 0)] += 1
+            _LOGGER.debug("Latest observation of %s failed: %s", station_id, err)
+            return key, None
+
+        stats.statuses[status] += 1
+        if status == 304:
+            stats.increment("not_modified")
+            return key, None
+        self._validators[key] = response_validators(headers)
+        return key, observation_period(payload.get("properties") or {})
+
+    async def _async_update_data(self) -> dict[StationKey, dict[str, Any]]:
+        """Fetch the latest observation of each station in use once."""
+        if unresolved := [key for key in self._gridpoints if key not in self._nearest]:
+            await asyncio.gather(*(self._async_resolve(key) for key in unresolved))
+
+        stations = {
+            key for gridpoint in self._gridpoints if (key := self.station_key(gridpoint))
+        }
+        results = await asyncio.gather(*(self._async_fetch(key) for key in stations))
+
+        data = {key: period for key, period in self.data.items() if key in stations}
+        changed = False
+        for key, period in results:
+            if period is not None and period != data.get(key):
+                data[key] = period
+                changed = True
+        self.perf_stats.set("stations", len(stations))
+        if stations and not changed and not any(key in data for key in stations):
+            raise UpdateFailed("No station observation available")
+        # Keep the same object when nothing changed so entities skip writes
+        if not changed and data.keys() == self.data.keys():
+            return self.data
+        return data
+
+
+class CurrentObservation:
+    """The latest observation near one gridpoint."""
+
+    def __init__(self, hub: ObservationHub, gridpoint: GridpointKey) -> None:
+        """Initialize the current observation."""
+        self.hub = hub
+        self._gridpoint = gridpoint
+        self._merged: tuple[dict[str, Any], dict[str, Any], dict[str, Any]] | None = None
+
+    @property
+    def station_id(self) -> str | None:
+        """Return the observation station, once it is known."""
+        return self.hub.nearest_station(self._gridpoint)
+
+    def period(self) -> dict[str, Any] | None:
+        """Return the latest observation, or None if there is no recent one."""
+        if (key := self.hub.station_key(self._gridpoint)) is None:
+            return None
+        if (period := self.hub.data.get(key)) is None:
+            return None
+        observed = dt_util.parse_datetime(period.get(ATTR_API_STARTTIME) or "")
+        if observed is None or dt_util.utcnow() - observed > OBSERVATION_MAX_AGE:
+            return None
+        return period
+
+    def current(self, forecast_period: dict[str, Any]) -> dict[str, Any]:
+        """Return the forecast period overlaid with the observed fields."""
+        observation = self.period()
+        if observation is None:
+            return forecast_period
+        merged = self._merged
+        if (
+            merged is None
+            or merged[0] is not forecast_period
+            or merged[1] is not observation
+        ):
+            merged = self._merged = (
+                forecast_period,
+                observation,
+                {**forecast_period, **observation},
+            )
+        return merged[2]
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Call update_callback whenever the hub has refreshed."""
+        return self.hub.async_add_listener(update_callback)
@@ -0,0 +1,430 @@
+"""Ingest-time parsing of NWS forecast period fields."""
+from __future__ import annotations
+
+from collections import OrderedDict
+from functools import lru_cache
+import math
+import re
+import sys
+import threading
+from typing import Any, NamedTuple
+
+from homeassistant.const import UnitOfSpeed
+
+from .const import (
+    ATTR_API_CONDITION_KEY,
+    ATTR_API_DETAILEDFORECAST,
+    ATTR_API_DEW_POINT,
+    ATTR_API_DEWPOINT_DEPRESSION,
+    ATTR_API_FEELS_LIKE_TEMPERATURE,
+    ATTR_API_HEAT_INDEX,
+    ATTR_API_HUMIDITY,
+    ATTR_API_ISDAYTIME,
+    ATTR_API_NWSICONURL,
+    ATTR_API_SHORTFORECAST,
+    ATTR_API_TEMPERATURE,
+    ATTR_API_WIND_BEARING,
+    ATTR_API_WIND_CHILL,
+    ATTR_API_WIND_DIRECTION,
+    ATTR_API_WIND_SPEED,
+    ATTR_API_WIND_SPEED_MAX,
+    ATTR_API_WIND_SPEED_MEAN,
+    ATTR_API_WIND_SPEED_MIN,
+    ATTR_API_WIND_SPEED_UNIT,
+    TEXT_POOL_SIZE,
+)
+
+# "5 mph", "5 to 10 mph", "10 to 20 km/h"
+_WIND_SPEED_RE = re.compile(
+    r"^\s*(\d+(?:\.\d+)?)(?:\s*to\s*(\d+(?:\.\d+)?))?\s*([a-z/]+)?", re.IGNORECASE
+)
+
+WIND_SPEED_UNITS = {
+    "mph": UnitOfSpeed.MILES_PER_HOUR,
+    "km/h": UnitOfSpeed.KILOMETERS_PER_HOUR,
+    "kmh": UnitOfSpeed.KILOMETERS_PER_HOUR,
+    "kt": UnitOfSpeed.KNOTS,
+    "kts": UnitOfSpeed.KNOTS,
+    "knots": UnitOfSpeed.KNOTS,
+    "m/s": UnitOfSpeed.METERS_PER_SECOND,
+}
+
+COMPASS_BEARINGS = {
+    point: index * 22.5
+    for index, point in enumerate(
+        (
+            "N", "NNE", "NE", "ENE", "E", "ESE", "SE", "SSE",
+            "S", "SSW", "SW", "WSW", "W", "WNW", "NW", "NNW",
+        )
+    )
+}
+
+# Miles per hour in one unit of each parsed wind speed unit
+MPH_PER_UNIT = {
+    UnitOfSpeed.MILES_PER_HOUR: 1.0,
+    UnitOfSpeed.KILOMETERS_PER_HOUR: 0.621371,
+    UnitOfSpeed.KNOTS: 1.150779,
+    UnitOfSpeed.METERS_PER_SECOND: 2.236936,
+}
+
+# Fields whose few distinct values repeat across periods and locations
+_INTERNED_FIELDS = ("temperatureUnit", ATTR_API_WIND_SPEED, ATTR_API_WIND_DIRECTION)
+# Text that repeats across periods, polls and neighbouring gridpoints
+_POOLED_FIELDS = (
+    "name",
+    ATTR_API_SHORTFORECAST,
+    ATTR_API_DETAILEDFORECAST,
+    ATTR_API_NWSICONURL,
+)
+_QUANTITY_FIELDS = ("probabilityOfPrecipitation", ATTR_API_DEW_POINT, ATTR_API_HUMIDITY)
+
+
+
+class TextPool:
+    """Bounded pool of forecast text, least recently used dropped first.
+
+    Unlike sys.intern the pool cannot grow without bound as forecasts are
+    reissued. Text that did not change since the last poll comes back as
+    the very object stored then, so comparing it is an identity check.
+    Forecasts are ingested on executor threads, so the pool is locked.
+    """
+
+    def __init__(self, max_entries: int = TEXT_POOL_SIZE) -> None:
+        """Initialize the pool."""
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._bytes = 0
+        self._strings: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        """Return the number of pooled strings."""
+        return len(self._strings)
+
+    def memory_bytes(self) -> int:
+        """Return the memory held by the pooled strings."""
+        return self._bytes
+
+    def intern(self, text: str) -> str:
+        """Return the pooled copy of text, pooling it when new."""
+        strings = self._strings
+        with self._lock:
+            if (pooled := strings.get(text)) is not None:
+                strings.move_to_end(text)
+                self.hits += 1
+                return pooled
+            self.misses += 1
+            strings[text] = text
+            self._bytes += sys.getsizeof(text)
+            if len(strings) > self.max_entries:
+                self._bytes -= sys.getsizeof(strings.popitem(last=False)[0])
+        return text
+
+
+TEXT_POOL = TextPool()
+
+# NWS temperatureUnit values and quantity unit codes in Celsius
+_CELSIUS_UNITS = {"C", "wmoUnit:degC"}
+
+# NWS icon tokens, e.g. /icons/land/night/rain_showers,20/tsra_sct,40
+_ICON_PATH_RE = re.compile(r"/icons/[a-z]+/(day|night)/([^?]+)")
+
+# NWS icon token to condition key; None means "depends on day/night"
+ICON_CONDITIONS: dict[str, str | None] = {
+    "skc": None,
+    "few": None,
+    "hot": None,
+    "cold": None,
+    "sct": "partly-cloudy",
+    "bkn": "partly-cloudy",
+    "ovc": "cloudy",
+    "wind_skc": "wind",
+    "wind_few": "wind",
+    "wind_sct": "wind",
+    "wind_bkn": "wind",
+    "wind_ovc": "wind",
+    "snow": "snow",
+    "blizzard": "snow",
+    "rain_snow": "sleet",
+    "rain_sleet": "sleet",
+    "snow_sleet": "sleet",
+    "fzra": "sleet",
+    "rain_fzra": "sleet",
+    "snow_fzra": "sleet",
+    "sleet": "sleet",
+    "rain": "rain",
+    "rain_showers": "rain",
+    "rain_showers_hi": "rain",
+    "tsra": "thunderstorm",
+    "tsra_sct": "thunderstorm",
+    "tsra_hi": "thunderstorm",
+    "tornado": "tornado",
+    "hurricane": "tornado",
+    "tropical_storm": "tornado",
+    "dust": "fog",
+    "smoke": "fog",
+    "haze": "fog",
+    "fog": "fog",
+}
+
+# shortForecast phrases, most severe first
+_PHRASE_CONDITIONS: tuple[tuple[re.Pattern[str], str | None], ...] = tuple(
+    (re.compile(pattern, re.IGNORECASE), condition)
+    for pattern, condition in (
+        (r"tornado|hurricane|tropical storm", "tornado"),
+        (r"thunder|t-storm", "thunderstorm"),
+        (r"hail", "hail"),
+        (r"freezing|sleet|wintry mix|rain and snow|snow and rain", "sleet"),
+        (r"snow|flurr|blizzard", "snow"),
+        (r"rain|shower|drizzle", "rain"),
+        (r"fog|haze|smoke|dust", "fog"),
+        (r"wind|breezy|blustery", "wind"),
+        (r"partly|mostly sunny|mostly clear", "partly-cloudy"),
+        (r"cloudy|overcast", "cloudy"),
+        (r"sunny|clear|fair", None),
+    )
+)
+
+# Conditions that have separate day and night keys
+_DAY_NIGHT_CONDITIONS = {None: "clear", "partly-cloudy": "partly-cloudy"}
+
+
+def _day_night(condition: str | None, is_daytime: bool) -> str | None:
+    """Return the day or night variant of a condition key."""
+    if condition not in _DAY_NIGHT_CONDITIONS:
+        return condition
+    suffix = "day" if is_daytime else "night"
+    return f"{_DAY_NIGHT_CONDITIONS[condition]}-{suffix}"
+
+
+@lru_cache(maxsize=512)
+def classify_icon(icon_url: str | None) -> str | None:
+    """Return the condition key for an NWS icon URL.
+
+    When an icon holds two conditions, the one with the higher
+    probability wins.
+    """
+    if not icon_url:
+        return None
+
+    match = _ICON_PATH_RE.search(icon_url)
+    if match is None:
+        return None
+
+    time_of_day, tokens = match.groups()
+    best_token = None
+    best_probability = -1
+    for part in tokens.split("/"):
+        token, _, probability = part.partition(",")
+        if token not in ICON_CONDITIONS:
+            continue
+        probability = int(probability) if probability.isdigit() else 0
+        if probability > best_probability:
+            best_token = token
+            best_probability = probability
+
+    if best_token is None:
+        return None
+    return _day_night(ICON_CONDITIONS[best_token], time_of_day == "day")
+
+
+@lru_cache(maxsize=512)
+def classify_phrase(short_forecast: str | None, is_daytime: bool) -> str | None:
+    """Return the condition key for an NWS shortForecast phrase."""
+    if not short_forecast:
+        return None
+
+    for pattern, condition in _PHRASE_CONDITIONS:
+        if pattern.search(short_forecast):
+            return _day_night(condition, is_daytime)
+    return None
+
+
+def classify_condition(
+    icon_url: str | None, short_forecast: str | None, is_daytime: bool = True
+) -> str | None:
+    """Return the condition key from the icon, falling back to the text."""
+    return classify_icon(icon_url) or classify_phrase(short_forecast, is_daytime)
+
+
+class WindSpeed(NamedTuple):
+    """Numeric wind speed range in its native unit."""
+
+    minimum: float | None
+    maximum: float | None
+    mean: float | None
+    unit: str | None
+
+
+EMPTY_WIND_SPEED = WindSpeed(None, None, None, None)
+
+
+@lru_cache(maxsize=256)
+def parse_wind_speed(text: str | None) -> WindSpeed:
+    """Parse an NWS wind speed string such as '5 to 10 mph'."""
+    if not text:
+        return EMPTY_WIND_SPEED
+
+    match = _WIND_SPEED_RE.match(text)
+    if match is None:
+        return EMPTY_WIND_SPEED
+
+    low, high, unit = match.groups()
+    minimum = float(low)
+    maximum = float(high) if high is not None else minimum
+    return WindSpeed(
+        minimum,
+        maximum,
+        (minimum + maximum) / 2,
+        WIND_SPEED_UNITS.get(unit.lower() if unit else "mph"),
+    )
+
+
+def wind_bearing(direction: str | None) -> float | None:
+    """Return the bearing in degrees for a compass direction."""
+    if not direction:
+        return None
+    return COMPASS_BEARINGS.get(direction.strip().upper())
+
+
+def ingest_periods(periods: list[dict[str, Any]]) -> None:
+    """Add parsed numeric and derived comfort fields to every period.
+
+    Repeated strings are interned, so every location and issuance shares
+    one copy of each.
+    """
+    pool = TEXT_POOL.intern
+    for period in periods:
+        for field in _POOLED_FIELDS:
+            if isinstance(value := period.get(field), str):
+                period[field] = pool(value)
+        for field in _INTERNED_FIELDS:
+            if isinstance(value := period.get(field), str):
+                period[field] = sys.intern(value)
+        for field in _QUANTITY_FIELDS:
+            if (quantity := period.get(field)) and isinstance(
+                unit := quantity.get("unitCode"), str
+            ):
+                quantity["unitCode"] = sys.intern(unit)
+        speed = parse_wind_speed(period.get(ATTR_API_WIND_SPEED))
+        period[ATTR_API_WIND_SPEED_MIN] = speed.minimum
+        period[ATTR_API_WIND_SPEED_MAX] = speed.maximum
+        period[ATTR_API_WIND_SPEED_MEAN] = speed.mean
+        period[ATTR_API_WIND_SPEED_UNIT] = speed.unit
+        period[ATTR_API_WIND_BEARING] = wind_bearing(
+            period.get(ATTR_API_WIND_DIRECTION)
+        )
+        period[ATTR_API_CONDITION_KEY] = classify_condition(
+            period.get(ATTR_API_NWSICONURL),
+            period.get(ATTR_API_SHORTFORECAST),
+            period.get(ATTR_API_ISDAYTIME, True),
+        )
+    derive_comfort(periods)
+
+
+def heat_index(temperature: float | None, humidity: float | None) -> float | None:
+    """Return the NWS heat index in °F, or None below 80 °F."""
+    if temperature is None or humidity is None or temperature < 80:
+        return None
+    simple = 0.5 * (temperature + 61.0 + (temperature - 68.0) * 1.2 + humidity * 0.094)
+    if (simple + temperature) / 2 < 80:
+        return simple
+
+    # Rothfusz regression with the NWS low and high humidity adjustments
+    t, rh = temperature, humidity
+    value = (
+        -42.379
+        + 2.04901523 * t
+        + 10.14333127 * rh
+        - 0.22475541 * t * rh
+        - 0.00683783 * t * t
+        - 0.05481717 * rh * rh
+        + 0.00122874 * t * t * rh
+        + 0.00085282 * t * rh * rh
+        - 0.00000199 * t * t * rh * rh
+    )
+    if rh < 13 and t <= 112:
+        value -= (13 - rh) / 4 * math.sqrt((17 - abs(t - 95)) / 17)
+    elif rh > 85 and t <= 87:
+        value += (rh - 85) / 10 * (87 - t) / 5
+    return value
+
+
+def wind_chill(temperature: float | None, wind_speed: float | None) -> float | None:
+    """Return the NWS wind chill in °F, or None above 50 °F or below 3 mph."""
+    if temperature is None or wind_speed is None:
+        return None
+    if temperature > 50 or wind_speed < 3:
+        return None
+    power = wind_speed**0.16
+    return 35.74 + 0.6215 * temperature - 35.75 * power + 0.4275 * temperature * power
+
+
+def _fahrenheit(value: float | None, unit: str | None) -> float | None:
+    if value is None:
+        return None
+    return value * 1.8 + 32 if unit in _CELSIUS_UNITS else float(value)
+
+
+def _in_unit(fahrenheit: float | None, celsius: bool) -> float | None:
+    """Return a derived °F value rounded in the period's temperature unit."""
+    if fahrenheit is None:
+        return None
+    return round((fahrenheit - 32) / 1.8 if celsius else fahrenheit, 1)
+
+
+def _quantity(field: dict[str, Any] | None) -> Any:
+    return field.get("value") if field else None
+
+
+def derive_comfort(periods: list[dict[str, Any]]) -> None:
+    """Add heat index, wind chill, apparent temperature and dew point depression.
+
+    The inputs are gathered into columns and each formula runs over them
+    once, so entities read finished values. The results are in the
+    period's temperature unit, None where a quantity does not apply.
+    """
+    units = [period.get("temperatureUnit") for period in periods]
+    temperatures = [
+        _fahrenheit(period.get(ATTR_API_TEMPERATURE), unit)
+        for period, unit in zip(periods, units)
+    ]
+    dewpoints = [
+        _fahrenheit(_quantity(field), field.get("unitCode"))
+        if (field := period.get(ATTR_API_DEW_POINT))
+        else None
+        for period in periods
+    ]
+    humidities = [_quantity(period.get(ATTR_API_HUMIDITY)) for period in periods]
+    wind_speeds = [
+        None
+        if (speed := period.get(ATTR_API_WIND_SPEED_MEAN)) is None
+        else speed * MPH_PER_UNIT.get(period.get(ATTR_API_WIND_SPEED_UNIT), 1.0)
+        for period in periods
+    ]
+
+    heat_indices = list(map(heat_index, temperatures, humidities))
+    wind_chills = list(map(wind_chill, temperatures, wind_speeds))
+    apparent = [
+        chill if chill is not None else heat if heat is not None else temperature
+        for temperature, heat, chill in zip(temperatures, heat_indices, wind_chills)
+    ]
+    depressions = [
+        None if temperature is None or dewpoint is None else temperature - dewpoint
+        for temperature, dewpoint in zip(temperatures, dewpoints)
+    ]
+
+    for period, unit, heat, chill, feels_like, depression in zip(
+        periods, units, heat_indices, wind_chills, apparent, depressions
+    ):
+        celsius = unit in _CELSIUS_UNITS
+        period[ATTR_API_HEAT_INDEX] = _in_unit(heat, celsius)
+        period[ATTR_API_WIND_CHILL] = _in_unit(chill, celsius)
+        period[ATTR_API_FEELS_LIKE_TEMPERATURE] = _in_unit(feels_like, celsius)
+        period[ATTR_API_DEWPOINT_DEPRESSION] = (
+            None
+            if depression is None
+            else round(depression / 1.8 if celsius else depression, 1)
+        )
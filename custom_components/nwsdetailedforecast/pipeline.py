@@ -0,0 +1,125 @@
+"""Update transforms batched into one executor job, off the event loop."""
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable, Mapping
+import logging
+import time
+from types import MappingProxyType
+from typing import Any, TypeVar
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .metrics import PerfStats
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+# Stage name and the function taking the result of the stage before
+Stage = tuple[str, Callable[[Any], Any]]
+
+
+class TransformPipeline:
+    """The CPU-heavy stages of an update, run in the executor as one job.
+
+    Each stage takes the result of the one before, from the response body
+    to the model entities read. Products are built from that model in the
+    same job by whoever registered them, such as the card payload, so the
+    event loop only publishes finished values. Stages and products run on
+    a worker thread and must not touch Home Assistant state.
+    """
+
+    def __init__(self, stages: list[Stage]) -> None:
+        """Initialize the pipeline."""
+        self.stages = stages
+        self._products: dict[str, Callable[[Any], Any]] = {}
+
+    @callback
+    def async_add_product(
+        self, name: str, build: Callable[[Any], Any]
+    ) -> CALLBACK_TYPE:
+        """Build a product from every result, returning a function to stop."""
+        self._products[name] = build
+
+        @callback
+        def remove_product() -> None:
+            if self._products.get(name) is build:
+                del self._products[name]
+
+        return remove_product
+
+    def run(
+        self,
+        value: Any,
+        stages: list[Stage],
+        products: dict[str, Callable[[Any], Any]],
+    ) -> tuple[Any, dict[str, Any], dict[str, float]]:
+        """Return the result, its products and the time each step took.
+
+        A product that fails is left out, its consumer builds it itself.
+        """
+        timings = {}
+        for name, stage in stages:
+            start = time.perf_counter()
+            value = stage(value)
+            timings[name] = time.perf_counter() - start
+        built = {}
+        for name, build in products.items():
+            start = time.perf_counter()
+            try:
+                built[name] = build(value)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error building the %s of an update", name)
+                continue
+            timings[name] = time.perf_counter() - start
+        return value, built, timings
+
+    async def async_run(
+        self,
+        hass: HomeAssistant,
+        stats: PerfStats,
+        value: Any,
+        stages: list[Stage] | None = None,
+    ) -> tuple[Any, Mapping[str, Any]]:
+        """Run the stages, or the given ones, and the products in the executor.
+
+        The time of each step is recorded, along with the time the job took
+        including its wait for a worker.
+        """
+        start = time.perf_counter()
+        value, products, timings = await hass.async_add_executor_job(
+            self.run,
+            value,
+            self.stages if stages is None else stages,
+            # Copied on the loop, products may be added while the job runs
+            dict(self._products),
+        )
+        stats.observe("executor", time.perf_counter() - start)
+        for name, seconds in timings.items():
+            stats.observe(name, seconds)
+        return value, MappingProxyType(products)
+
+
+class LoopClock:
+    """Time an update spends on the event loop, excluding what it awaits.
+
+    The loop is blocked by an update for its wall time less the time it
+    was suspended waiting for the network or the executor.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the clock."""
+        self._start = time.perf_counter()
+        self._waited = 0.0
+
+    async def wait(self, awaitable: Awaitable[_T]) -> _T:
+        """Await something, not counting the time as blocking the loop."""
+        start = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            self._waited += time.perf_counter() - start
+
+    def blocked(self) -> float:
+        """Return the time spent on the loop so far."""
+        return time.perf_counter() - self._start - self._waited
@@ -0,0 +1,283 @@
+"""Precipitation and snowfall totals from the gridpoint forecast layers."""
+from __future__ import annotations
+
+from array import array
+import asyncio
+from datetime import datetime
+from itertools import accumulate
+import json
+import logging
+import re
+from typing import Any
+
+import aiohttp
+import voluptuous as vol
+
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+import homeassistant.util.dt as dt_util
+
+from .api import gridpoint_url
+from .const import (
+    DEFAULT_BASE_URL,
+    DOMAIN,
+    ENTRY_PRECIPITATION,
+    PRECIPITATION_SCAN_INTERVAL,
+    PRECIPITATION_WINDOWS,
+)
+from .metrics import PerfStats
+from .observations import async_get_json, response_validators
+from .pipeline import TransformPipeline
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_GET_PRECIPITATION = "get_precipitation"
+
+# Total name to gridpoint layer
+LAYERS = {
+    "precipitation": "quantitativePrecipitation",
+    "snowfall": "snowfallAmount",
+}
+
+# Millimetres in one unit of each layer unit
+_MILLIMETERS_PER_UNIT = {
+    "wmoUnit:mm": 1.0,
+    "wmoUnit:cm": 10.0,
+    "wmoUnit:m": 1000.0,
+    "wmoUnit:in": 25.4,
+}
+
+# ISO 8601 durations as NWS writes them, e.g. PT6H or P1DT12H
+_DURATION_RE = re.compile(r"^P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?)?$")
+
+HOUR = 3600
+
+
+def parse_valid_time(valid_time: str) -> tuple[int, int] | None:
+    """Return the start and end epoch of a validTime such as ...+00:00/PT6H."""
+    start_text, _, duration = valid_time.partition("/")
+    start = dt_util.parse_datetime(start_text)
+    match = _DURATION_RE.match(duration)
+    if start is None or match is None:
+        return None
+    days, hours, minutes = (int(part or 0) for part in match.groups())
+    begin = int(start.timestamp())
+    return begin, begin + days * 86400 + hours * HOUR + minutes * 60
+
+
+class PrecipitationTotals:
+    """Running sums of the gridpoint amounts, one entry per hour.
+
+    The amount of a layer interval is spread evenly over its hours, so a
+    total over any window is the difference of two sums.
+    """
+
+    def __init__(self, start: int, sums: dict[str, array]) -> None:
+        """Initialize the totals from the hour they start and their sums."""
+        self.start = start
+        self.sums = sums
+        self.hours = max((len(values) - 1 for values in sums.values()), default=0)
+
+    @property
+    def end(self) -> int:
+        """Return the epoch the forecast amounts run until."""
+        return self.start + self.hours * HOUR
+
+    @classmethod
+    def from_gridpoint(cls, properties: dict[str, Any]) -> PrecipitationTotals:
+        """Build the totals from the properties of a gridpoint payload."""
+        intervals: dict[str, list[tuple[int, int, float]]] = {}
+        for name, layer in LAYERS.items():
+            field = properties.get(layer) or {}
+            factor = _MILLIMETERS_PER_UNIT.get(field.get("uom"), 1.0)
+            intervals[name] = [
+                (*span, value * factor)
+                for item in field.get("values") or ()
+                if (value := item.get("value")) is not None
+                and (span := parse_valid_time(item.get("validTime") or "")) is not None
+            ]
+
+        spans = [span for rows in intervals.values() for span in rows]
+        if not spans:
+            return cls(0, {name: array("d", [0.0]) for name in LAYERS})
+        start = min(span[0] for span in spans) // HOUR * HOUR
+        hours = -(-(max(span[1] for span in spans) - start) // HOUR)
+
+        sums = {}
+        for name, rows in intervals.items():
+            hourly = array("d", bytes(8 * hours))
+            for begin, end, amount in rows:
+                first = (begin - start) // HOUR
+                last = max(-(-(end - start) // HOUR), first + 1)
+                share = amount / (last - first)
+                for hour in range(first, last):
+                    hourly[hour] += share
+            sums[name] = array("d", accumulate(hourly, initial=0.0))
+        return cls(start, sums)
+
+    def _sum_at(self, name: str, when: float) -> float:
+        """Return the amount forecast from the start until when."""
+        sums = self.sums[name]
+        offset = min(max((when - self.start) / HOUR, 0.0), self.hours)
+        hour = int(offset)
+        if hour == self.hours:
+            return sums[hour]
+        return sums[hour] + (offset - hour) * (sums[hour + 1] - sums[hour])
+
+    def total(self, name: str, start: float, end: float) -> float | None:
+        """Return the amount in millimetres forecast between two epochs.
+
+        Hours outside the forecast count as nothing; None when the window
+        does not overlap the forecast at all.
+        """
+        if end <= start or end <= self.start or start >= self.end:
+            return None
+        return self._sum_at(name, end) - self._sum_at(name, start)
+
+    def window(self, hours: float, now: datetime | None = None) -> dict[str, Any]:
+        """Return every total over the next hours."""
+        start = (now or dt_util.utcnow()).timestamp()
+        end = start + hours * HOUR
+        totals: dict[str, Any] = {
+            name: None if (value := self.total(name, start, end)) is None
+            else round(value, 2)
+            for name in LAYERS
+        }
+        totals["start"] = dt_util.utc_from_timestamp(start).isoformat()
+        totals["end"] = dt_util.utc_from_timestamp(end).isoformat()
+        totals["complete"] = end <= self.end
+        return totals
+
+
+def _totals(payload: dict[str, Any]) -> PrecipitationTotals:
+    return PrecipitationTotals.from_gridpoint(payload.get("properties") or {})
+
+
+class PrecipitationCoordinator(DataUpdateCoordinator[PrecipitationTotals]):
+    """Fetch the gridpoint layers and keep their running sums.
+
+    The gridpoint payload is the largest NWS sends, it is decoded and summed
+    in the executor.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, station, grid, base_url: str = DEFAULT_BASE_URL
+    ) -> None:
+        """Initialize the coordinator."""
+        self.station = station
+        self.grid = grid
+        self.base_url = base_url
+        self.perf_stats = PerfStats()
+        self._validators: dict[str, str] = {}
+        self.pipeline = TransformPipeline(
+            [("json_parse", json.loads), ("totals", _totals)]
+        )
+
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN} precipitation",
+            update_interval=PRECIPITATION_SCAN_INTERVAL,
+        )
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Poll whether or not a sensor listens, returning a function to stop.
+
+        The coordinator only schedules its next refresh while it has
+        listeners, and the service reads the totals without listening.
+        """
+        return self.async_add_listener(lambda: None)
+
+    async def _async_update_data(self) -> PrecipitationTotals:
+        """Return the totals of the latest gridpoint forecast."""
+        stats = self.perf_stats
+        stats.increment("requests")
+        try:
+            with stats.timer("request"):
+                status, payload, headers = await async_get_json(
+                    self.hass,
+                    gridpoint_url(str(self.station), str(self.grid), "", self.base_url),
+                    headers=self._validators if self.data is not None else None,
+                    decode=False,
+                )
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            stats.increment("errors")
+            stats.statuses[getattr(err, "status", 0)] += 1
+            raise UpdateFailed(f"Error fetching gridpoint layers: {err}") from err
+
+        stats.statuses[status] += 1
+        if status == 304:
+            stats.increment("not_modified")
+            return self.data
+
+        self._validators = response_validators(headers)
+
+        with stats.timer("parse"):
+            totals, _ = await self.pipeline.async_run(self.hass, stats, payload)
+        return totals
+
+
+@callback
+def async_get_precipitation(
+    hass: HomeAssistant, entry_id: str
+) -> PrecipitationCoordinator | None:
+    """Return the precipitation coordinator of a config entry."""
+    entry_data = hass.data.get(DOMAIN, {}).get(entry_id)
+    if not isinstance(entry_data, dict):
+        return None
+    return entry_data.get(ENTRY_PRECIPITATION)
+
+
+GET_PRECIPITATION_SCHEMA = vol.Schema(
+    {
+        vol.Required("config_entry_id"): cv.string,
+        vol.Optional("hours", default=list(PRECIPITATION_WINDOWS)): vol.All(
+            cv.ensure_list, [vol.All(vol.Coerce(float), vol.Range(min=0, max=240))]
+        ),
+        vol.Optional("start"): cv.datetime,
+    }
+)
+
+
+@callback
+def async_setup_precipitation(hass: HomeAssistant) -> None:
+    """Register the precipitation service."""
+
+    async def async_get_precipitation_totals(call: ServiceCall) -> ServiceResponse:
+        """Return the forecast precipitation and snowfall over rolling windows."""
+        coordinator = async_get_precipitation(hass, call.data["config_entry_id"])
+        if coordinator is None:
+            raise HomeAssistantError(
+                "Precipitation totals are not enabled for this config entry"
+            )
+        if (totals := coordinator.data) is None:
+            raise HomeAssistantError("No gridpoint forecast has been received yet")
+
+        start = call.data.get("start")
+        start = dt_util.as_utc(start) if start is not None else None
+        return {
+            "unit": "mm",
+            "forecast_end": dt_util.utc_from_timestamp(totals.end).isoformat(),
+            "windows": {
+                f"{hours:g}h": totals.window(hours, start)
+                for hours in call.data["hours"]
+            },
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_PRECIPITATION,
+        async_get_precipitation_totals,
+        schema=GET_PRECIPITATION_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
@@ -0,0 +1,194 @@
+"""Prometheus text exposition of the integration's performance figures."""
+from __future__ import annotations
+
+from aiohttp import web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import CALLBACK_TYPE, callback
+
+from .const import CIRCUIT_BREAKER_THRESHOLD
+from .metrics import HISTOGRAM_BUCKETS
+
+METRICS_VIEW_URL = "/api/nwsdetailedforecast/metrics"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+PREFIX = "nwsdetailedforecast"
+
+# Exposed histogram name, PerfStats timing, help text
+HISTOGRAMS = (
+    ("fetch_latency_seconds", "request", "Time until NWS response headers arrive."),
+    ("parse_seconds", "parse", "Time spent decoding and ingesting a forecast."),
+    ("update_duration_seconds", "update", "Duration of a coordinator update."),
+    (
+        "loop_blocked_seconds",
+        "loop_blocked",
+        "Time an update held the event loop, publishing included.",
+    ),
+    ("state_write_seconds", "state_write", "Duration of an entity state write."),
+)
+
+# Exposed name, type, help text, value from (PerfStats, coordinator)
+SCALARS = (
+    (
+        "entities_updated",
+        "gauge",
+        "Entities that wrote state on the last coordinator tick.",
+        lambda stats, coordinator: stats.gauges.get("entities_updated", 0),
+    ),
+    (
+        "state_writes_skipped_total",
+        "counter",
+        "Entity state writes skipped because nothing changed.",
+        lambda stats, coordinator: stats.counters["state_writes_skipped"],
+    ),
+    (
+        "rate_limit_wait_seconds",
+        "gauge",
+        "Last Retry-After wait requested by NWS.",
+        lambda stats, coordinator: stats.gauges.get("rate_limit_wait", 0),
+    ),
+    (
+        "rate_limited_total",
+        "counter",
+        "Error responses that carried a Retry-After header.",
+        lambda stats, coordinator: stats.counters["rate_limited"],
+    ),
+    (
+        "consecutive_failures",
+        "gauge",
+        "Failed coordinator updates in a row.",
+        lambda stats, coordinator: coordinator.consecutive_failures,
+    ),
+    (
+        "circuit_breaker_open",
+        "gauge",
+        "1 while consecutive failures are at or above the breaker threshold.",
+        lambda stats, coordinator: int(
+            coordinator.consecutive_failures >= CIRCUIT_BREAKER_THRESHOLD
+        ),
+    ),
+    (
+        "zone_fallbacks_total",
+        "counter",
+        "Updates served by the public zone forecast after the gridpoint failed.",
+        lambda stats, coordinator: stats.counters["fallback_zone"],
+    ),
+    (
+        "cached_fallbacks_total",
+        "counter",
+        "Updates that kept the last good forecast after every source failed.",
+        lambda stats, coordinator: stats.counters["fallback_cached"],
+    ),
+    (
+        "memory_bytes",
+        "gauge",
+        "Memory held by the forecast data of the location.",
+        lambda stats, coordinator: stats.gauges.get("memory_bytes", 0),
+    ),
+)
+
+
+def _labels(labels: dict[str, str]) -> str:
+    """Format a label set."""
+    escaped = (
+        key + '="'
+        + str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        + '"'
+        for key, value in labels.items()
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+class MetricsRegistry:
+    """Coordinators whose PerfStats are rendered when scraped.
+
+    Nothing is copied on the hot path; the figures are read from each
+    coordinator's PerfStats at scrape time on the event loop, so no
+    locking is needed.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the registry."""
+        self._sources: dict[int, tuple[dict[str, str], object]] = {}
+
+    @callback
+    def async_register(self, labels: dict[str, str], coordinator) -> CALLBACK_TYPE:
+        """Add a coordinator with its labels, returning a function to remove it."""
+        key = id(coordinator)
+        self._sources[key] = (labels, coordinator)
+
+        @callback
+        def remove() -> None:
+            self._sources.pop(key, None)
+
+        return remove
+
+    @property
+    def empty(self) -> bool:
+        """Return if no coordinator exposes metrics."""
+        return not self._sources
+
+    def render(self) -> str:
+        """Return all metrics in Prometheus text format."""
+        lines: list[str] = []
+
+        def header(name: str, kind: str, help_text: str) -> str:
+            lines.append(f"# HELP {PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {PREFIX}_{name} {kind}")
+            return f"{PREFIX}_{name}"
+
+        sources = list(self._sources.values())
+
+        metric = header("requests_total", "counter", "NWS responses by HTTP status.")
+        for labels, coordinator in sources:
+            for status, count in sorted(coordinator.perf_stats.statuses.items()):
+                lines.append(
+                    f"{metric}{_labels({**labels, 'status': str(status)})} {count}"
+                )
+
+        for name, timing, help_text in HISTOGRAMS:
+            metric = header(name, "histogram", help_text)
+            for labels, coordinator in sources:
+                histogram = coordinator.perf_stats.histograms.get(timing)
+                if histogram is None:
+                    continue
+                cumulative = 0
+                for bound, count in zip(
+                    [*map(str, HISTOGRAM_BUCKETS), "+Inf"], histogram.buckets
+                ):
+                    cumulative += count
+                    lines.append(
+                        f"{metric}_bucket{_labels({**labels, 'le': bound})} {cumulative}"
+                    )
+                lines.append(f"{metric}_sum{_labels(labels)} {histogram.sum}")
+                lines.append(f"{metric}_count{_labels(labels)} {histogram.count}")
+
+        for name, kind, help_text, value in SCALARS:
+            metric = header(name, kind, help_text)
+            for labels, coordinator in sources:
+                lines.append(
+                    f"{metric}{_labels(labels)} "
+                    f"{value(coordinator.perf_stats, coordinator)}"
+                )
+
+        lines.append("")
+        return "\n".join(lines)
+
+
+class NWSMetricsView(HomeAssistantView):
+    """Serve the metrics registry in Prometheus text format."""
+
+    url = METRICS_VIEW_URL
+    name = "api:nwsdetailedforecast:metrics"
+
+    def __init__(self, registry: MetricsRegistry) -> None:
+        """Initialize the metrics view."""
+        self._registry = registry
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Return the metrics when at least one entry exposes them."""
+        if self._registry.empty:
+            return web.Response(status=404)
+        return web.Response(
+            body=self._registry.render().encode(),
+            headers={"Content-Type": CONTENT_TYPE},
+        )
@@ -1,32 +1,47 @@
 """Support for NWS Detailed Forecast"""
+from __future__ import annotations
+
 import logging
 
+from collections.abc import Callable
 from dataclasses import dataclass, field
+from typing import Any
+
+from functools import cache
 
 import voluptuous as vol
 import homeassistant.helpers.config_validation as cv
-import homeassistant.helpers.template as template_helper
 
 
 from homeassistant.components.sensor import (
-    PLATFORM_SCHEMA,
+    PLATFORM_SCHEMA as SENSOR_PLATFORM_SCHEMA,
+    RestoreSensor,
     SensorDeviceClass,
-    SensorEntity,
     SensorEntityDescription,
+    SensorExtraStoredData,
     SensorStateClass,
+    SensorEntity,
 )
 from typing import Literal, NamedTuple
 
 from homeassistant.config_entries import SOURCE_IMPORT, ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
 from homeassistant.helpers.typing import DiscoveryInfoType
+import homeassistant.util.dt as dt_util
+from homeassistant.util.unit_conversion import (
+    DistanceConverter,
+    SpeedConverter,
+    TemperatureConverter,
+)
 
 from homeassistant.const import (
     ATTR_ATTRIBUTION,
     CONF_API_KEY,
     CONF_LOCATION,
+    CONF_MONITORED_CONDITIONS,
     CONF_NAME,
     CONF_SCAN_INTERVAL,
     Platform,
@@ -37,6 +52,8 @@ from homeassistant.const import (
     UnitOfTemperature,
     UnitOfLength,
     UnitOfVolumetricFlux,
+    UnitOfInformation,
+    UnitOfTime,
     UnitOfPrecipitationDepth,
     UV_INDEX,
 )
@@ -49,18 +66,36 @@ from .const import (
     PLATFORMS,
     UPDATE_LISTENER,
     CONF_UNITS,
+    CONF_STATION_IDENTIFIER,
+    CONF_GRID_IDENTIFIER,
+    CONF_TWICEDAILY_FORECAST,
     NWS_PLATFORMS,
     NWS_PLATFORM,
+    RESTORE_STATE_MAX_AGE,
+    ATTR_API_WIND_SPEED_MEAN,
+    ATTR_API_WIND_SPEED_UNIT,
+    ATTR_API_CONDITION_KEY,
+    DATA_ICON_CACHE,
+    ENTRY_VERIFIER,
+    ENTRY_CURRENT_OBSERVATION,
+    ENTRY_ALERTS,
+    ENTRY_PRECIPITATION,
+    PRECIPITATION_WINDOWS,
 )
 
 
+from .alerts import LocationAlerts
+from .metrics import PerfStats, cache_hits
+from .observations import CurrentObservation
+from .precipitation import PrecipitationCoordinator
+from .store import async_get_store
+from .verification import ForecastVerifier
 from .weather_update_coordinator import WeatherUpdateCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
 ATTRIBUTION = "Powered by the National Weather Service"
 
-CONF_TWICEDAILY_FORECAST = "twicedaily_forecast"
 CONF_LANGUAGE = "language"
 CONF_UNITS = "units"
 
@@ -153,10 +188,71 @@ SENSOR_TYPES: dict[str, NWSDetailedForecastSensorEntityDescription] = {
         suggested_display_precision=2,
         forecast_mode=["twicedaily"],
     ),
+    "feels_like_temperature": NWSDetailedForecastSensorEntityDescription(
+        key="feels_like_temperature",
+        name="Feels Like Temperature",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        si_unit=UnitOfTemperature.CELSIUS,
+        us_unit=UnitOfTemperature.FAHRENHEIT,
+        ca_unit=UnitOfTemperature.CELSIUS,
+        uk_unit=UnitOfTemperature.CELSIUS,
+        uk2_unit=UnitOfTemperature.CELSIUS,
+        suggested_display_precision=1,
+        forecast_mode=["twicedaily"],
+    ),
+    "heat_index": NWSDetailedForecastSensorEntityDescription(
+        key="heat_index",
+        name="Heat Index",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        si_unit=UnitOfTemperature.CELSIUS,
+        us_unit=UnitOfTemperature.FAHRENHEIT,
+        ca_unit=UnitOfTemperature.CELSIUS,
+        uk_unit=UnitOfTemperature.CELSIUS,
+        uk2_unit=UnitOfTemperature.CELSIUS,
+        suggested_display_precision=1,
+        forecast_mode=["twicedaily"],
+    ),
+    "wind_chill": NWSDetailedForecastSensorEntityDescription(
+        key="wind_chill",
+        name="Wind Chill",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        si_unit=UnitOfTemperature.CELSIUS,
+        us_unit=UnitOfTemperature.FAHRENHEIT,
+        ca_unit=UnitOfTemperature.CELSIUS,
+        uk_unit=UnitOfTemperature.CELSIUS,
+        uk2_unit=UnitOfTemperature.CELSIUS,
+        suggested_display_precision=1,
+        forecast_mode=["twicedaily"],
+    ),
+    "dewpoint_depression": NWSDetailedForecastSensorEntityDescription(
+        key="dewpoint_depression",
+        name="Dew Point Depression",
+        # A temperature difference, which the temperature device class
+        # would convert as an absolute temperature
+        state_class=SensorStateClass.MEASUREMENT,
+        si_unit=UnitOfTemperature.CELSIUS,
+        us_unit=UnitOfTemperature.FAHRENHEIT,
+        ca_unit=UnitOfTemperature.CELSIUS,
+        uk_unit=UnitOfTemperature.CELSIUS,
+        uk2_unit=UnitOfTemperature.CELSIUS,
+        suggested_display_precision=1,
+        icon="mdi:thermometer-water",
+        forecast_mode=["twicedaily"],
+    ),
     "windSpeed": NWSDetailedForecastSensorEntityDescription(
         key="windSpeed",
         name="Wind Speed",
         device_class=SensorDeviceClass.WIND_SPEED,
+        state_class=SensorStateClass.MEASUREMENT,
+        si_unit=UnitOfSpeed.METERS_PER_SECOND,
+        us_unit=UnitOfSpeed.MILES_PER_HOUR,
+        ca_unit=UnitOfSpeed.KILOMETERS_PER_HOUR,
+        uk_unit=UnitOfSpeed.MILES_PER_HOUR,
+        uk2_unit=UnitOfSpeed.MILES_PER_HOUR,
+        suggested_display_precision=1,
         icon="mdi:weather-windy",
         forecast_mode=["twicedaily"],
     ),
@@ -194,6 +290,242 @@ SENSOR_TYPES: dict[str, NWSDetailedForecastSensorEntityDescription] = {
 }
 
 
+@dataclass
+class NWSDetailedForecastPrecipitationSensorEntityDescription(SensorEntityDescription):
+    """Describes an NWS Detailed Forecast rolling precipitation total sensor."""
+
+    total: str = "precipitation"
+    hours: int = 24
+    metric_unit: str = UnitOfPrecipitationDepth.MILLIMETERS
+
+
+PRECIPITATION_SENSOR_TYPES: tuple[
+    NWSDetailedForecastPrecipitationSensorEntityDescription, ...
+] = tuple(
+    NWSDetailedForecastPrecipitationSensorEntityDescription(
+        key=f"{total}_{hours}h",
+        name=f"{name} Next {hours}h",
+        icon=icon,
+        device_class=SensorDeviceClass.PRECIPITATION,
+        suggested_display_precision=2,
+        total=total,
+        hours=hours,
+        metric_unit=metric_unit,
+    )
+    for total, name, icon, metric_unit in (
+        (
+            "precipitation",
+            "Precipitation",
+            "mdi:weather-pouring",
+            UnitOfPrecipitationDepth.MILLIMETERS,
+        ),
+        (
+            "snowfall",
+            "Snowfall",
+            "mdi:weather-snowy-heavy",
+            UnitOfPrecipitationDepth.CENTIMETERS,
+        ),
+    )
+    for hours in PRECIPITATION_WINDOWS
+)
+
+
+@dataclass
+class NWSDetailedForecastVerificationSensorEntityDescription(SensorEntityDescription):
+    """Describes an NWS Detailed Forecast verification sensor."""
+
+    summary_key: str = ""
+    # Temperature differences scale with the unit but are not offset
+    temperature_difference: bool = False
+
+
+VERIFICATION_SENSOR_TYPES: tuple[
+    NWSDetailedForecastVerificationSensorEntityDescription, ...
+] = (
+    NWSDetailedForecastVerificationSensorEntityDescription(
+        key="temperature_bias",
+        name="Temperature Forecast Bias",
+        icon="mdi:thermometer-plus",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        summary_key="temperature_bias",
+        temperature_difference=True,
+    ),
+    NWSDetailedForecastVerificationSensorEntityDescription(
+        key="temperature_mae",
+        name="Temperature Forecast Error",
+        icon="mdi:thermometer-alert",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        summary_key="temperature_mae",
+        temperature_difference=True,
+    ),
+    NWSDetailedForecastVerificationSensorEntityDescription(
+        key="precipitation_brier",
+        name="Precipitation Brier Score",
+        icon="mdi:weather-rainy",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=3,
+        summary_key="precipitation_brier",
+    ),
+)
+
+
+@dataclass
+class NWSDetailedForecastSensorExtraStoredData(SensorExtraStoredData):
+    """Sensor restore data including the forecast period it belongs to."""
+
+    period_number: int | None = None
+    period_name: str | None = None
+    period_end: str | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a dict representation of the sensor data."""
+        data = super().as_dict()
+        data["period_number"] = self.period_number
+        data["period_name"] = self.period_name
+        data["period_end"] = self.period_end
+        return data
+
+    @classmethod
+    def from_dict(
+        cls, restored: dict[str, Any]
+    ) -> NWSDetailedForecastSensorExtraStoredData | None:
+        """Initialize a stored sensor state from a dict."""
+        sensor_data = SensorExtraStoredData.from_dict(restored)
+        if sensor_data is None:
+            return None
+        return cls(
+            sensor_data.native_value,
+            sensor_data.native_unit_of_measurement,
+            restored.get("period_number"),
+            restored.get("period_name"),
+            restored.get("period_end"),
+        )
+
+
+def _no_value(stats: PerfStats, hass: HomeAssistant) -> StateType:
+    return None
+
+
+def _no_attrs(stats: PerfStats, hass: HomeAssistant) -> dict[str, Any]:
+    return {}
+
+
+@dataclass
+class NWSDetailedForecastDiagnosticSensorEntityDescription(SensorEntityDescription):
+    """Describes an NWS Detailed Forecast performance sensor."""
+
+    value_fn: Callable[[PerfStats, HomeAssistant], StateType] = _no_value
+    attr_fn: Callable[[PerfStats, HomeAssistant], dict[str, Any]] = _no_attrs
+
+
+def _timing_attrs(name: str) -> Callable[[PerfStats, HomeAssistant], dict[str, Any]]:
+    """Return the rolling histogram of a timing as attributes."""
+
+    def attrs(stats: PerfStats, hass: HomeAssistant) -> dict[str, Any]:
+        histogram = stats.histograms.get(name)
+        return histogram.as_dict() if histogram else {}
+
+    return attrs
+
+
+DIAGNOSTIC_SENSOR_TYPES: tuple[NWSDetailedForecastDiagnosticSensorEntityDescription, ...] = (
+    NWSDetailedForecastDiagnosticSensorEntityDescription(
+        key="fetch_latency",
+        name="Fetch Latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_display_precision=3,
+        value_fn=lambda stats, hass: stats.last("request"),
+        attr_fn=lambda stats, hass: {
+            **_timing_attrs("request")(stats, hass),
+            "dns": stats.last("dns"),
+            "connect": stats.last("connect"),
+            "download": stats.last("download"),
+        },
+    ),
+    NWSDetailedForecastDiagnosticSensorEntityDescription(
+        key="response_size",
+        name="Response Size",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        value_fn=lambda stats, hass: stats.gauges.get("response_size"),
+        attr_fn=lambda stats, hass: {"total_bytes": stats.counters["bytes"]},
+    ),
+    NWSDetailedForecastDiagnosticSensorEntityDescription(
+        key="parse_time",
+        name="Parse Time",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_display_precision=4,
+        value_fn=lambda stats, hass: stats.last("parse"),
+        attr_fn=lambda stats, hass: {
+            **_timing_attrs("parse")(stats, hass),
+            "json_parse": stats.last("json_parse"),
+            "ingest": stats.last("ingest"),
+            "model": stats.last("model"),
+            "executor": stats.last("executor"),
+        },
+    ),
+    NWSDetailedForecastDiagnosticSensorEntityDescription(
+        key="loop_blocked",
+        name="Loop Blocked Time",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_display_precision=4,
+        value_fn=lambda stats, hass: stats.last("loop_blocked"),
+        attr_fn=lambda stats, hass: {
+            **_timing_attrs("loop_blocked")(stats, hass),
+            "publish": stats.last("publish"),
+            "card": stats.last("card"),
+        },
+    ),
+    NWSDetailedForecastDiagnosticSensorEntityDescription(
+        key="cache_hits",
+        name="Cache Hits",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda stats, hass: sum(
+            cache_hits(hass.data[DOMAIN].get(DATA_ICON_CACHE)).values()
+        ),
+        attr_fn=lambda stats, hass: cache_hits(hass.data[DOMAIN].get(DATA_ICON_CACHE)),
+    ),
+    NWSDetailedForecastDiagnosticSensorEntityDescription(
+        key="not_modified",
+        name="Not Modified Responses",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda stats, hass: stats.counters["not_modified"],
+        attr_fn=lambda stats, hass: {
+            "requests": stats.counters["requests"],
+            "errors": stats.counters["errors"],
+        },
+    ),
+    NWSDetailedForecastDiagnosticSensorEntityDescription(
+        key="state_writes_skipped",
+        name="State Writes Skipped",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda stats, hass: stats.counters["state_writes_skipped"],
+        attr_fn=lambda stats, hass: {
+            **_timing_attrs("state_write")(stats, hass),
+            "state_writes": stats.counters["state_writes"],
+        },
+    ),
+    NWSDetailedForecastDiagnosticSensorEntityDescription(
+        key="memory",
+        name="Memory",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        value_fn=lambda stats, hass: stats.gauges.get("memory_bytes"),
+        attr_fn=lambda stats, hass: {
+            "budget_bytes": store.budget,
+            "evictions": store.evictions,
+        }
+        if (store := async_get_store(hass)) is not None
+        else {},
+    ),
+)
+
+
 class ConditionPicture(NamedTuple):
     """Entity picture and icon for condition."""
 
@@ -242,8 +574,36 @@ CONDITION_PICTURES: dict[str, ConditionPicture] = {
         entity_picture="/static/images/darksky/weather-cloudy.svg",
         icon="mdi:weather-night-partly-cloudy",
     ),
+    "hail": ConditionPicture(
+        entity_picture="/static/images/darksky/weather-hail.svg",
+        icon="mdi:weather-hail",
+    ),
+    "thunderstorm": ConditionPicture(
+        entity_picture="/static/images/darksky/weather-pouring.svg",
+        icon="mdi:weather-lightning-rainy",
+    ),
 }
 
+# Units of NWS temperatureUnit values and quantity unit codes
+NWS_TEMPERATURE_UNITS = {
+    "F": UnitOfTemperature.FAHRENHEIT,
+    "C": UnitOfTemperature.CELSIUS,
+    "wmoUnit:degF": UnitOfTemperature.FAHRENHEIT,
+    "wmoUnit:degC": UnitOfTemperature.CELSIUS,
+}
+
+# Sensors reporting an absolute temperature in the period's unit
+TEMPERATURE_SENSOR_TYPES = {
+    "dewpoint",
+    "temperature",
+    "feels_like_temperature",
+    "heat_index",
+    "wind_chill",
+}
+
+# Sensors whose picture and icon follow the classified condition
+CONDITION_SENSOR_TYPES = {"shortForecast", "detailedForecast"}
+
 
 # Language Supported Codes
 LANGUAGE_CODES = [
@@ -257,20 +617,35 @@ ALERTS_ATTRS = ["time", "description", "expires", "severity", "uri", "regions",
 HOURS = list(range(168))
 DAYS = list(range(7))
 
-PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
-    {
-        vol.Required(CONF_API_KEY): cv.string,
-        vol.Optional(CONF_NAME, default=DEFAULT_NAME): cv.string,
-        vol.Optional(CONF_UNITS): vol.In(ALLOWED_UNITS),
-        vol.Optional(CONF_LANGUAGE, default=DEFAULT_LANGUAGE): vol.In(LANGUAGE_CODES),
-        vol.Optional(CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL): cv.time_period,
-        vol.Optional(CONF_LOCATION, default=""): str,
-        vol.Required(CONF_STATION_IDENTIFIER, default=""): str,
-        vol.Required(CONF_GRID_IDENTIFIER, default=""): str,
-        vol.Optional(NWS_PLATFORM): cv.multi_select(NWS_PLATFORMS),
-        vol.Optional(CONF_TWICEDAILY_FORECAST): cv.multi_select(HOURS),
-    }
-)
+
+@cache
+def _platform_schema() -> vol.Schema:
+    """Return the deprecated YAML schema, built on first use."""
+    return SENSOR_PLATFORM_SCHEMA.extend(
+        {
+            vol.Required(CONF_API_KEY): cv.string,
+            vol.Optional(CONF_NAME, default=DEFAULT_NAME): cv.string,
+            vol.Optional(CONF_UNITS): vol.In(ALLOWED_UNITS),
+            vol.Optional(CONF_LANGUAGE, default=DEFAULT_LANGUAGE): vol.In(
+                LANGUAGE_CODES
+            ),
+            vol.Optional(
+                CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL
+            ): cv.time_period,
+            vol.Optional(CONF_LOCATION, default=""): str,
+            vol.Required(CONF_STATION_IDENTIFIER, default=""): str,
+            vol.Required(CONF_GRID_IDENTIFIER, default=""): str,
+            vol.Optional(NWS_PLATFORM): cv.multi_select(NWS_PLATFORMS),
+            vol.Optional(CONF_TWICEDAILY_FORECAST): cv.multi_select(HOURS),
+        }
+    )
+
+
+def __getattr__(name: str) -> Any:
+    """Build PLATFORM_SCHEMA only when a YAML sensor platform is configured."""
+    if name == "PLATFORM_SCHEMA":
+        return _platform_schema()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 async def async_setup_platform(
@@ -335,11 +710,15 @@ async def async_setup_entry(
                     forecast_twicedaily=None,
                     description=sensorDescription,
                     requestUnits=requestUnits,
+                    current_observation=domain_data.get(ENTRY_CURRENT_OBSERVATION),
+                    location_alerts=domain_data.get(ENTRY_ALERTS)
+                    if condition == "alerts"
+                    else None,
                 )
             )
 
         if forecast_twicedaily is not None and "twicedaily" in sensorDescription.forecast_mode:
-            for forecast_h in forecast_hours:
+            for forecast_h in forecast_twicedaily:
                 unique_id = (
                     f"{config_entry.unique_id}-sensor-{condition}-hourly-{forecast_h}"
                 )
@@ -355,13 +734,56 @@ async def async_setup_entry(
                     )
                 )
 
-    async_add_entities(sensors)
+    diagnostic_sensors = [
+        NWSDetailedForecastDiagnosticSensor(
+            weather_coordinator,
+            name,
+            f"{config_entry.unique_id}-diagnostic-{description.key}",
+            description,
+        )
+        for description in DIAGNOSTIC_SENSOR_TYPES
+    ]
+
+    verification_sensors = []
+    if (verifier := domain_data.get(ENTRY_VERIFIER)) is not None:
+        verification_sensors = [
+            NWSDetailedForecastVerificationSensor(
+                verifier,
+                name,
+                f"{config_entry.unique_id}-verification-{description.key}",
+                description,
+                domain_data[CONF_UNITS],
+            )
+            for description in VERIFICATION_SENSOR_TYPES
+        ]
+
+    precipitation_sensors = []
+    if (precipitation := domain_data.get(ENTRY_PRECIPITATION)) is not None:
+        precipitation_sensors = [
+            NWSDetailedForecastPrecipitationSensor(
+                precipitation,
+                name,
+                f"{config_entry.unique_id}-precipitation-{description.key}",
+                description,
+                domain_data[CONF_UNITS],
+            )
+            for description in PRECIPITATION_SENSOR_TYPES
+        ]
+
+    async_add_entities(
+        [
+            *sensors,
+            *diagnostic_sensors,
+            *verification_sensors,
+            *precipitation_sensors,
+        ]
+    )
 
 
-class NWSDetailedForecastSensor(SensorEntity):
+class NWSDetailedForecastSensor(RestoreSensor):
     """Class for an NWS Detailed Forecast sensor."""
 
-    # _attr_should_poll = False
+    _attr_should_poll = False
     _attr_attribution = ATTRIBUTION
     entity_description: NWSDetailedForecastSensorEntityDescription
 
@@ -374,6 +796,8 @@ class NWSDetailedForecastSensor(SensorEntity):
         forecast_twicedaily: int,
         description: NWSDetailedForecastSensorEntityDescription,
         requestUnits: str,
+        current_observation: CurrentObservation | None = None,
+        location_alerts: LocationAlerts | None = None,
     ) -> None:
         """Initialize the sensor."""
         self.client_name = name
@@ -383,6 +807,8 @@ class NWSDetailedForecastSensor(SensorEntity):
         self.description = description
 
         self._weather_coordinator = weather_coordinator
+        self._current_observation = current_observation
+        self._location_alerts = location_alerts
 
         self._attr_unique_id = unique_id
         self._attr_name = name
@@ -392,6 +818,8 @@ class NWSDetailedForecastSensor(SensorEntity):
         self.type = condition
         self._icon = None
         self._alerts = None
+        self._restored: NWSDetailedForecastSensorExtraStoredData | None = None
+        self._written_data = None
 
         self._name = description.name
 
@@ -405,7 +833,7 @@ class NWSDetailedForecastSensor(SensorEntity):
     @property
     def available(self) -> bool:
         """Return if weather data is available from PirateWeather."""
-        return self._weather_coordinator.data is not None
+        return self._weather_coordinator.data is not None or self._restored is not None
 
     @property
     def attribution(self):
@@ -429,7 +857,10 @@ class NWSDetailedForecastSensor(SensorEntity):
     @property
     def entity_picture(self) -> str | None:
         """Return the entity picture to use in the frontend, if any."""
-        if self._icon is None or "summary" not in self.entity_description.key:
+        if self.type == "icon" and self.available:
+            return self.native_value
+
+        if self._icon is None or self.type not in CONDITION_SENSOR_TYPES:
             return None
 
         if self._icon in CONDITION_PICTURES:
@@ -448,7 +879,7 @@ class NWSDetailedForecastSensor(SensorEntity):
     def icon(self) -> str | None:
         """Icon to use in the frontend, if any."""
         if (
-            "summary" in self.entity_description.key
+            self.type in CONDITION_SENSOR_TYPES
             and self._icon in CONDITION_PICTURES
         ):
             return CONDITION_PICTURES[self._icon].icon
@@ -459,7 +890,8 @@ class NWSDetailedForecastSensor(SensorEntity):
     def extra_state_attributes(self):
         """Return the state attributes."""
         if self.type == "alerts":
-            extraATTR = self._alerts
+            # A restored alerts sensor has its count but no alerts yet
+            extraATTR = dict(self._alerts or {})
             extraATTR[ATTR_ATTRIBUTION] = ATTRIBUTION
 
             return extraATTR
@@ -472,8 +904,16 @@ class NWSDetailedForecastSensor(SensorEntity):
 
         self.update_unit_of_measurement()
 
+        if self._weather_coordinator.data is None:
+            if self._restored is None:
+                return None
+            return self._restored.native_value
+
         if self.type == "alerts":
-            data = self._weather_coordinator.data.alerts()
+            if self._location_alerts is not None:
+                data = self._location_alerts.alerts()
+            else:
+                data = self._weather_coordinator.data.alerts()
 
             alerts = {}
             if data is None:
@@ -491,7 +931,9 @@ class NWSDetailedForecastSensor(SensorEntity):
 
                     # Convert time to string
                     if isinstance(alertsAttr, int):
-                        alertsAttr = template_helper.timestamp_local(alertsAttr)
+                        alertsAttr = dt_util.as_local(
+                            dt_util.utc_from_timestamp(alertsAttr)
+                        ).isoformat()
 
                     alerts[dkey] = alertsAttr
 
@@ -503,8 +945,7 @@ class NWSDetailedForecastSensor(SensorEntity):
             self._icon = getattr(self._weather_coordinator.data.daily(), "icon", "")
 
         else:
-            currently = self._weather_coordinator.data.currently()
-            native_val = self.get_state(currently.d)
+            native_val = self.get_state(self._period_data())
 
         # self._state = native_val
 
@@ -515,14 +956,42 @@ class NWSDetailedForecastSensor(SensorEntity):
 
         If the sensor type is unknown, the current state is returned.
         """
-        lookup_type = convert_to_camel(self.type)
+        lookup_type = convert_to_camel(self.entity_description.key)
         state = data.get(lookup_type)
 
+        # Dew point, humidity and precipitation are {"unitCode", "value"}
+        if isinstance(state, dict):
+            source_unit = NWS_TEMPERATURE_UNITS.get(state.get("unitCode"))
+            state = state.get("value")
+        else:
+            source_unit = NWS_TEMPERATURE_UNITS.get(data.get("temperatureUnit"))
+
+        # Wind speed is parsed at ingest into numbers in the NWS unit
+        if self.type == "windSpeed":
+            state = data.get(ATTR_API_WIND_SPEED_MEAN)
+            native_unit = data.get(ATTR_API_WIND_SPEED_UNIT)
+            # A speed in a unit the parser did not recognize cannot be shown
+            if native_unit not in SpeedConverter.VALID_UNITS:
+                state = None
+            elif (
+                state is not None
+                and native_unit != self._attr_native_unit_of_measurement
+            ):
+                state = SpeedConverter.convert(
+                    state, native_unit, self._attr_native_unit_of_measurement
+                )
+
         if state is None:
             return state
 
-        if "shortForecast" in self.type:
-            self._icon = getattr(data, "icon", "")
+        if self.type in CONDITION_SENSOR_TYPES:
+            self._icon = data.get(ATTR_API_CONDITION_KEY)
+
+        # Point clients at the locally cached copy of the NWS icon
+        if self.type == "icon":
+            icon_cache = self.hass.data[DOMAIN].get(DATA_ICON_CACHE)
+            if icon_cache is not None:
+                state = icon_cache.local_url(state)
 
         # Some state data needs to be rounded to whole values or converted to
         # percentages
@@ -530,14 +999,17 @@ class NWSDetailedForecastSensor(SensorEntity):
         #if self.type in ["probabilityOfPrecipitation", "relativeHumidity"]:
         #    state = state * 100
 
-        # Logic to convert from SI to requsested units for compatability
-        # Temps in F
-        if self.requestUnits in ["us"]:
-            if self.type in [
-                "dewpoint",
-                "temperature",
-            ]:
-                state = (state * 9 / 5) + 32
+        # Temperatures come in the unit NWS reports them in
+        if self.type in TEMPERATURE_SENSOR_TYPES and source_unit is not None:
+            if source_unit != self._attr_native_unit_of_measurement:
+                state = TemperatureConverter.convert(
+                    state, source_unit, self._attr_native_unit_of_measurement
+                )
+        elif self.type == "dewpoint_depression" and source_unit is not None:
+            if source_unit != self._attr_native_unit_of_measurement:
+                state = TemperatureConverter.convert_interval(
+                    state, source_unit, self._attr_native_unit_of_measurement
+                )
 
         if self.type in [
             "dew_point",
@@ -558,6 +1030,7 @@ class NWSDetailedForecastSensor(SensorEntity):
             "wind_speed",
             "wind_gust",
         ]:
+            roundingVal = self.entity_description.suggested_display_precision
             if roundingVal == 0:
                 outState = int(round(state, roundingVal))
             else:
@@ -568,17 +1041,299 @@ class NWSDetailedForecastSensor(SensorEntity):
 
         return outState
 
+    def _period_data(self) -> dict[str, Any]:
+        """Return the raw NWS period this sensor reports on."""
+        if self.forecast_twicedaily is None:
+            period = self._weather_coordinator.data.currently().d
+            if self._current_observation is not None:
+                return self._current_observation.current(period)
+            return period
+
+        periods = self._weather_coordinator.data.twicedaily().data
+        if self.forecast_twicedaily >= len(periods):
+            return {}
+        return periods[self.forecast_twicedaily].d
+
+    @property
+    def extra_restore_state_data(
+        self,
+    ) -> NWSDetailedForecastSensorExtraStoredData | None:
+        """Return sensor specific state data to be restored."""
+        if self._weather_coordinator.data is None:
+            return self._restored
+
+        period = {} if self.type == "alerts" else self._period_data()
+        return NWSDetailedForecastSensorExtraStoredData(
+            self.native_value,
+            self.native_unit_of_measurement,
+            period.get("number"),
+            period.get("name"),
+            period.get("endTime"),
+        )
+
+    async def _async_restore_state(self) -> None:
+        """Rehydrate the last value if it is still current."""
+        last_state = await self.async_get_last_state()
+        last_extra = await self.async_get_last_extra_data()
+        if last_state is None or last_extra is None:
+            return
+
+        restored = NWSDetailedForecastSensorExtraStoredData.from_dict(
+            last_extra.as_dict()
+        )
+        if restored is None or restored.native_value is None:
+            return
+
+        # Units changed since the value was stored
+        if restored.native_unit_of_measurement != self.native_unit_of_measurement:
+            return
+
+        now = dt_util.utcnow()
+        if now - last_state.last_updated > RESTORE_STATE_MAX_AGE:
+            return
+        if restored.period_end is not None:
+            period_end = dt_util.parse_datetime(restored.period_end)
+            if period_end is not None and period_end < now:
+                return
+
+        self._restored = restored
+
     async def async_added_to_hass(self) -> None:
         """Connect to dispatcher listening for entity data notifications."""
+        await super().async_added_to_hass()
+        if self._weather_coordinator.data is None:
+            await self._async_restore_state()
+
         self.async_on_remove(
-            self._weather_coordinator.async_add_listener(self.async_write_ha_state)
+            self._weather_coordinator.async_add_listener(self._handle_coordinator_update)
         )
+        if self._current_observation is not None:
+            self.async_on_remove(
+                self._current_observation.async_add_listener(
+                    self._handle_coordinator_update
+                )
+            )
+        if self._location_alerts is not None:
+            self.async_on_remove(
+                self._location_alerts.async_add_listener(
+                    self._handle_coordinator_update
+                )
+            )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Drop restored data once real data has arrived and write state."""
+        data = self._weather_coordinator.data
+        stats = self._weather_coordinator.perf_stats
+        if data is not None:
+            self._restored = None
+            if self._current_observation is not None:
+                data = (data, self._current_observation.period())
+            if self._location_alerts is not None:
+                data = (data, self._location_alerts.alerts())
+
+        # A 304 or failed refresh hands back the same forecast object
+        if data is not None and data == self._written_data:
+            stats.increment("state_writes_skipped")
+            return
+
+        with stats.timer("state_write"):
+            self.async_write_ha_state()
+        stats.increment("state_writes")
+        self._written_data = data
 
     # async def async_update(self) -> None:
     #    """Get the latest data from PW and updates the states."""
     #    await self._weather_coordinator.async_request_refresh()
 
 
+class NWSDetailedForecastDiagnosticSensor(SensorEntity):
+    """Performance figures of an NWS Detailed Forecast coordinator."""
+
+    _attr_should_poll = False
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    entity_description: NWSDetailedForecastDiagnosticSensorEntityDescription
+
+    def __init__(
+        self,
+        weather_coordinator: WeatherUpdateCoordinator,
+        name: str,
+        unique_id: str,
+        description: NWSDetailedForecastDiagnosticSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        self.entity_description = description
+        self._weather_coordinator = weather_coordinator
+        self._attr_unique_id = unique_id
+        self._attr_name = f"{name} {description.name}"
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the current figure."""
+        return self.entity_description.value_fn(
+            self._weather_coordinator.perf_stats, self.hass
+        )
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the rolling histogram and related figures."""
+        return self.entity_description.attr_fn(
+            self._weather_coordinator.perf_stats, self.hass
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Refresh whenever the coordinator has run."""
+        self.async_on_remove(
+            self._weather_coordinator.async_add_listener(self.async_write_ha_state)
+        )
+
+
+class NWSDetailedForecastVerificationSensor(SensorEntity):
+    """Forecast error statistics of a location, by lead time."""
+
+    _attr_should_poll = False
+    entity_description: NWSDetailedForecastVerificationSensorEntityDescription
+
+    def __init__(
+        self,
+        verifier: ForecastVerifier,
+        name: str,
+        unique_id: str,
+        description: NWSDetailedForecastVerificationSensorEntityDescription,
+        requestUnits: str,
+    ) -> None:
+        """Initialize the sensor."""
+        self.entity_description = description
+        self._verifier = verifier
+        self._attr_unique_id = unique_id
+        self._attr_name = f"{name} {description.name}"
+        self._fahrenheit = requestUnits == "us"
+        if description.temperature_difference:
+            self._attr_native_unit_of_measurement = (
+                UnitOfTemperature.FAHRENHEIT
+                if self._fahrenheit
+                else UnitOfTemperature.CELSIUS
+            )
+
+    def _convert(self, value: float | None) -> float | None:
+        """Return a statistic in the unit of the sensor."""
+        if value is None:
+            return None
+        if self.entity_description.temperature_difference and self._fahrenheit:
+            value *= 1.8
+        return round(value, 3)
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the statistic over all lead times."""
+        return self._convert(
+            self._verifier.summary()[self.entity_description.summary_key]
+        )
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the statistic for each lead time."""
+        summary = self._verifier.summary()
+        key = self.entity_description.summary_key
+        samples = (
+            "precipitation_samples"
+            if key == "precipitation_brier"
+            else "temperature_samples"
+        )
+        return {
+            ATTR_ATTRIBUTION: ATTRIBUTION,
+            "station": self._verifier.coordinator.station_id,
+            "samples": summary[samples],
+            "verified_until": dt_util.utc_from_timestamp(
+                self._verifier.verified_until
+            ).isoformat()
+            if self._verifier.verified_until is not None
+            else None,
+            "lead_times": {
+                lead: self._convert(stats[key])
+                for lead, stats in summary["leads"].items()
+            },
+        }
+
+    async def async_added_to_hass(self) -> None:
+        """Refresh whenever new forecasts have been verified."""
+        self.async_on_remove(
+            self._verifier.async_add_listener(self.async_write_ha_state)
+        )
+
+
+class NWSDetailedForecastPrecipitationSensor(SensorEntity):
+    """Forecast precipitation or snowfall over the next hours."""
+
+    _attr_should_poll = False
+    _attr_attribution = ATTRIBUTION
+    entity_description: NWSDetailedForecastPrecipitationSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: PrecipitationCoordinator,
+        name: str,
+        unique_id: str,
+        description: NWSDetailedForecastPrecipitationSensorEntityDescription,
+        requestUnits: str,
+    ) -> None:
+        """Initialize the sensor."""
+        self.entity_description = description
+        self._coordinator = coordinator
+        self._attr_unique_id = unique_id
+        self._attr_name = f"{name} {description.name}"
+        self._attr_native_unit_of_measurement = (
+            UnitOfPrecipitationDepth.INCHES
+            if requestUnits == "us"
+            else description.metric_unit
+        )
+
+    @property
+    def available(self) -> bool:
+        """Return if the gridpoint layers have been fetched."""
+        return self._coordinator.data is not None
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the total over the window starting now."""
+        if self._coordinator.data is None:
+            return None
+        start = dt_util.utcnow().timestamp()
+        total = self._coordinator.data.total(
+            self.entity_description.total,
+            start,
+            start + self.entity_description.hours * 3600,
+        )
+        if total is None:
+            return None
+        return round(
+            DistanceConverter.convert(
+                total,
+                UnitOfPrecipitationDepth.MILLIMETERS,
+                self._attr_native_unit_of_measurement,
+            ),
+            2,
+        )
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return how far the forecast amounts reach."""
+        if (totals := self._coordinator.data) is None:
+            return {ATTR_ATTRIBUTION: ATTRIBUTION}
+        return {
+            ATTR_ATTRIBUTION: ATTRIBUTION,
+            "hours": self.entity_description.hours,
+            "forecast_end": dt_util.utc_from_timestamp(totals.end).isoformat(),
+        }
+
+    async def async_added_to_hass(self) -> None:
+        """Move the window along whenever the coordinator has run."""
+        self.async_on_remove(
+            self._coordinator.async_add_listener(self.async_write_ha_state)
+        )
+
+
 def convert_to_camel(data):
     """Convert snake case (foo_bar_bat) to camel case (fooBarBat).
 
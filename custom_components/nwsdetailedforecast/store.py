@@ -0,0 +1,153 @@
+"""Memory accounting and eviction across the data every location keeps."""
+from __future__ import annotations
+
+from datetime import datetime
+import logging
+from typing import Any, Protocol
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import DATA_FORECAST_STORE, DOMAIN, MEMORY_CHECK_INTERVAL
+from .metrics import PerfStats, deep_sizeof
+
+_LOGGER = logging.getLogger(__name__)
+
+# Location of the parts shared by every entry, such as the lookup cache
+SHARED = "shared"
+
+
+class MemoryPart(Protocol):
+    """Something a location keeps in memory."""
+
+    def memory_bytes(self) -> int:
+        """Return the memory held, in bytes."""
+
+
+class EvictablePart(MemoryPart, Protocol):
+    """Something kept in memory that can be dropped and rebuilt on demand."""
+
+    last_used: float
+
+    def evict(self) -> None:
+        """Drop what can be rebuilt."""
+
+
+class ForecastData:
+    """The parsed forecast of a coordinator, which entities always need."""
+
+    def __init__(self, coordinator) -> None:
+        """Initialize the part."""
+        self._coordinator = coordinator
+        self._sized: tuple[Any, int] = (None, 0)
+
+    def memory_bytes(self) -> int:
+        """Return the size of the current forecast, measured once per issue."""
+        data = self._coordinator.data
+        if data is None:
+            return 0
+        if self._sized[0] is not data:
+            self._sized = (data, deep_sizeof(data))
+        return self._sized[1]
+
+
+class ForecastStore:
+    """Memory budget shared by the forecast data of every location.
+
+    Locations register the parts they keep. Parts that can be rebuilt have
+    an evict method and the time they were last used, and when the total
+    goes over the budget the least recently used are evicted first.
+    """
+
+    def __init__(self, hass: HomeAssistant, budget: int) -> None:
+        """Initialize the store with its budget in bytes."""
+        self.hass = hass
+        self.budget = budget
+        self.evictions = 0
+        self._locations: dict[str, tuple[PerfStats | None, dict[str, MemoryPart]]] = {}
+
+    @callback
+    def async_register(
+        self,
+        location: str,
+        parts: dict[str, MemoryPart],
+        stats: PerfStats | None = None,
+    ) -> CALLBACK_TYPE:
+        """Account for the parts of a location, returning a function to stop."""
+        self._locations[location] = (stats, parts)
+
+        @callback
+        def unregister() -> None:
+            self._locations.pop(location, None)
+
+        return unregister
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Check the budget periodically, returning a function to stop."""
+        return async_track_time_interval(
+            self.hass, self._async_check, MEMORY_CHECK_INTERVAL
+        )
+
+    def memory(self, location: str) -> dict[str, int]:
+        """Return the memory held by each part of a location."""
+        if location not in self._locations:
+            return {}
+        return {
+            name: part.memory_bytes()
+            for name, part in self._locations[location][1].items()
+        }
+
+    def total(self) -> int:
+        """Return the memory held by every location."""
+        return sum(sum(self.memory(location).values()) for location in self._locations)
+
+    @callback
+    def _async_check(self, now: datetime | None = None) -> None:
+        self.async_enforce()
+
+    @callback
+    def async_enforce(self) -> int:
+        """Evict the coldest parts until within budget, returning the total."""
+        usage = {location: self.memory(location) for location in self._locations}
+        total = sum(sum(memory.values()) for memory in usage.values())
+        if total > self.budget:
+            total = self._evict(usage, total)
+        for location, (stats, _) in self._locations.items():
+            if stats is not None:
+                stats.set("memory_bytes", sum(usage[location].values()))
+        return total
+
+    def _evict(self, usage: dict[str, dict[str, int]], total: int) -> int:
+        """Evict parts, least recently used first, until within budget."""
+        evictable = sorted(
+            (
+                (part.last_used, location, name, part)
+                for location, (_, parts) in self._locations.items()
+                for name, part in parts.items()
+                if hasattr(part, "evict") and usage[location][name]
+            ),
+            key=lambda item: item[0],
+        )
+        for _, location, name, part in evictable:
+            if total <= self.budget:
+                break
+            part.evict()
+            self.evictions += 1
+            after = part.memory_bytes()
+            total -= usage[location][name] - after
+            usage[location][name] = after
+            _LOGGER.debug(
+                "Evicted %s of %s to stay within the memory budget", name, location
+            )
+        if total > self.budget:
+            _LOGGER.debug(
+                "Forecast data holds %d bytes, over the %d byte budget", total, self.budget
+            )
+        return total
+
+
+@callback
+def async_get_store(hass: HomeAssistant) -> ForecastStore | None:
+    """Return the forecast store."""
+    return hass.data.get(DOMAIN, {}).get(DATA_FORECAST_STORE)
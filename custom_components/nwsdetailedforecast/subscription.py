@@ -0,0 +1,148 @@
+"""Websocket subscription pushing incremental card forecast updates."""
+from __future__ import annotations
+
+import time
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .card import CardPayloadCache, async_get_card_cache
+from .const import CARD_SUBSCRIPTION_THROTTLE
+
+WS_TYPE_CARD_SUBSCRIBE = "nwsdetailedforecast/card/subscribe"
+
+
+class CardSubscription:
+    """Send one connection the changes since the last version it received.
+
+    Updates arriving within the throttle window are batched into a single
+    delta against the last version actually sent.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        connection: websocket_api.ActiveConnection,
+        msg_id: int,
+        card_cache: CardPayloadCache,
+    ) -> None:
+        """Initialize the subscription."""
+        self.hass = hass
+        self._connection = connection
+        self._msg_id = msg_id
+        self._card_cache = card_cache
+        self._sent_version = 0
+        self._last_send = 0.0
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._unsub_cache: CALLBACK_TYPE | None = None
+        self._unsub_stop: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Send the initial snapshot and follow new payload versions."""
+        self._unsub_cache = self._card_cache.async_add_listener(self._async_schedule)
+        self._unsub_stop = self._card_cache.async_on_stop(self._async_cache_stopped)
+        if self._card_cache.payload is not None:
+            self._async_send()
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop following the card payload."""
+        if self._unsub_cache is not None:
+            self._unsub_cache()
+            self._unsub_cache = None
+        if self._unsub_stop is not None:
+            self._unsub_stop()
+            self._unsub_stop = None
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+    @callback
+    def _async_cache_stopped(self) -> None:
+        """End the subscription when its entry unloads or reloads.
+
+        The error tells the frontend to subscribe again, which attaches it
+        to the payload cache of the reloaded entry.
+        """
+        self._unsub_stop = None
+        self.async_stop()
+        self._connection.subscriptions.pop(self._msg_id, None)
+        self._connection.send_error(
+            self._msg_id,
+            websocket_api.const.ERR_HOME_ASSISTANT_ERROR,
+            "The forecast card payload was unloaded, subscribe again",
+        )
+
+    @callback
+    def _async_schedule(self) -> None:
+        """Send now or once the throttle window has passed."""
+        if self._unsub_timer is not None:
+            return
+
+        wait = self._last_send + CARD_SUBSCRIPTION_THROTTLE - time.monotonic()
+        if wait <= 0:
+            self._async_send()
+            return
+        self._unsub_timer = async_call_later(self.hass, wait, self._async_flush)
+
+    @callback
+    def _async_flush(self, _now: Any) -> None:
+        """Send the batched changes when the throttle timer fires."""
+        self._unsub_timer = None
+        self._async_send()
+
+    @callback
+    def _async_send(self) -> None:
+        """Send a delta from the last sent version, or a snapshot."""
+        card_cache = self._card_cache
+        if card_cache.version == self._sent_version:
+            return
+
+        event = None
+        if self._sent_version:
+            event = card_cache.delta(self._sent_version)
+        if event is None:
+            event = card_cache.snapshot()
+
+        self._connection.send_message(
+            f'{{"id":{self._msg_id},"type":"event","event":{event}}}'
+        )
+        self._sent_version = card_cache.version
+        self._last_send = time.monotonic()
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_TYPE_CARD_SUBSCRIBE,
+        vol.Required("entry_id"): str,
+    }
+)
+@callback
+def websocket_card_subscribe(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Subscribe to the card payload of a config entry."""
+    card_cache = async_get_card_cache(hass, msg["entry_id"])
+    if card_cache is None:
+        connection.send_error(
+            msg["id"], websocket_api.const.ERR_NOT_FOUND, "Unknown config entry"
+        )
+        return
+
+    subscription = CardSubscription(hass, connection, msg["id"], card_cache)
+    connection.subscriptions[msg["id"]] = subscription.async_stop
+    connection.send_result(msg["id"])
+    subscription.async_start()
+
+
+@callback
+def async_setup_subscription(hass: HomeAssistant) -> None:
+    """Register the card subscription websocket command."""
+    websocket_api.async_register_command(hass, websocket_card_subscribe)
@@ -0,0 +1,375 @@
+"""Verification of archived forecasts against station observations."""
+from __future__ import annotations
+
+import asyncio
+from array import array
+from bisect import bisect_left
+import logging
+import math
+from typing import Any, NamedTuple
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+import homeassistant.util.dt as dt_util
+
+from .api import observations_url
+from .archive import ForecastArchive
+from .const import (
+    DEFAULT_BASE_URL,
+    DOMAIN,
+    OBSERVATION_BACKFILL,
+    OBSERVATION_SCAN_INTERVAL,
+    VERIFICATION_LEAD_BUCKETS,
+    VERIFICATION_LEAD_HOURS,
+)
+from .observations import async_get_json, async_nearest_station
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+LEAD_SECONDS = VERIFICATION_LEAD_HOURS * 3600
+# Observations kept before the verified time, enough for the longest period
+OBSERVATION_WINDOW = 13 * 3600
+
+# Precipitation outcome of an observation
+PRECIP_UNKNOWN = -1
+
+_PRECIPITATION_FIELDS = (
+    "precipitationLastHour",
+    "precipitationLast3Hours",
+    "precipitationLast6Hours",
+)
+
+# Per lead time bucket: temperature count, error sum, absolute error sum,
+# precipitation count and Brier sum
+_ACCUMULATORS = ("count", "error", "abs_error", "brier_count", "brier")
+
+
+def _observation_row(properties: dict[str, Any]) -> tuple[int, float, int] | None:
+    """Return the time, temperature in °C and precipitation flag of an observation."""
+    timestamp = dt_util.parse_datetime(properties.get("timestamp") or "")
+    if timestamp is None:
+        return None
+    temperature = (properties.get("temperature") or {}).get("value")
+    precipitation = PRECIP_UNKNOWN
+    for field in _PRECIPITATION_FIELDS:
+        if (amount := (properties.get(field) or {}).get("value")) is not None:
+            precipitation = 1 if amount > 0 else 0
+            break
+    if precipitation != 1 and any(
+        weather.get("weather") in ("rain", "snow", "drizzle", "thunderstorms")
+        for weather in properties.get("presentWeather") or ()
+    ):
+        precipitation = 1
+    return (
+        int(timestamp.timestamp()),
+        math.nan if temperature is None else float(temperature),
+        precipitation,
+    )
+
+
+class Verification(NamedTuple):
+    """The outcome of scoring a batch of observations, to publish on the loop."""
+
+    scored: int
+    verified_until: int
+    totals: dict[str, array]
+
+
+def lead_label(bucket: int) -> str:
+    """Return the lead time range of a bucket, e.g. 12-24h."""
+    start = bucket * VERIFICATION_LEAD_HOURS
+    if bucket == VERIFICATION_LEAD_BUCKETS - 1:
+        return f"{start}h+"
+    return f"{start}-{start + VERIFICATION_LEAD_HOURS}h"
+
+
+class ObservationCoordinator(DataUpdateCoordinator):
+    """Fetch new observations of the station nearest a gridpoint.
+
+    Each update only asks for observations newer than the last one seen, and
+    its data is that batch, oldest first.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, station, grid, base_url: str = DEFAULT_BASE_URL
+    ) -> None:
+        """Initialize the coordinator."""
+        self.station = station
+        self.grid = grid
+        self.base_url = base_url
+        self.station_id: str | None = None
+        # Epoch of the newest observation fetched, or where to start from
+        self.latest: int | None = None
+
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN} observations",
+            update_interval=OBSERVATION_SCAN_INTERVAL,
+        )
+
+    async def _async_update_data(self) -> list[tuple[int, float, int]]:
+        """Return the observations made since the last update."""
+        try:
+            if self.station_id is None:
+                self.station_id = await async_nearest_station(
+                    self.hass, self.station, self.grid, self.base_url
+                )
+
+            if self.latest is None:
+                self.latest = int((dt_util.utcnow() - OBSERVATION_BACKFILL).timestamp())
+            _, payload, _ = await async_get_json(
+                self.hass,
+                observations_url(self.station_id, self.base_url),
+                {"start": dt_util.utc_from_timestamp(self.latest + 1).isoformat()},
+            )
+        except UpdateFailed:
+            raise
+        except Exception as err:
+            raise UpdateFailed(f"Error fetching observations: {err}") from err
+
+        rows = sorted(
+            row
+            for feature in payload.get("features") or ()
+            if (row := _observation_row(feature.get("properties") or {})) is not None
+            and row[0] > self.latest
+        )
+        if rows:
+            self.latest = rows[-1][0]
+        return rows
+
+
+class ForecastVerifier:
+    """Forecast error statistics per lead time, updated as observations arrive.
+
+    Every forecast period is scored once, when the observations first reach
+    its end. The day temperature is compared with the observed maximum, the
+    night temperature with the minimum, and the probability of
+    precipitation with whether any precipitation was observed.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        archive: ForecastArchive,
+        coordinator: ObservationCoordinator,
+        store_key: str,
+    ) -> None:
+        """Initialize the verifier."""
+        self.hass = hass
+        self.archive = archive
+        self.coordinator = coordinator
+        self.verified_until: int | None = None
+        self.periods = 0
+
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, store_key)
+        self._totals = {
+            name: array("d", bytes(8 * VERIFICATION_LEAD_BUCKETS))
+            for name in _ACCUMULATORS
+        }
+        self._times = array("q")
+        self._temperatures = array("d")
+        self._precipitation = array("b")
+        self._source = None
+        self._lock = asyncio.Lock()
+        self._listeners: list[CALLBACK_TYPE] = []
+
+    async def async_load(self) -> None:
+        """Restore the statistics and resume the observations where they ended."""
+        if (stored := await self._store.async_load()) is None:
+            return
+        self.verified_until = stored.get("verified_until")
+        self.periods = stored.get("periods", 0)
+        for name in _ACCUMULATORS:
+            values = stored.get(name, [])[:VERIFICATION_LEAD_BUCKETS]
+            self._totals[name][: len(values)] = array("d", values)
+        if self.verified_until is not None:
+            self.coordinator.latest = max(
+                self.verified_until - OBSERVATION_WINDOW,
+                int((dt_util.utcnow() - OBSERVATION_BACKFILL).timestamp()),
+            )
+
+    def _data_to_store(self) -> dict[str, Any]:
+        return {
+            "verified_until": self.verified_until,
+            "periods": self.periods,
+            **{name: list(values) for name, values in self._totals.items()},
+        }
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Verify whenever new observations arrive, returning a function to stop."""
+        return self.coordinator.async_add_listener(self._async_observed)
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Call update_callback whenever the statistics change."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def _async_observed(self) -> None:
+        rows = self.coordinator.data
+        if not rows or rows is self._source:
+            return
+        self._source = rows
+        self.hass.async_create_task(self._async_verify(rows))
+
+    async def _async_verify(self, rows: list[tuple[int, float, int]]) -> None:
+        async with self._lock:
+            result = await self.hass.async_add_executor_job(self.verify, rows)
+            if result is None:
+                return
+            # Swapped in on the loop, where the sensors and diagnostics read
+            # them, so they never see a batch half scored
+            self.verified_until = result.verified_until
+            self.periods += result.scored
+            self._totals = result.totals
+        if not result.scored:
+            return
+        self._store.async_delay_save(self._data_to_store, 60)
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    def verify(self, rows: list[tuple[int, float, int]]) -> Verification | None:
+        """Add observations and score the periods they complete.
+
+        The statistics are scored into a copy, returned with the number of
+        periods scored and the time verified until; None when the
+        observations reach no further than before.
+        """
+        for time, temperature, precipitation in rows:
+            if self._times and time <= self._times[-1]:
+                continue
+            self._times.append(time)
+            self._temperatures.append(temperature)
+            self._precipitation.append(precipitation)
+        if not self._times:
+            return None
+
+        after = self.verified_until
+        if after is None:
+            after = self._times[0]
+        until = self._times[-1]
+        if until <= after:
+            return None
+
+        batch = self.archive.ended_between(
+            after,
+            until,
+            ("start", "end", "temperature", "precipitation_probability", "is_daytime"),
+        )
+        totals = {name: array("d", values) for name, values in self._totals.items()}
+        scored = self._score(batch, totals)
+
+        # Drop the observations no later period can need
+        keep = bisect_left(self._times, until - OBSERVATION_WINDOW)
+        if keep:
+            del self._times[:keep]
+            del self._temperatures[:keep]
+            del self._precipitation[:keep]
+        return Verification(scored, until, totals)
+
+    def _observed(self, start: int, end: int, is_daytime: bool) -> tuple[float, int]:
+        """Return the observed temperature and precipitation outcome of a period."""
+        low = bisect_left(self._times, start)
+        high = bisect_left(self._times, end)
+        # Need at least one observation for every two hours of the period
+        if (high - low) * 2 * 3600 < end - start:
+            return math.nan, PRECIP_UNKNOWN
+
+        temperatures = [
+            value for value in self._temperatures[low:high] if not math.isnan(value)
+        ]
+        if not temperatures:
+            temperature = math.nan
+        elif end - start <= 3600:
+            temperature = sum(temperatures) / len(temperatures)
+        else:
+            temperature = max(temperatures) if is_daytime else min(temperatures)
+
+        outcomes = self._precipitation[low:high]
+        if 1 in outcomes:
+            outcome = 1
+        elif 0 in outcomes:
+            outcome = 0
+        else:
+            outcome = PRECIP_UNKNOWN
+        return temperature, outcome
+
+    def _score(self, batch: dict[str, array], totals: dict[str, array]) -> int:
+        """Accumulate the errors of a column batch of forecast periods."""
+        starts = batch["start"]
+        if not starts:
+            return 0
+        ends = batch["end"]
+
+        # Issuances repeat the same periods, observe each period once
+        observed = {
+            key: self._observed(*key)
+            for key in set(zip(starts, ends, batch["is_daytime"]))
+        }
+        leads = [
+            min(max(start - issued, 0) // LEAD_SECONDS, VERIFICATION_LEAD_BUCKETS - 1)
+            for start, issued in zip(starts, batch["issued"])
+        ]
+
+        for key, lead, forecast, probability in zip(
+            zip(starts, ends, batch["is_daytime"]),
+            leads,
+            batch["temperature"],
+            batch["precipitation_probability"],
+        ):
+            temperature, outcome = observed[key]
+            if not (math.isnan(forecast) or math.isnan(temperature)):
+                error = forecast - temperature
+                totals["count"][lead] += 1
+                totals["error"][lead] += error
+                totals["abs_error"][lead] += abs(error)
+            if outcome != PRECIP_UNKNOWN:
+                # NWS leaves the probability out when it is too low to mention
+                probability = 0.0 if math.isnan(probability) else probability / 100
+                totals["brier_count"][lead] += 1
+                totals["brier"][lead] += (probability - outcome) ** 2
+        return len(starts)
+
+    @staticmethod
+    def _ratio(total: float, count: float) -> float | None:
+        return total / count if count else None
+
+    def summary(self) -> dict[str, Any]:
+        """Return the overall statistics and those of each lead time bucket."""
+        totals = self._totals
+        overall = {name: sum(values) for name, values in totals.items()}
+        return {
+            "temperature_bias": self._ratio(overall["error"], overall["count"]),
+            "temperature_mae": self._ratio(overall["abs_error"], overall["count"]),
+            "precipitation_brier": self._ratio(
+                overall["brier"], overall["brier_count"]
+            ),
+            "temperature_samples": int(overall["count"]),
+            "precipitation_samples": int(overall["brier_count"]),
+            "leads": {
+                lead_label(bucket): {
+                    "temperature_bias": self._ratio(
+                        totals["error"][bucket], totals["count"][bucket]
+                    ),
+                    "temperature_mae": self._ratio(
+                        totals["abs_error"][bucket], totals["count"][bucket]
+                    ),
+                    "precipitation_brier": self._ratio(
+                        totals["brier"][bucket], totals["brier_count"][bucket]
+                    ),
+                    "samples": int(totals["count"][bucket]),
+                }
+                for bucket in range(VERIFICATION_LEAD_BUCKETS)
+                if totals["count"][bucket] or totals["brier_count"][bucket]
+            },
+        }
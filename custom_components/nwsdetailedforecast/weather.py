@@ -3,31 +3,26 @@ from __future__ import annotations
 
 import logging
 
+from dataclasses import asdict, dataclass
+from functools import cache
+from typing import Any
+
 import voluptuous as vol
 
 import homeassistant.helpers.config_validation as cv
-from homeassistant.util.dt import utc_from_timestamp
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.config_entries import SOURCE_IMPORT, ConfigEntry
 from homeassistant.core import HomeAssistant, callback
+from .observations import CurrentObservation
 from .weather_update_coordinator import WeatherUpdateCoordinator
 from homeassistant.helpers.typing import DiscoveryInfoType
+from homeassistant.helpers.restore_state import ExtraStoredData, RestoreEntity
+import homeassistant.util.dt as dt_util
+from homeassistant.util.unit_conversion import TemperatureConverter
 
 
 from homeassistant.components.weather import (
-    ATTR_CONDITION_CLEAR_NIGHT,
-    ATTR_CONDITION_CLOUDY,
-    ATTR_CONDITION_FOG,
-    ATTR_CONDITION_HAIL,
-    ATTR_CONDITION_LIGHTNING,
-    ATTR_CONDITION_PARTLYCLOUDY,
-    ATTR_CONDITION_RAINY,
-    ATTR_CONDITION_SNOWY,
-    ATTR_CONDITION_SNOWY_RAINY,
-    ATTR_CONDITION_SUNNY,
-    ATTR_CONDITION_WINDY,
-    ATTR_CONDITION_EXCEPTIONAL,
-    PLATFORM_SCHEMA,
+    PLATFORM_SCHEMA as WEATHER_PLATFORM_SCHEMA,
     Forecast,
     WeatherEntityFeature,
     SingleCoordinatorWeatherEntity,
@@ -51,13 +46,29 @@ from .const import (
     DEFAULT_NAME,
     DEFAULT_SCAN_INTERVAL,
     DOMAIN,
+    ENTRY_CURRENT_OBSERVATION,
     ENTRY_NAME,
     ENTRY_WEATHER_COORDINATOR,
     PLATFORMS,
     UPDATE_LISTENER,
     CONF_UNITS,
+    CONF_LANGUAGE,
+    CONF_STATION_IDENTIFIER,
+    CONF_GRID_IDENTIFIER,
+    DEFAULT_LANGUAGE,
+    DEFAULT_FORECAST_MODE,
+    FORECAST_MODES,
+    LANGUAGES,
     NWS_PLATFORMS,
     NWS_PLATFORM,
+    RESTORE_STATE_MAX_AGE,
+    ATTR_API_WIND_BEARING,
+    ATTR_API_WIND_SPEED_MEAN,
+    ATTR_API_WIND_SPEED_UNIT,
+    ATTR_API_CONDITION_KEY,
+    ATTR_API_ISDAYTIME,
+    ATTR_API_FEELS_LIKE_TEMPERATURE,
+    MAP_CONDITION,
 )
 
 ALLOWED_UNITS = ["auto", "si", "us", "ca", "uk", "uk2"]
@@ -66,39 +77,56 @@ _LOGGER = logging.getLogger(__name__)
 
 ATTRIBUTION = "Powered by the National weather Service"
 
-PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
-    {
-        vol.Required(CONF_API_KEY): cv.string,
-        vol.Optional(CONF_NAME, default=DEFAULT_NAME): cv.string,
-        vol.Optional(CONF_UNITS): vol.In(ALLOWED_UNITS),
-        vol.Optional(CONF_LANGUAGE, default=DEFAULT_LANGUAGE): vol.In(LANGUAGE_CODES),
-        vol.Optional(CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL): cv.time_period,
-        vol.Optional(CONF_LOCATION, default=""): str,
-        vol.Required(CONF_GRID_IDENTIFIER, default=""): str,
-        vol.Optional(NWS_PLATFORM): cv.multi_select(NWS_PLATFORMS),
-        vol.Optional(CONF_MODE, default="twicedaily"): vol.In(FORECAST_MODES),
-    }
-)
+
+@cache
+def _platform_schema() -> vol.Schema:
+    """Return the deprecated YAML schema, built on first use."""
+    return WEATHER_PLATFORM_SCHEMA.extend(
+        {
+            vol.Required(CONF_API_KEY): cv.string,
+            vol.Optional(CONF_NAME, default=DEFAULT_NAME): cv.string,
+            vol.Optional(CONF_UNITS): vol.In(ALLOWED_UNITS),
+            vol.Optional(CONF_LANGUAGE, default=DEFAULT_LANGUAGE): vol.In(LANGUAGES),
+            vol.Optional(
+                CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL
+            ): cv.time_period,
+            vol.Optional(CONF_LOCATION, default=""): str,
+            vol.Required(CONF_STATION_IDENTIFIER, default=""): str,
+            vol.Required(CONF_GRID_IDENTIFIER, default=""): str,
+            vol.Optional(NWS_PLATFORM): cv.multi_select(NWS_PLATFORMS),
+            vol.Optional(CONF_MODE, default=DEFAULT_FORECAST_MODE): vol.In(
+                FORECAST_MODES
+            ),
+        }
+    )
 
 
-MAP_CONDITION = {
-    "clear-day": ATTR_CONDITION_SUNNY,
-    "clear-night": ATTR_CONDITION_CLEAR_NIGHT,
-    "rain": ATTR_CONDITION_RAINY,
-    "snow": ATTR_CONDITION_SNOWY,
-    "sleet": ATTR_CONDITION_SNOWY_RAINY,
-    "wind": ATTR_CONDITION_WINDY,
-    "fog": ATTR_CONDITION_FOG,
-    "cloudy": ATTR_CONDITION_CLOUDY,
-    "partly-cloudy-day": ATTR_CONDITION_PARTLYCLOUDY,
-    "partly-cloudy-night": ATTR_CONDITION_PARTLYCLOUDY,
-    "hail": ATTR_CONDITION_HAIL,
-    "thunderstorm": ATTR_CONDITION_LIGHTNING,
-    "tornado": ATTR_CONDITION_EXCEPTIONAL,
-}
+def __getattr__(name: str) -> Any:
+    """Build PLATFORM_SCHEMA only when a YAML weather platform is configured."""
+    if name == "PLATFORM_SCHEMA":
+        return _platform_schema()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 CONF_UNITS = "units"
 
+# Raw period fields kept for the current conditions across a restart
+RESTORE_PERIOD_KEYS = (
+    "number",
+    "name",
+    "startTime",
+    "endTime",
+    "temperature",
+    "relativeHumidity",
+    "windSpeed",
+    "windDirection",
+    ATTR_API_ISDAYTIME,
+    ATTR_API_CONDITION_KEY,
+    ATTR_API_WIND_SPEED_MEAN,
+    ATTR_API_WIND_SPEED_UNIT,
+    ATTR_API_WIND_BEARING,
+    "shortForecast",
+)
+
 DEFAULT_NAME = "NWS Detailed Forecast"
 
 
@@ -125,16 +153,33 @@ async def async_setup_platform(
     )
 
 
+def _dew_point(period: dict[str, Any]) -> float | None:
+    """Return the dew point of a period in the entity's Fahrenheit."""
+    dew_point = period.get("dewpoint") or {}
+    if (value := dew_point.get("value")) is None:
+        return None
+    if dew_point.get("unitCode") == "wmoUnit:degC":
+        return TemperatureConverter.convert(
+            value, UnitOfTemperature.CELSIUS, UnitOfTemperature.FAHRENHEIT
+        )
+    return value
+
+
 def _map_twicedaily_forecast(forecast) -> Forecast:
     return {
-        "datetime": utc_from_timestamp(forecast.d.get("startTime")).isoformat(),
-        "condition": forecast.d.get("shortForecast"),
+        "datetime": forecast.d.get("startTime"),
+        "condition": MAP_CONDITION.get(forecast.d.get(ATTR_API_CONDITION_KEY)),
+        "is_daytime": forecast.d.get(ATTR_API_ISDAYTIME),
         "native_temperature": forecast.d.get("temperature"),
-        "native_dew_point": forecast.d.get("dewpoint").get("value"),
-        "native_wind_speed": forecast.d.get("windSpeed"),
-        "wind_bearing": forecast.d.get("windDirection"),
-        "humidity": forecast.d.get("relativeHumidity").get("value"),
-        "precipitation_probability": forecast.d.get("probabilityOfPrecipitation").get("value"),
+        "native_apparent_temperature": forecast.d.get(ATTR_API_FEELS_LIKE_TEMPERATURE),
+        "native_dew_point": _dew_point(forecast.d),
+        "native_wind_speed": forecast.d.get(ATTR_API_WIND_SPEED_MEAN),
+        "wind_bearing": forecast.d.get(ATTR_API_WIND_BEARING),
+        # Zone forecast periods carry neither
+        "humidity": (forecast.d.get("relativeHumidity") or {}).get("value"),
+        "precipitation_probability": (
+            forecast.d.get("probabilityOfPrecipitation") or {}
+        ).get("value"),
     }
 
 
@@ -152,14 +197,42 @@ async def async_setup_entry(
     unique_id = f"{config_entry.unique_id}"
 
     nws_weather = NWSDetailedForecast(
-        name, unique_id, forecast_mode, weather_coordinator
+        name,
+        unique_id,
+        forecast_mode,
+        weather_coordinator,
+        domain_data.get(ENTRY_CURRENT_OBSERVATION),
     )
 
     async_add_entities([nws_weather], False)
     # _LOGGER.info(pw_weather.__dict__)
 
 
-class NWSDetailedForecast(SingleCoordinatorWeatherEntity[WeatherUpdateCoordinator]):
+@dataclass
+class NWSDetailedForecastExtraStoredData(ExtraStoredData):
+    """Weather entity data stored across restarts."""
+
+    current: dict[str, Any]
+    forecast_twicedaily: list[Forecast] | None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a dict representation of the weather data."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(
+        cls, restored: dict[str, Any]
+    ) -> NWSDetailedForecastExtraStoredData | None:
+        """Initialize stored weather data from a dict."""
+        try:
+            return cls(restored["current"], restored["forecast_twicedaily"])
+        except KeyError:
+            return None
+
+
+class NWSDetailedForecast(
+    SingleCoordinatorWeatherEntity[WeatherUpdateCoordinator], RestoreEntity
+):
     """Implementation of an NWSDetailedForecast sensor."""
 
     _attr_attribution = ATTRIBUTION
@@ -173,6 +246,7 @@ class NWSDetailedForecast(SingleCoordinatorWeatherEntity[WeatherUpdateCoordinato
         unique_id,
         forecast_mode: str,
         weather_coordinator: WeatherUpdateCoordinator,
+        current_observation: CurrentObservation | None = None,
     ) -> None:
         """Initialize the sensor."""
         super().__init__(weather_coordinator)
@@ -187,7 +261,9 @@ class NWSDetailedForecast(SingleCoordinatorWeatherEntity[WeatherUpdateCoordinato
         self._name = name
         self._mode = forecast_mode
         self._unique_id = unique_id
-        self._ds_twicedaily = self._weather_coordinator.data.twicedaily()
+        self._current_observation = current_observation
+        self._restored: NWSDetailedForecastExtraStoredData | None = None
+        self._written_data = None
 
     @property
     def unique_id(self):
@@ -199,13 +275,24 @@ class NWSDetailedForecast(SingleCoordinatorWeatherEntity[WeatherUpdateCoordinato
         """Determine supported features based on available data sets reported by WeatherKit."""
         features = WeatherEntityFeature(0)
 
-        features |= WeatherEntityFeature.FORECAST_TWICEDAILY
+        features |= WeatherEntityFeature.FORECAST_TWICE_DAILY
         return features
 
     @property
     def available(self):
         """Return if weather data is available from PirateWeather."""
-        return self._weather_coordinator.data is not None
+        return self._weather_coordinator.data is not None or self._restored is not None
+
+    def _current_period(self) -> dict[str, Any]:
+        """Return the current conditions, observed, forecast or restored."""
+        if self._weather_coordinator.data is not None:
+            period = self._weather_coordinator.data.currently().d
+            if self._current_observation is not None:
+                return self._current_observation.current(period)
+            return period
+        if self._restored is not None:
+            return self._restored.current
+        return {}
 
     @property
     def attribution(self):
@@ -220,36 +307,59 @@ class NWSDetailedForecast(SingleCoordinatorWeatherEntity[WeatherUpdateCoordinato
     @property
     def native_temperature(self):
         """Return the temperature."""
-        temperature = self._weather_coordinator.data.currently().d.get("temperature")
+        temperature = self._current_period().get("temperature")
+        if temperature is None:
+            return None
 
         return round(temperature, 2)
 
+    @property
+    def native_apparent_temperature(self):
+        """Return the apparent temperature derived at ingest."""
+        return self._current_period().get(ATTR_API_FEELS_LIKE_TEMPERATURE)
+
     @property
     def relativeHumidity(self):
         """Return the humidity."""
-        humidity = self._weather_coordinator.data.currently().d.get("relativeHumidity").get("value")
+        humidity = (self._current_period().get("relativeHumidity") or {}).get("value")
 
         return humidity
 
     @property
     def native_wind_speed(self):
         """Return the wind speed."""
-        windspeed = self._weather_coordinator.data.currently().d.get("windSpeed")
+        return self._current_period().get(ATTR_API_WIND_SPEED_MEAN)
+
+    @property
+    def native_wind_speed_unit(self):
+        """Return the unit the wind speed was parsed in."""
+        return (
+            self._current_period().get(ATTR_API_WIND_SPEED_UNIT)
+            or UnitOfSpeed.MILES_PER_HOUR
+        )
+
+    @property
+    def wind_bearing(self):
+        """Return the wind bearing in degrees."""
+        return self._current_period().get(ATTR_API_WIND_BEARING)
 
     @property
     def windDirection(self):
         """Return the wind bearing."""
-        return self._weather_coordinator.data.currently().d.get("windDirection")
+        return self._current_period().get("windDirection")
 
     @property
     def condition(self):
         """Return the weather condition."""
-
-        return self._weather_coordinator.data.currently().d.get("shortForecast")
+        return MAP_CONDITION.get(self._current_period().get(ATTR_API_CONDITION_KEY))
 
     @callback
-    def _async_forecast_twicedaily(self) -> list[Forecast] | None:
+    def _async_forecast_twice_daily(self) -> list[Forecast] | None:
         """Return the twicedaily forecast."""
+        if self._weather_coordinator.data is None:
+            if self._restored is not None:
+                return self._restored.forecast_twicedaily
+            return None
         twicedaily_forecast = self._weather_coordinator.data.twicedaily().data
         if not twicedaily_forecast:
             return None
@@ -260,8 +370,69 @@ class NWSDetailedForecast(SingleCoordinatorWeatherEntity[WeatherUpdateCoordinato
         """Get the latest data from NWS and updates the states."""
         await self._weather_coordinator.async_request_refresh()
 
+    @property
+    def extra_restore_state_data(self) -> NWSDetailedForecastExtraStoredData | None:
+        """Return weather data to be restored after a restart."""
+        if self._weather_coordinator.data is None:
+            return self._restored
+
+        current = self._current_period()
+        return NWSDetailedForecastExtraStoredData(
+            {key: current.get(key) for key in RESTORE_PERIOD_KEYS},
+            self._async_forecast_twice_daily(),
+        )
+
+    async def _async_restore_state(self) -> None:
+        """Rehydrate the last known weather if it is still current."""
+        last_state = await self.async_get_last_state()
+        last_extra = await self.async_get_last_extra_data()
+        if last_state is None or last_extra is None:
+            return
+
+        restored = NWSDetailedForecastExtraStoredData.from_dict(last_extra.as_dict())
+        if restored is None:
+            return
+
+        now = dt_util.utcnow()
+        if now - last_state.last_updated > RESTORE_STATE_MAX_AGE:
+            return
+        period_end = dt_util.parse_datetime(restored.current.get("endTime") or "")
+        if period_end is not None and period_end < now:
+            return
+
+        self._restored = restored
+
     async def async_added_to_hass(self) -> None:
         """Connect to dispatcher listening for entity data notifications."""
+        if self._weather_coordinator.data is None:
+            await self._async_restore_state()
+
         self.async_on_remove(
-            self._weather_coordinator.async_add_listener(self.async_write_ha_state)
+            self._weather_coordinator.async_add_listener(self._handle_coordinator_update)
         )
+        if self._current_observation is not None:
+            self.async_on_remove(
+                self._current_observation.async_add_listener(
+                    self._handle_coordinator_update
+                )
+            )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Drop restored data once real data has arrived and write state."""
+        data = self._weather_coordinator.data
+        stats = self._weather_coordinator.perf_stats
+        if data is not None:
+            self._restored = None
+            if self._current_observation is not None:
+                data = (data, self._current_observation.period())
+
+        # A 304 or failed refresh hands back the same forecast object
+        if data is not None and data == self._written_data:
+            stats.increment("state_writes_skipped")
+            return
+
+        with stats.timer("state_write"):
+            super()._handle_coordinator_update()
+        stats.increment("state_writes")
+        self._written_data = data
@@ -1,32 +1,166 @@
 """Weather updater for NWS Detailed Forecast service."""
+from __future__ import annotations
+
 import logging
+import time
+from types import MappingProxyType
+from typing import Any
 
 import async_timeout
-from forecastio.models import Forecast
 import json
 import aiohttp
 
 
+from homeassistant.core import callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+import homeassistant.util.dt as dt_util
 
 
+from .api import gridpoint_url
 from .const import (
+    DEFAULT_BASE_URL,
     DOMAIN,
+    FALLBACK_MAX_AGE,
+    FORECAST_SOURCE_CACHED,
+    FORECAST_SOURCE_GRIDPOINT,
+    FORECAST_SOURCE_ZONE,
 )
+from .lookup import LookupCache
+from .metrics import PerfStats, trace_config
+from .parsing import ingest_periods
+from .pipeline import LoopClock, TransformPipeline
+from .zones import async_zone_fallback
 
 _LOGGER = logging.getLogger(__name__)
 
 ATTRIBUTION = "Powered by the National Weather Service"
 
 
+class ForecastPeriod:
+    """One forecast period, with its fields readable as attributes."""
+
+    def __init__(self, d: dict[str, Any]) -> None:
+        """Initialize the period."""
+        self.d = d
+
+    def __getattr__(self, name: str) -> Any:
+        """Return a field of the period."""
+        try:
+            return self.d[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+
+class ForecastBlock:
+    """A run of forecast periods."""
+
+    def __init__(self, d: dict[str, Any] | None = None) -> None:
+        """Wrap the periods of the block."""
+        d = d or {}
+        self.summary = d.get("summary")
+        self.icon = d.get("icon")
+        self.data = [ForecastPeriod(period) for period in d.get("data", [])]
+
+
+def _centroid(geometry: dict[str, Any] | None) -> tuple[float, float] | None:
+    """Return the latitude and longitude at the middle of a forecast polygon."""
+    if not geometry or geometry.get("type") != "Polygon":
+        return None
+    ring = geometry["coordinates"][0][:-1]
+    if not ring:
+        return None
+    return (
+        sum(vertex[1] for vertex in ring) / len(ring),
+        sum(vertex[0] for vertex in ring) / len(ring),
+    )
+
+
+class NWSForecast:
+    """Forecast model exposing the NWS gridpoint forecast periods.
+
+    Replaces the python-forecastio models this was built on, which pulled
+    in requests for an HTTP client the integration never used.
+    """
+
+    def __init__(
+        self, data, response=None, headers=None, source=FORECAST_SOURCE_GRIDPOINT
+    ):
+        """Wrap the periods once so entity reads do not rebuild them.
+
+        Only the periods, update time and the middle of the geometry are
+        kept; the polygon, the rest of the payload and the response headers
+        are dropped with the response.
+        """
+        self.response = response
+        self.source = source
+        self.point = _centroid(data.get("geometry"))
+        properties = data.get("properties", {})
+        self.update_time = properties.get("updateTime")
+        self._twicedaily = ForecastBlock({"data": properties.get("periods", [])})
+        # Built with the model in the executor, set once before it is published
+        self.products: MappingProxyType[str, Any] = MappingProxyType({})
+
+    def twicedaily(self):
+        """Return the twice daily (day/night) forecast periods."""
+        return self._twicedaily
+
+    def daily(self):
+        """Return the twice daily periods, NWS has no separate daily block."""
+        return self._twicedaily
+
+    def currently(self):
+        """Return the period in effect now."""
+        if not self._twicedaily.data:
+            return ForecastPeriod({})
+        return self._twicedaily.data[0]
+
+    def alerts(self):
+        """Return the alerts, which the NWS forecast endpoint does not carry."""
+        return []
+
+
+def _ingest(data: dict[str, Any]) -> dict[str, Any]:
+    ingest_periods(data.get("properties", {}).get("periods", []))
+    return data
+
+
+def _zone_model(data: dict[str, Any]) -> NWSForecast:
+    return NWSForecast(data, source=FORECAST_SOURCE_ZONE)
+
+
+# Response body to model, run in the executor
+FORECAST_STAGES = [
+    ("json_parse", json.loads),
+    ("ingest", _ingest),
+    ("model", NWSForecast),
+]
+# A zone forecast is parsed and ingested when it is fetched
+ZONE_STAGES = [("model", _zone_model)]
+
+
 class WeatherUpdateCoordinator(DataUpdateCoordinator):
     """Weather data update coordinator."""
 
-    def __init__(self, api_key, station, grid, pw_scan_Int, hass):
-        """Initialize coordinator."""
+    def __init__(
+        self,
+        api_key,
+        station,
+        grid,
+        pw_scan_Int,
+        hass,
+        base_url=DEFAULT_BASE_URL,
+        zone_cache: LookupCache | None = None,
+    ):
+        """Initialize coordinator.
+
+        With a zone cache, a failed gridpoint forecast falls back to the
+        public zone forecast, shared by every entry in the zone, and then
+        to the last good forecast.
+        """
         self._api_key = api_key
         self.station = station
         self.grid = grid
+        self.base_url = base_url
         self.pw_scan_Int = pw_scan_Int
 
         self.data = None
@@ -35,42 +169,209 @@ class WeatherUpdateCoordinator(DataUpdateCoordinator):
         self.daily = None
         self._connect_error = False
 
+        self.perf_stats = PerfStats()
+        self._trace_config = trace_config(self.perf_stats)
+        self._etag = None
+        self._last_modified = None
+        self._fetch = {}
+        self._consecutive_failures = 0
+        self._zone_cache = zone_cache
+        # Tier that served the last update, and when one last succeeded
+        self.source: str | None = None
+        self._last_good = 0.0
+        # The last gridpoint forecast, which a 304 answer refers to
+        self._gridpoint_data: NWSForecast | None = None
+        self._zone_data: tuple[dict[str, Any], NWSForecast] | None = None
+        # Decoding, ingest and the model run in the executor, the loop only
+        # publishes the result
+        self.pipeline = TransformPipeline(FORECAST_STAGES)
+        self._loop_blocked: float | None = None
+
         super().__init__(hass, _LOGGER, name=DOMAIN, update_interval=pw_scan_Int)
 
     async def _async_update_data(self):
         """Update the data."""
         data = {}
-        async with async_timeout.timeout(60):
+        update_start = time.perf_counter()
+        clock = LoopClock()
+        self._fetch = fetch = {
+            "time": dt_util.utcnow().isoformat(),
+            "status": None,
+            "retries": self._consecutive_failures,
+        }
+        try:
             try:
-                data = await self._get_pw_weather()
+                async with async_timeout.timeout(60):
+                    data = await self._get_pw_weather(clock)
                 _LOGGER.info(
                     "NWS Detailed Update data update for "
                     + str(self.station)
                     + ","
                     + str(self.grid)
                 )
+                self.source = FORECAST_SOURCE_GRIDPOINT
+                self._last_good = time.monotonic()
+                self._consecutive_failures = 0
             except Exception as err:
-                raise UpdateFailed(f"Error communicating with API: {err}")
+                self.perf_stats.increment("errors")
+                self._consecutive_failures += 1
+                fetch["error"] = str(err)
+                fetch["status"] = getattr(err, "status", fetch["status"])
+                self._record_error_response(err)
+                data = await self._async_fallback(err, clock)
+            fetch["source"] = self.source
+        finally:
+            fetch["duration"] = time.perf_counter() - update_start
+            # Entities are written after this returns, publishing adds that
+            self._loop_blocked = fetch["loop_blocked"] = clock.blocked()
+            fetch["update_interval"] = self.update_interval.total_seconds()
+            fetch["next_refresh"] = (
+                dt_util.utcnow() + self.update_interval
+            ).isoformat()
+            self.perf_stats.fetches.append(fetch)
+
+        self.perf_stats.observe("update", fetch["duration"])
+        return data
+
+    async def _async_fallback(self, err: Exception, clock: LoopClock) -> NWSForecast:
+        """Return the forecast of the next tier after the gridpoint failed."""
+        if self._zone_cache is not None:
+            try:
+                async with async_timeout.timeout(60):
+                    properties = await clock.wait(
+                        async_zone_fallback(
+                            self.hass,
+                            self._zone_cache,
+                            str(self.station),
+                            str(self.grid),
+                            self.base_url,
+                        )
+                    )
+                # Entries in the zone share its forecast until it expires,
+                # keep the same model meanwhile so entities skip writes
+                if self._zone_data is None or self._zone_data[0] is not properties:
+                    self._zone_data = (
+                        properties,
+                        await clock.wait(
+                            self._async_transform(
+                                {"properties": properties}, ZONE_STAGES
+                            )
+                        ),
+                    )
+            except Exception as zone_err:  # pylint: disable=broad-except
+                self.perf_stats.increment("zone_errors")
+                _LOGGER.debug(
+                    "Zone forecast of %s,%s failed: %s", self.station, self.grid, zone_err
+                )
+            else:
+                self.perf_stats.increment("fallback_zone")
+                self.source = FORECAST_SOURCE_ZONE
+                self._last_good = time.monotonic()
+                return self._zone_data[1]
+
+        if (
+            self.data is not None
+            and time.monotonic() - self._last_good < FALLBACK_MAX_AGE.total_seconds()
+        ):
+            self.perf_stats.increment("fallback_cached")
+            self.source = FORECAST_SOURCE_CACHED
+            return self.data
+        raise UpdateFailed(f"Error communicating with API: {err}") from err
+
+    @property
+    def consecutive_failures(self) -> int:
+        """Return the number of failed updates in a row."""
+        return self._consecutive_failures
+
+    def _record_error_response(self, err: Exception) -> None:
+        """Count an error status and any wait NWS asked for."""
+        status = getattr(err, "status", None)
+        if status is None:
+            return
+        self.perf_stats.statuses[status] += 1
+
+        headers = getattr(err, "headers", None) or {}
+        retry_after = headers.get(aiohttp.hdrs.RETRY_AFTER)
+        if retry_after is not None and retry_after.isdigit():
+            self.perf_stats.increment("rate_limited")
+            self.perf_stats.set("rate_limit_wait", int(retry_after))
+
+    async def _async_transform(self, value, stages=None) -> NWSForecast:
+        """Return the model built from value in the executor, with its products."""
+        data, products = await self.pipeline.async_run(
+            self.hass, self.perf_stats, value, stages
+        )
+        data.products = products
         return data
 
-    async def _get_pw_weather(self):
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all listeners and record how many entities wrote state.
+
+        After an update, the time entities took to publish it is added to
+        the time the update blocked the event loop.
+        """
+        stats = self.perf_stats
+        writes_before = stats.counters["state_writes"]
+        with stats.timer("publish"):
+            super().async_update_listeners()
+        stats.set("entities_updated", stats.counters["state_writes"] - writes_before)
+        if self._loop_blocked is not None:
+            blocked = self._loop_blocked + stats.last("publish")
+            self._loop_blocked = None
+            stats.observe("loop_blocked", blocked)
+            if self._fetch:
+                self._fetch["loop_blocked"] = blocked
+
+    async def _get_pw_weather(self, clock: LoopClock):
         """Poll weather data from NWS."""
 
-        forecastString = (
-            "https://api.weather.gov/gridpoints/"
-            + str(self.station)
-            + "/"
-            + str(self.grid)
-            + "/forecast"
+        forecastString = gridpoint_url(
+            str(self.station), str(self.grid), base_url=self.base_url
         )
 
-        async with aiohttp.ClientSession(raise_for_status=True) as session, session.get(
-            forecastString
-        ) as resp:
-            resptext = await resp.text()
-            jsonText = json.loads(resptext)
-            headers = resp.headers
-            status = resp.raise_for_status()
+        # Ask NWS to answer 304 when the forecast has not been reissued
+        request_headers = {}
+        if self._gridpoint_data is not None:
+            if self._etag:
+                request_headers[aiohttp.hdrs.IF_NONE_MATCH] = self._etag
+            if self._last_modified:
+                request_headers[aiohttp.hdrs.IF_MODIFIED_SINCE] = self._last_modified
+
+        stats = self.perf_stats
+        stats.increment("requests")
+        session = aiohttp.ClientSession(
+            raise_for_status=True, trace_configs=[self._trace_config]
+        )
+        try:
+            async with await clock.wait(
+                session.get(forecastString, headers=request_headers)
+            ) as resp:
+                self._fetch["status"] = resp.status
+                stats.statuses[resp.status] += 1
+                if resp.status == 304:
+                    stats.increment("not_modified")
+                    return self._gridpoint_data
+
+                with stats.timer("download"):
+                    body = await clock.wait(resp.read())
+                stats.increment("bytes", len(body))
+                stats.set("response_size", len(body))
+                self._fetch["bytes"] = len(body)
+                self._fetch["download"] = stats.last("download")
+                headers = resp.headers
+        finally:
+            await clock.wait(session.close())
+
+        data = await clock.wait(self._async_transform(body))
+        # Parsing is the work of the stages, without the wait for a worker
+        stats.observe(
+            "parse", sum(stats.last(name) for name, _ in self.pipeline.stages)
+        )
+        self._fetch["parse"] = stats.last("parse")
+        self._fetch["executor"] = stats.last("executor")
 
-            data = Forecast(jsonText, status, headers)
+        self._gridpoint_data = data
+        self._etag = headers.get(aiohttp.hdrs.ETAG)
+        self._last_modified = headers.get(aiohttp.hdrs.LAST_MODIFIED)
         return data
\ No newline at end of file
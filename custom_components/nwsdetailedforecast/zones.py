@@ -0,0 +1,193 @@
+"""Public zone forecasts, the fallback when a gridpoint forecast fails."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import re
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+import homeassistant.util.dt as dt_util
+
+from .api import gridpoint_url, zone_forecast_url
+from .const import (
+    ATTR_API_DETAILEDFORECAST,
+    ATTR_API_ISDAYTIME,
+    ATTR_API_NWSICONURL,
+    ATTR_API_SHORTFORECAST,
+    ATTR_API_STARTTIME,
+    ATTR_API_WIND_DIRECTION,
+    ATTR_API_WIND_SPEED,
+    LOOKUP_MAX_TTL,
+)
+from .lookup import LookupCache, response_ttl
+from .observations import async_get_json
+from .parsing import ingest_periods
+
+# Local hours day periods start and end at
+DAY_START = 6
+NIGHT_START = 18
+
+# "a high near 65", "lows around 40", "highs in the mid 60s"
+_TEMPERATURE_RE = re.compile(
+    r"\b(?:high|low)s?\b[^.]*?(?:\b(lower|mid|upper)\s+)?(\d+)(s)?\b", re.IGNORECASE
+)
+_DECADE_OFFSETS = {None: 5, "lower": 2, "mid": 5, "upper": 8}
+_PRECIPITATION_RE = re.compile(r"(\d+)\s*(?:%|percent)", re.IGNORECASE)
+
+_DIRECTIONS = {
+    "north": "N",
+    "northeast": "NE",
+    "east": "E",
+    "southeast": "SE",
+    "south": "S",
+    "southwest": "SW",
+    "west": "W",
+    "northwest": "NW",
+}
+# "Southwest wind 5 to 10 mph", "NNW winds around 15 mph"
+_WIND_RE = re.compile(
+    r"\b(" + "|".join(_DIRECTIONS) + r"|[NSEW]{1,3})\s+winds?\s+(?:around\s+)?"
+    r"(\d+(?:\s+to\s+\d+)?\s+mph)",
+    re.IGNORECASE,
+)
+_SENTENCE_RE = re.compile(r"^([^.,]+)")
+
+
+def _is_night(name: str) -> bool:
+    name = name.lower()
+    return "night" in name or "overnight" in name
+
+
+def _period_end(start: datetime, is_daytime: bool) -> datetime:
+    """Return the end of a day or night period starting at start."""
+    end = start.replace(
+        hour=NIGHT_START if is_daytime else DAY_START, minute=0, second=0, microsecond=0
+    )
+    while end <= start:
+        end += timedelta(days=1)
+    return end
+
+
+def _temperature(text: str) -> int | None:
+    if (match := _TEMPERATURE_RE.search(text)) is None:
+        return None
+    qualifier, value, decade = match.groups()
+    if decade:
+        return int(value) + _DECADE_OFFSETS[qualifier and qualifier.lower()]
+    return int(value)
+
+
+def _short_forecast(text: str) -> str | None:
+    if (match := _SENTENCE_RE.match(text.strip())) is None:
+        return None
+    return " ".join(word[:1].upper() + word[1:] for word in match.group(1).split())
+
+
+def zone_periods(
+    periods: list[dict[str, Any]], now: datetime
+) -> list[dict[str, Any]]:
+    """Return zone forecast periods in the shape of gridpoint forecast periods.
+
+    Zone periods only carry a name and text. The times follow from the day
+    and night order starting now, and the temperature, precipitation
+    chance and wind are read from the text.
+    """
+    result = []
+    start = now.replace(microsecond=0)
+    for number, zone_period in enumerate(periods, 1):
+        name = zone_period.get("name") or ""
+        text = zone_period.get(ATTR_API_DETAILEDFORECAST) or ""
+        is_daytime = not _is_night(name)
+        end = _period_end(start, is_daytime)
+        precipitation = _PRECIPITATION_RE.search(text)
+        wind = _WIND_RE.search(text)
+        result.append(
+            {
+                "number": zone_period.get("number", number),
+                "name": name,
+                ATTR_API_STARTTIME: start.isoformat(),
+                "endTime": end.isoformat(),
+                ATTR_API_ISDAYTIME: is_daytime,
+                "temperature": _temperature(text),
+                "temperatureUnit": "F",
+                "probabilityOfPrecipitation": {
+                    "unitCode": "wmoUnit:percent",
+                    "value": int(precipitation.group(1)) if precipitation else None,
+                },
+                ATTR_API_WIND_SPEED: wind.group(2) if wind else None,
+                ATTR_API_WIND_DIRECTION: _DIRECTIONS.get(
+                    wind.group(1).lower(), wind.group(1).upper()
+                )
+                if wind
+                else None,
+                ATTR_API_NWSICONURL: None,
+                ATTR_API_SHORTFORECAST: _short_forecast(text),
+                ATTR_API_DETAILEDFORECAST: text,
+            }
+        )
+        start = end
+    ingest_periods(result)
+    return result
+
+
+async def async_forecast_zone(
+    hass: HomeAssistant, cache: LookupCache, station: str, grid: str, base_url: str
+) -> dict[str, Any]:
+    """Return the public forecast zone and time zone of a gridpoint."""
+
+    async def fetch() -> tuple[dict[str, Any], float]:
+        _, stations, _ = await async_get_json(
+            hass, gridpoint_url(station, grid, "stations", base_url)
+        )
+        features = stations.get("features") or []
+        if not features or not features[0]["properties"].get("forecast"):
+            raise KeyError("forecast zone")
+        properties = features[0]["properties"]
+        return {
+            "zone": properties["forecast"].rstrip("/").rsplit("/", 1)[-1],
+            "time_zone": properties.get("timeZone"),
+        }, LOOKUP_MAX_TTL.total_seconds()
+
+    return await cache.async_get(("forecast_zone", base_url, station, grid), fetch)
+
+
+async def async_zone_forecast(
+    hass: HomeAssistant,
+    cache: LookupCache,
+    zone: str,
+    time_zone: str | None,
+    base_url: str,
+) -> dict[str, Any]:
+    """Return the periods of a zone forecast, fetched once for every entry in it."""
+
+    async def fetch() -> tuple[dict[str, Any], float]:
+        _, payload, headers = await async_get_json(
+            hass, zone_forecast_url(zone, base_url)
+        )
+        properties = payload.get("properties") or {}
+        tzinfo = dt_util.get_time_zone(time_zone or "") or dt_util.DEFAULT_TIME_ZONE
+        # Reading the text is the costly part, keep it off the event loop
+        periods = await hass.async_add_executor_job(
+            zone_periods, properties.get("periods") or [], dt_util.now(tzinfo)
+        )
+        return {
+            "updateTime": properties.get("updated"),
+            "periods": periods,
+        }, response_ttl(headers, dt_util.utcnow().timestamp())
+
+    return await cache.async_get(("zone", base_url, zone), fetch)
+
+
+async def async_zone_fallback(
+    hass: HomeAssistant, cache: LookupCache, station: str, grid: str, base_url: str
+) -> dict[str, Any]:
+    """Return the zone forecast covering a gridpoint as forecast properties.
+
+    Raises aiohttp.ClientError, asyncio.TimeoutError or KeyError when the
+    zone or its forecast is not available.
+    """
+    zone = await async_forecast_zone(hass, cache, station, grid, base_url)
+    return await async_zone_forecast(
+        hass, cache, zone["zone"], zone["time_zone"], base_url
+    )
+
@@ -0,0 +1 @@
+"""Tests for the NWS Detailed Forecast integration."""
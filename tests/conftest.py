@@ -0,0 +1,48 @@
+"""Shared fixtures for the NWS Detailed Forecast tests."""
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+import sys
+from zoneinfo import ZoneInfo
+
+import pytest
+
+# custom_components is imported from the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.nwsdetailedforecast.zones import zone_periods  # noqa: E402
+
+NEW_YORK = ZoneInfo("America/New_York")
+
+ZONE_PERIODS = [
+    {
+        "number": 1,
+        "name": "Today",
+        "detailedForecast": (
+            "Mostly sunny, with a high near 65. Southwest wind 5 to 10 mph."
+        ),
+    },
+    {
+        "number": 2,
+        "name": "Tonight",
+        "detailedForecast": (
+            "A chance of showers. Mostly cloudy, with a low around 40. "
+            "Chance of precipitation is 30%."
+        ),
+    },
+    {
+        "number": 3,
+        "name": "Tuesday",
+        "detailedForecast": "Sunny, with highs in the upper 60s. NNW winds around 15 mph.",
+    },
+]
+
+
+@pytest.fixture
+def zone_forecast() -> list[dict]:
+    """Return zone forecast periods read at 2 PM Eastern."""
+    return zone_periods(
+        [dict(period) for period in ZONE_PERIODS],
+        datetime(2024, 5, 6, 14, 0, tzinfo=NEW_YORK),
+    )
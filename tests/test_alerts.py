@@ -0,0 +1,132 @@
+"""Tests for matching alerts to locations."""
+from custom_components.nwsdetailedforecast.alerts import AlertIndex
+
+SQUARE = [[-78.0, 40.0], [-76.0, 40.0], [-76.0, 42.0], [-78.0, 42.0], [-78.0, 40.0]]
+HOLE = [[-77.2, 40.8], [-76.8, 40.8], [-76.8, 41.2], [-77.2, 41.2], [-77.2, 40.8]]
+# A triangle whose bounding box covers points outside it
+TRIANGLE = [[-74.0, 40.0], [-72.0, 40.0], [-74.0, 42.0], [-74.0, 40.0]]
+# Spanning more grid cells than are indexed
+WIDE = [[-110.0, 30.0], [-90.0, 30.0], [-90.0, 50.0], [-110.0, 50.0], [-110.0, 30.0]]
+MULTIPOLYGON = {"type": "MultiPolygon", "coordinates": [[SQUARE], [TRIANGLE]]}
+
+
+def _feature(event: str, geometry=None, zones=(), **properties) -> dict:
+    return {
+        "geometry": geometry,
+        "properties": {
+            "event": event,
+            "geocode": {"UGC": list(zones)},
+            **properties,
+        },
+    }
+
+
+def _polygon(*rings) -> dict:
+    return {"type": "Polygon", "coordinates": list(rings)}
+
+
+def _events(index: AlertIndex, latitude, longitude, zones=()) -> list[str]:
+    return [alert.title for alert in index.match(latitude, longitude, list(zones))]
+
+
+def test_polygon_with_hole() -> None:
+    """A point matches inside the outer ring but not inside a hole."""
+    index = AlertIndex([_feature("Flood Watch", _polygon(SQUARE, HOLE))])
+
+    assert _events(index, 40.5, -77.5) == ["Flood Watch"]
+    assert _events(index, 41.0, -77.0) == []
+    assert _events(index, 43.0, -77.0) == []
+
+
+def test_polygon_outside_in_bounding_box() -> None:
+    """A point in the bounding box but outside the polygon does not match."""
+    index = AlertIndex([_feature("Wind Advisory", _polygon(TRIANGLE))])
+
+    assert _events(index, 40.5, -73.5) == ["Wind Advisory"]
+    assert _events(index, 41.8, -72.2) == []
+
+
+def test_multipolygon() -> None:
+    """An alert matches once in any of its polygons."""
+    index = AlertIndex([_feature("Heat Advisory", MULTIPOLYGON)])
+
+    assert _events(index, 40.5, -77.5) == ["Heat Advisory"]
+    assert _events(index, 40.5, -73.5) == ["Heat Advisory"]
+
+
+def test_wide_polygon() -> None:
+    """Shapes too wide for the grid are still matched."""
+    index = AlertIndex([_feature("Red Flag Warning", _polygon(WIDE))])
+
+    assert not index._cells
+    assert _events(index, 40.0, -100.0) == ["Red Flag Warning"]
+    assert _events(index, 40.0, -80.0) == []
+
+
+def test_zone_fallback() -> None:
+    """Alerts without a polygon match the locations in their zones."""
+    index = AlertIndex(
+        [
+            _feature("Winter Storm Warning", zones=["PAZ036", "PAZ037"]),
+            _feature("Flood Watch", _polygon(SQUARE), zones=["PAZ038"]),
+        ]
+    )
+
+    assert _events(index, None, None, ["PAZ037"]) == ["Winter Storm Warning"]
+    # Zones of an alert with a polygon are not used
+    assert _events(index, 43.0, -77.0, ["PAZ038"]) == []
+
+
+def test_order_and_duplicates() -> None:
+    """Alerts matching both ways are listed once, in the order NWS sent them."""
+    index = AlertIndex(
+        [
+            _feature("Winter Storm Warning", zones=["PAZ036"]),
+            _feature("Flood Watch", _polygon(SQUARE)),
+            _feature("Heat Advisory", MULTIPOLYGON),
+        ]
+    )
+
+    assert _events(index, 40.5, -77.5, ["PAZ036", "PAZ036"]) == [
+        "Winter Storm Warning",
+        "Flood Watch",
+        "Heat Advisory",
+    ]
+
+
+def test_only_actual_alerts() -> None:
+    """Test, exercise and draft alerts are left out."""
+    index = AlertIndex(
+        [
+            _feature("Tornado Warning", _polygon(SQUARE), status="Test"),
+            _feature("Flood Watch", _polygon(SQUARE), status="Actual"),
+            _feature("Wind Advisory", _polygon(SQUARE)),
+        ]
+    )
+
+    assert [alert.title for alert in index.alerts] == ["Flood Watch", "Wind Advisory"]
+    assert _events(index, 40.5, -77.5) == ["Flood Watch", "Wind Advisory"]
+
+
+def test_alert_fields() -> None:
+    """Alerts keep their headline, times and regions."""
+    index = AlertIndex(
+        [
+            _feature(
+                "Flood Watch",
+                zones=["PAZ036"],
+                headline="Flood Watch issued May 6",
+                severity="Moderate",
+                onset="2024-05-06T14:00:00-04:00",
+                expires="2024-05-07T06:00:00-04:00",
+                areaDesc="Centre; Clinton; ",
+            )
+        ]
+    )
+
+    (alert,) = index.match(None, None, ["PAZ036"])
+    assert alert.title == "Flood Watch issued May 6"
+    assert alert.severity == "Moderate"
+    assert alert.time == 1715018400
+    assert alert.expires == 1715076000
+    assert alert.regions == ["Centre", "Clinton"]
@@ -0,0 +1,138 @@
+"""Tests for the forecast archive."""
+from collections.abc import Iterator
+from datetime import timedelta
+import math
+
+import pytest
+
+from custom_components.nwsdetailedforecast.archive import (
+    NO_CONDITION,
+    ForecastArchive,
+    encode_block,
+    period_row,
+)
+
+ISSUED = 1715000000
+
+
+def _period(start: str, end: str, **fields) -> dict:
+    return {"startTime": start, "endTime": end, **fields}
+
+
+@pytest.fixture
+def archive(tmp_path) -> Iterator[ForecastArchive]:
+    """Return an empty archive in a temporary directory."""
+    archive = ForecastArchive(
+        None, None, str(tmp_path / "archive" / "grid.nwsa"), timedelta(days=7)
+    )
+    archive._load()
+    yield archive
+    archive.close()
+
+
+def test_period_row_units() -> None:
+    """Temperatures are stored in °C, wind in km/h and missing values as NaN."""
+    row = period_row(
+        _period(
+            "2024-05-06T18:00:00-04:00",
+            "2024-05-07T06:00:00-04:00",
+            temperature=50,
+            temperatureUnit="F",
+            windSpeedMean=10,
+            windSpeedUnit="mph",
+            conditionKey="no-such-condition",
+        )
+    )
+
+    assert row[0] == 1715032800
+    assert row[1] == 1715076000
+    assert row[2] == pytest.approx(10)
+    assert row[6] == pytest.approx(16.09, abs=0.01)
+    assert math.isnan(row[3])
+    assert row[8] == NO_CONDITION
+    assert row[9] == 0
+
+
+def test_period_row_invalid_time() -> None:
+    """A period without a start time cannot be archived."""
+    with pytest.raises(ValueError):
+        period_row({"endTime": "2024-05-07T06:00:00-04:00"})
+
+
+def test_encode_block_sorts_rows() -> None:
+    """Rows are packed by start time whatever their order."""
+    first = period_row(_period("2024-05-06T06:00:00Z", "2024-05-06T18:00:00Z"))
+    second = period_row(_period("2024-05-06T18:00:00Z", "2024-05-07T06:00:00Z"))
+
+    assert encode_block(ISSUED, [second, first]) == encode_block(
+        ISSUED, [first, second]
+    )
+
+
+def test_valid_at_round_trip(archive: ForecastArchive) -> None:
+    """An appended issuance decodes back to the values of the covering period."""
+    rows = [
+        period_row(
+            _period(
+                "2024-05-06T18:00:00Z",
+                "2024-05-07T06:00:00Z",
+                temperature={"value": 4.25, "unitCode": "wmoUnit:degC"},
+                conditionKey="rain",
+                isDaytime=False,
+            )
+        ),
+        period_row(
+            _period(
+                "2024-05-06T06:00:00Z",
+                "2024-05-06T18:00:00Z",
+                temperature=68,
+                temperatureUnit="F",
+                probabilityOfPrecipitation={"value": 30},
+                windBearing=225,
+                conditionKey="clear-day",
+                isDaytime=True,
+            )
+        ),
+    ]
+
+    assert archive.append(ISSUED, rows, ISSUED)
+    assert not archive.append(ISSUED, rows, ISSUED)
+    assert archive.issuances == 1
+
+    forecast = archive.valid_at(1714996800)
+    assert forecast == [
+        {
+            "start": "2024-05-06T06:00:00+00:00",
+            "end": "2024-05-06T18:00:00+00:00",
+            "temperature": 20.0,
+            "dewpoint": None,
+            "humidity": None,
+            "precipitation_probability": 30.0,
+            "wind_speed": None,
+            "wind_bearing": 225.0,
+            "condition": "clear-day",
+            "is_daytime": True,
+            "issued": "2024-05-06T12:53:20+00:00",
+        }
+    ]
+    night = archive.valid_at(1715040000)
+    assert night[0]["temperature"] == 4.25
+    assert night[0]["condition"] == "rain"
+    assert night[0]["is_daytime"] is False
+    assert archive.valid_at(1715083200) == []
+
+
+def test_reload_keeps_issuances(archive: ForecastArchive) -> None:
+    """A loaded file indexes the blocks written before it."""
+    row = period_row(_period("2024-05-06T06:00:00Z", "2024-05-06T18:00:00Z"))
+    archive.append(ISSUED, [row], ISSUED)
+    archive.append(ISSUED + 3600, [row], ISSUED)
+
+    reloaded = ForecastArchive(None, None, archive.path, timedelta(days=7))
+    reloaded._load()
+    try:
+        assert reloaded.issuances == 2
+        assert reloaded.size == archive.size
+        assert len(reloaded.valid_at(1714996800)) == 2
+    finally:
+        reloaded.close()
@@ -0,0 +1,49 @@
+"""Tests for the card payload and its deltas."""
+from custom_components.nwsdetailedforecast.card import diff_card_periods
+
+
+def _period(start: str, **fields) -> dict:
+    return {"start": start, "temperature": 60, "short_forecast": "Sunny", **fields}
+
+
+def test_diff_unchanged() -> None:
+    """Equal periods produce an empty delta."""
+    periods = [_period("09:00"), _period("18:00")]
+
+    assert diff_card_periods(periods, [dict(period) for period in periods]) == {
+        "changed": [],
+        "added": [],
+        "removed": [],
+    }
+
+
+def test_diff_changed_fields_only() -> None:
+    """A changed period lists only its changed fields and its start."""
+    old = [_period("09:00"), _period("18:00")]
+    new = [_period("09:00", temperature=62), _period("18:00")]
+
+    assert diff_card_periods(old, new)["changed"] == [
+        {"temperature": 62, "start": "09:00"}
+    ]
+
+
+def test_diff_rolling_forward() -> None:
+    """A period rolling off the front is one removal and one addition."""
+    old = [_period("06:00"), _period("18:00"), _period("06:00+1")]
+    new = [_period("18:00"), _period("06:00+1"), _period("18:00+1")]
+
+    assert diff_card_periods(old, new) == {
+        "changed": [],
+        "added": [_period("18:00+1")],
+        "removed": ["06:00"],
+    }
+
+
+def test_diff_new_field() -> None:
+    """A field the old period did not have counts as changed."""
+    old = [_period("09:00")]
+    new = [_period("09:00", icon="/api/nwsdetailedforecast/icon/abc")]
+
+    assert diff_card_periods(old, new)["changed"] == [
+        {"icon": "/api/nwsdetailedforecast/icon/abc", "start": "09:00"}
+    ]
@@ -0,0 +1,59 @@
+"""Tests for the coordinators shared by every entry."""
+import asyncio
+from datetime import timedelta
+import logging
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.nwsdetailedforecast.hub import SharedHub
+
+
+class CountingHub(SharedHub[int]):
+    """Hub counting its updates."""
+
+    async def _async_update_data(self) -> int:
+        return (self.data or 0) + 1
+
+
+def _hub(hass: HomeAssistant) -> CountingHub:
+    return CountingHub(
+        hass,
+        logging.getLogger(__name__),
+        name="nwsdetailedforecast test",
+        update_interval=timedelta(hours=1),
+    )
+
+
+def test_requests_share_a_refresh(tmp_path) -> None:
+    """Requests made together are debounced into one refresh."""
+
+    async def run() -> None:
+        hass = HomeAssistant(str(tmp_path))
+        hub = _hub(hass)
+        hub._async_schedule_request()
+        hub._async_schedule_request()
+        await asyncio.gather(*hub._refresh_tasks)
+
+        assert hub.data == 1
+        assert not hub._refresh_tasks
+        await hub.async_shutdown()
+
+    asyncio.run(run())
+
+
+def test_shutdown_cancels_requests(tmp_path) -> None:
+    """Pending refresh requests are cancelled with the hub."""
+
+    async def run() -> None:
+        hass = HomeAssistant(str(tmp_path))
+        hub = _hub(hass)
+        hub._async_schedule_request()
+        (task,) = hub._refresh_tasks
+
+        await hub.async_shutdown()
+        await asyncio.gather(task, return_exceptions=True)
+
+        assert task.cancelled()
+        assert hub.data is None
+
+    asyncio.run(run())
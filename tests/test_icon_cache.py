@@ -0,0 +1,78 @@
+"""Tests for the NWS icon disk cache."""
+import asyncio
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.nwsdetailedforecast import icon_cache
+from custom_components.nwsdetailedforecast.icon_cache import IconCache, icon_id
+
+SUNNY = "https://api.weather.gov/icons/land/day/skc?size=medium"
+RAIN = "https://api.weather.gov/icons/land/day/rain?size=medium"
+
+
+class FakeResponse:
+    """Response with a body of ten bytes."""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        pass
+
+    async def read(self) -> bytes:
+        return b"0123456789"
+
+
+class FakeSession:
+    """Session recording the URLs it was asked for."""
+
+    def __init__(self) -> None:
+        self.requested: list[str] = []
+
+    def get(self, url: str, raise_for_status: bool = False) -> FakeResponse:
+        self.requested.append(url)
+        return FakeResponse()
+
+
+def test_evicted_icon_fetched_again(tmp_path, monkeypatch) -> None:
+    """A local URL handed out before an eviction still serves its icon."""
+    session = FakeSession()
+    monkeypatch.setattr(icon_cache, "async_get_clientsession", lambda hass: session)
+
+    async def run() -> None:
+        hass = HomeAssistant(str(tmp_path))
+        cache = IconCache(hass, str(tmp_path / "icons"), max_bytes=10)
+        await cache.async_load()
+
+        cache.local_url(SUNNY)
+        assert await cache.async_path(icon_id(SUNNY))
+        # Caching a second icon evicts the first from disk
+        cache.local_url(RAIN)
+        assert await cache.async_path(icon_id(RAIN))
+        assert cache.size == 1
+
+        path = await cache.async_path(icon_id(SUNNY))
+        assert path is not None
+        assert session.requested == [SUNNY, RAIN, SUNNY]
+        assert await cache.async_path("0" * 40) is None
+
+    asyncio.run(run())
+
+
+def test_icon_urls_bounded(tmp_path, monkeypatch) -> None:
+    """Only the most recently used icon URLs are remembered."""
+    monkeypatch.setattr(icon_cache, "MAX_ICON_URLS", 2)
+    monkeypatch.setattr(
+        icon_cache, "async_get_clientsession", lambda hass: FakeSession()
+    )
+
+    async def run() -> None:
+        hass = HomeAssistant(str(tmp_path))
+        cache = IconCache(hass, str(tmp_path / "icons"))
+        for url in (SUNNY, RAIN, SUNNY, f"{RAIN}&1"):
+            cache.local_url(url)
+        await asyncio.gather(*cache._pending.values())
+
+        assert list(cache._urls.values()) == [SUNNY, f"{RAIN}&1"]
+
+    asyncio.run(run())
@@ -0,0 +1,104 @@
+"""Tests for the shared lookup cache."""
+import asyncio
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.nwsdetailedforecast.lookup import LookupCache
+
+KEY = ("forecast", "https://api.weather.gov", "PHI", "50,75", False)
+
+
+def test_coalesced_lookup_survives_cancelled_caller(tmp_path) -> None:
+    """A caller going away does not cancel the lookup the others share."""
+
+    async def run() -> None:
+        hass = HomeAssistant(str(tmp_path))
+        cache = LookupCache(hass)
+        release = asyncio.Event()
+        fetches = []
+
+        async def fetch():
+            fetches.append(KEY)
+            await release.wait()
+            return {"periods": []}, 60
+
+        first = asyncio.create_task(cache.async_get(KEY, fetch))
+        second = asyncio.create_task(cache.async_get(KEY, fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await second == {"periods": []}
+        assert first.cancelled()
+        assert fetches == [KEY]
+        assert cache.coalesced == 1
+        # The value is cached for later callers
+        assert await cache.async_get(KEY, fetch) == {"periods": []}
+        assert cache.hits == 1
+
+    asyncio.run(run())
+
+
+def test_failed_lookup_retried(tmp_path) -> None:
+    """Every caller sees a failure and the next lookup fetches again."""
+
+    async def run() -> None:
+        hass = HomeAssistant(str(tmp_path))
+        cache = LookupCache(hass)
+        results = iter([KeyError("gridId"), ({"station": "PHI"}, 60)])
+
+        async def fetch():
+            await asyncio.sleep(0)
+            if isinstance(result := next(results), Exception):
+                raise result
+            return result
+
+        failed = await asyncio.gather(
+            cache.async_get(KEY, fetch),
+            cache.async_get(KEY, fetch),
+            return_exceptions=True,
+        )
+        assert [type(result) for result in failed] == [KeyError, KeyError]
+        assert not cache._pending
+        assert await cache.async_get(KEY, fetch) == {"station": "PHI"}
+        assert cache.misses == 2
+
+    asyncio.run(run())
+
+
+def test_expired_value_fetched_again(tmp_path) -> None:
+    """A value past its time to live is fetched again."""
+
+    async def run() -> None:
+        hass = HomeAssistant(str(tmp_path))
+        cache = LookupCache(hass)
+        values = iter([1, 2])
+
+        async def fetch():
+            return next(values), 0.01
+
+        assert await cache.async_get(KEY, fetch) == 1
+        await asyncio.sleep(0.02)
+        assert await cache.async_get(KEY, fetch) == 2
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize("ttl", [0, -1])
+def test_stale_value_not_cached(tmp_path, ttl: float) -> None:
+    """A response that is already stale is returned but not kept."""
+
+    async def run() -> None:
+        hass = HomeAssistant(str(tmp_path))
+        cache = LookupCache(hass)
+
+        async def fetch():
+            return "value", ttl
+
+        assert await cache.async_get(KEY, fetch) == "value"
+        assert cache.size == 0
+
+    asyncio.run(run())
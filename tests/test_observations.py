@@ -0,0 +1,20 @@
+"""Tests for station observations and conditional requests."""
+from multidict import CIMultiDict
+
+from custom_components.nwsdetailedforecast.observations import response_validators
+
+
+def test_response_validators() -> None:
+    """The validators of a response become the headers of the next request."""
+    assert response_validators(
+        CIMultiDict(
+            {"ETag": '"abc"', "Last-Modified": "Mon, 06 May 2024 18:00:00 GMT"}
+        )
+    ) == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Mon, 06 May 2024 18:00:00 GMT",
+    }
+    assert response_validators(CIMultiDict(etag='"abc"')) == {
+        "If-None-Match": '"abc"'
+    }
+    assert response_validators({}) == {}
@@ -0,0 +1,123 @@
+"""Tests for parsing NWS forecast fields."""
+from types import SimpleNamespace
+
+import pytest
+
+from homeassistant.const import UnitOfSpeed
+
+from custom_components.nwsdetailedforecast.parsing import (
+    EMPTY_WIND_SPEED,
+    WindSpeed,
+    classify_condition,
+    ingest_periods,
+    parse_wind_speed,
+    wind_bearing,
+)
+from custom_components.nwsdetailedforecast.sensor import (
+    SENSOR_TYPES,
+    NWSDetailedForecastSensor,
+)
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("10 mph", WindSpeed(10.0, 10.0, 10.0, UnitOfSpeed.MILES_PER_HOUR)),
+        ("5 to 10 mph", WindSpeed(5.0, 10.0, 7.5, UnitOfSpeed.MILES_PER_HOUR)),
+        ("15 to 20 km/h", WindSpeed(15.0, 20.0, 17.5, UnitOfSpeed.KILOMETERS_PER_HOUR)),
+        ("12 kt", WindSpeed(12.0, 12.0, 12.0, UnitOfSpeed.KNOTS)),
+        ("2.5 m/s", WindSpeed(2.5, 2.5, 2.5, UnitOfSpeed.METERS_PER_SECOND)),
+        ("0 MPH", WindSpeed(0.0, 0.0, 0.0, UnitOfSpeed.MILES_PER_HOUR)),
+        # No unit means mph, as NWS writes it
+        ("7", WindSpeed(7.0, 7.0, 7.0, UnitOfSpeed.MILES_PER_HOUR)),
+        ("10 furlongs", WindSpeed(10.0, 10.0, 10.0, None)),
+    ],
+)
+def test_parse_wind_speed(text: str, expected: WindSpeed) -> None:
+    """Wind speed text parses into a range and its mean."""
+    assert parse_wind_speed(text) == expected
+
+
+@pytest.mark.parametrize("text", [None, "", "calm", "light and variable"])
+def test_parse_wind_speed_without_number(text: str | None) -> None:
+    """Text without a leading number has no wind speed."""
+    assert parse_wind_speed(text) is EMPTY_WIND_SPEED
+
+
+@pytest.mark.parametrize(
+    ("units", "text", "expected"),
+    [
+        ("us", "5 to 10 mph", 7.5),
+        ("si", "5 to 10 mph", pytest.approx(3.35, abs=0.01)),
+        ("us", "10 furlongs", None),
+        ("si", "10 furlongs", None),
+    ],
+)
+def test_wind_speed_sensor(units: str, text: str, expected: float | None) -> None:
+    """Parsed speeds are converted to the sensor unit, unknown units are unknown."""
+    sensor = NWSDetailedForecastSensor(
+        SimpleNamespace(data=None, last_update_success=True),
+        "windSpeed",
+        "Home",
+        "home_wind_speed",
+        0,
+        SENSOR_TYPES["windSpeed"],
+        units,
+    )
+    sensor.update_unit_of_measurement()
+    period = {"windSpeed": text}
+    ingest_periods([period])
+
+    assert sensor.get_state(period) == expected
+
+
+@pytest.mark.parametrize(
+    ("direction", "bearing"),
+    [("N", 0.0), ("ne", 45.0), (" SSW ", 202.5), ("NW", 315.0), ("", None), ("X", None)],
+)
+def test_wind_bearing(direction: str, bearing: float | None) -> None:
+    """Compass directions map to bearings."""
+    assert wind_bearing(direction) == bearing
+
+
+@pytest.mark.parametrize(
+    ("icon", "short_forecast", "is_daytime", "expected"),
+    [
+        # The icon decides when it is known
+        ("https://api.weather.gov/icons/land/day/skc?size=medium", "Sunny", True, "clear-day"),
+        ("https://api.weather.gov/icons/land/night/few", None, False, "clear-night"),
+        ("https://api.weather.gov/icons/land/day/bkn", None, True, "partly-cloudy-day"),
+        ("https://api.weather.gov/icons/land/day/ovc", None, True, "cloudy"),
+        # Of two conditions, the more likely wins
+        (
+            "https://api.weather.gov/icons/land/day/rain_showers,20/tsra_sct,40",
+            None,
+            True,
+            "thunderstorm",
+        ),
+        (
+            "https://api.weather.gov/icons/land/night/snow,60/rain_snow,30",
+            None,
+            False,
+            "snow",
+        ),
+        # The time of day comes from the icon, not the period
+        ("https://api.weather.gov/icons/land/night/sct", None, True, "partly-cloudy-night"),
+        # Unknown icons fall back to the text
+        ("https://api.weather.gov/icons/land/day/unknown", "Patchy Fog", True, "fog"),
+        (None, "Chance Rain Showers", True, "rain"),
+        (None, "Slight Chance Thunderstorms and Rain", True, "thunderstorm"),
+        (None, "Rain And Snow Likely", True, "sleet"),
+        (None, "Mostly Sunny", False, "partly-cloudy-night"),
+        (None, "Mostly Clear", True, "partly-cloudy-day"),
+        (None, "Clear", False, "clear-night"),
+        (None, "Breezy", True, "wind"),
+        (None, "Something Else", True, None),
+        (None, None, True, None),
+    ],
+)
+def test_classify_condition(
+    icon: str | None, short_forecast: str | None, is_daytime: bool, expected: str | None
+) -> None:
+    """Conditions come from the icon, then from the short forecast."""
+    assert classify_condition(icon, short_forecast, is_daytime) == expected
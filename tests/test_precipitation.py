@@ -0,0 +1,138 @@
+"""Tests for the precipitation and snowfall totals."""
+import asyncio
+from datetime import datetime, timedelta, timezone
+import json
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.nwsdetailedforecast import precipitation
+from custom_components.nwsdetailedforecast.precipitation import (
+    HOUR,
+    PrecipitationCoordinator,
+    PrecipitationTotals,
+    parse_valid_time,
+)
+
+START = 1714953600  # 2024-05-06T00:00:00Z
+
+GRIDPOINT = {
+    "quantitativePrecipitation": {
+        "uom": "wmoUnit:mm",
+        "values": [
+            {"validTime": "2024-05-06T00:00:00+00:00/PT6H", "value": 6.0},
+            {"validTime": "2024-05-06T06:00:00+00:00/PT6H", "value": None},
+            {"validTime": "2024-05-06T12:00:00+00:00/PT12H", "value": 12.0},
+        ],
+    },
+    "snowfallAmount": {
+        "uom": "wmoUnit:in",
+        "values": [{"validTime": "2024-05-06T00:00:00+00:00/PT6H", "value": 0.5}],
+    },
+}
+
+
+@pytest.mark.parametrize(
+    ("valid_time", "expected"),
+    [
+        ("2024-05-06T00:00:00+00:00/PT6H", (START, START + 6 * HOUR)),
+        ("2024-05-06T00:00:00+00:00/P1DT12H", (START, START + 36 * HOUR)),
+        ("2024-05-06T00:00:00+00:00/PT30M", (START, START + 1800)),
+        ("2024-05-06T00:00:00+00:00", None),
+        ("not a time/PT6H", None),
+    ],
+)
+def test_parse_valid_time(valid_time: str, expected) -> None:
+    """Valid times are split into their start and end epochs."""
+    assert parse_valid_time(valid_time) == expected
+
+
+def test_from_gridpoint_spans() -> None:
+    """The totals run from the first to the last hour of the layers."""
+    totals = PrecipitationTotals.from_gridpoint(GRIDPOINT)
+
+    assert totals.start == START
+    assert totals.hours == 24
+    assert totals.end == START + 24 * HOUR
+
+
+@pytest.mark.parametrize(
+    ("name", "start", "end", "expected"),
+    [
+        ("precipitation", 0, 24, 18.0),
+        ("precipitation", 0, 3, 3.0),
+        ("precipitation", 6, 12, 0.0),
+        ("precipitation", 11.5, 12.5, 0.5),
+        ("precipitation", -6, 3, 3.0),
+        ("precipitation", 18, 30, 6.0),
+        ("snowfall", 0, 24, 12.7),
+    ],
+)
+def test_total(name: str, start: float, end: float, expected: float) -> None:
+    """Amounts are spread evenly over their hours and converted to millimetres."""
+    totals = PrecipitationTotals.from_gridpoint(GRIDPOINT)
+
+    assert totals.total(
+        name, START + start * HOUR, START + end * HOUR
+    ) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize(("start", "end"), [(-6, 0), (24, 30), (6, 6), (6, 3)])
+def test_total_outside_forecast(start: float, end: float) -> None:
+    """A window not overlapping the forecast has no total."""
+    totals = PrecipitationTotals.from_gridpoint(GRIDPOINT)
+
+    assert (
+        totals.total("precipitation", START + start * HOUR, START + end * HOUR)
+        is None
+    )
+
+
+def test_from_gridpoint_empty() -> None:
+    """A gridpoint without amounts has no totals."""
+    totals = PrecipitationTotals.from_gridpoint({})
+
+    assert totals.hours == 0
+    assert totals.total("precipitation", 0, HOUR) is None
+
+
+def test_window() -> None:
+    """A window reports rounded totals and whether the forecast covers it."""
+    totals = PrecipitationTotals.from_gridpoint(GRIDPOINT)
+    now = datetime(2024, 5, 6, 20, tzinfo=timezone.utc)
+
+    assert totals.window(2, now) == {
+        "precipitation": 2.0,
+        "snowfall": 0.0,
+        "start": "2024-05-06T20:00:00+00:00",
+        "end": "2024-05-06T22:00:00+00:00",
+        "complete": True,
+    }
+    assert totals.window(6, now)["complete"] is False
+
+
+def test_polls_without_sensors(tmp_path, monkeypatch) -> None:
+    """The coordinator keeps fetching every interval with no sensor listening."""
+    fetches = []
+
+    async def get_json(hass, url, params=None, headers=None, decode=True):
+        fetches.append(url)
+        return 200, json.dumps({"properties": GRIDPOINT}).encode(), {}
+
+    monkeypatch.setattr(precipitation, "async_get_json", get_json)
+
+    async def run() -> None:
+        hass = HomeAssistant(str(tmp_path))
+        coordinator = PrecipitationCoordinator(hass, "PHI", "50,75")
+        coordinator.update_interval = timedelta(milliseconds=10)
+        stop = coordinator.async_start()
+        await coordinator.async_refresh()
+        async with asyncio.timeout(10):
+            while len(fetches) < 3:
+                await asyncio.sleep(0.01)
+        stop()
+        await coordinator.async_shutdown()
+        assert coordinator.data.total("precipitation", START, START + 24 * HOUR) == 18
+
+    asyncio.run(run())
@@ -0,0 +1,53 @@
+"""Tests for the forecast sensors before their first update."""
+from types import SimpleNamespace
+
+from custom_components.nwsdetailedforecast.sensor import (
+    SENSOR_TYPES,
+    NWSDetailedForecastSensor,
+    NWSDetailedForecastSensorExtraStoredData,
+)
+
+
+def _sensor(condition: str, forecast_twicedaily: int | None = 0):
+    coordinator = SimpleNamespace(data=None, last_update_success=True)
+    return NWSDetailedForecastSensor(
+        coordinator,
+        condition,
+        "Home",
+        f"home_{condition}",
+        forecast_twicedaily,
+        SENSOR_TYPES[condition],
+        "us",
+    )
+
+
+def test_no_data_and_nothing_restored() -> None:
+    """Without data or a restored value there is nothing to store."""
+    sensor = _sensor("temperature")
+
+    assert sensor.extra_restore_state_data is None
+    assert not sensor.available
+
+
+def test_no_data_keeps_restored_value() -> None:
+    """A restored value is stored again until the first update."""
+    sensor = _sensor("temperature")
+    sensor._restored = NWSDetailedForecastSensorExtraStoredData(
+        61, "°F", 1, "Today", "2024-05-06T18:00:00-04:00"
+    )
+
+    assert sensor.extra_restore_state_data is sensor._restored
+    assert sensor.native_value == 61
+
+
+def test_restored_alerts_attributes() -> None:
+    """A restored alerts sensor has attributes before the alerts are known."""
+    sensor = _sensor("alerts", None)
+    sensor._restored = NWSDetailedForecastSensorExtraStoredData(
+        2, None, None, None, None
+    )
+
+    assert sensor.native_value == 2
+    assert sensor.extra_state_attributes == {
+        "attribution": "Powered by the National Weather Service"
+    }
@@ -0,0 +1,62 @@
+"""Tests for the card websocket subscription."""
+from types import SimpleNamespace
+
+from custom_components.nwsdetailedforecast.card import CardPayloadCache
+from custom_components.nwsdetailedforecast.pipeline import TransformPipeline
+from custom_components.nwsdetailedforecast.subscription import CardSubscription
+
+
+class FakeConnection:
+    """Websocket connection recording what is sent."""
+
+    def __init__(self) -> None:
+        self.subscriptions = {}
+        self.messages = []
+        self.errors = []
+
+    def send_message(self, message) -> None:
+        self.messages.append(message)
+
+    def send_error(self, msg_id, code, message) -> None:
+        self.errors.append((msg_id, code))
+
+
+def _card_cache() -> CardPayloadCache:
+    listeners = []
+    coordinator = SimpleNamespace(
+        data=None,
+        pipeline=TransformPipeline([]),
+        async_add_listener=lambda update: listeners.append(update)
+        or (lambda: listeners.remove(update)),
+    )
+    return CardPayloadCache(coordinator, None)
+
+
+def test_stopping_the_cache_ends_subscriptions() -> None:
+    """Subscribers of an unloaded entry are told to subscribe again."""
+    card_cache = _card_cache()
+    stop = card_cache.async_start()
+    connection = FakeConnection()
+    subscription = CardSubscription(None, connection, 7, card_cache)
+    connection.subscriptions[7] = subscription.async_stop
+    subscription.async_start()
+
+    stop()
+
+    assert connection.errors == [(7, "home_assistant_error")]
+    assert 7 not in connection.subscriptions
+    assert not card_cache._listeners
+
+
+def test_unsubscribed_before_stop() -> None:
+    """A subscription that ended on its own gets no error."""
+    card_cache = _card_cache()
+    stop = card_cache.async_start()
+    connection = FakeConnection()
+    subscription = CardSubscription(None, connection, 7, card_cache)
+    subscription.async_start()
+    subscription.async_stop()
+
+    stop()
+
+    assert connection.errors == []
@@ -0,0 +1,70 @@
+"""Tests for scoring archived forecasts against observations."""
+from array import array
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.nwsdetailedforecast.verification import ForecastVerifier
+
+START = 1714996800  # 2024-05-06T12:00:00Z
+HOUR = 3600
+
+# One day period forecast 20 °C with a 30% chance of precipitation
+BATCH = {
+    "start": array("q", [START]),
+    "end": array("q", [START + 12 * HOUR]),
+    "temperature": array("f", [20.0]),
+    "precipitation_probability": array("f", [30.0]),
+    "is_daytime": array("B", [1]),
+    "issued": array("q", [START - 6 * HOUR]),
+}
+# Hourly observations peaking at 18 °C without precipitation
+ROWS = [(START + hour * HOUR, 18.0 - abs(hour - 6), 0) for hour in range(13)]
+
+
+def test_scores_published_on_loop(tmp_path) -> None:
+    """Scores are built in a copy and only replace the statistics on the loop."""
+
+    async def run() -> None:
+        hass = HomeAssistant(str(tmp_path))
+        archive = SimpleNamespace(ended_between=lambda after, until, names: BATCH)
+        verifier = ForecastVerifier(hass, archive, SimpleNamespace(), "verification")
+        totals = verifier._totals
+
+        result = verifier.verify(list(ROWS))
+        assert result.scored == 1
+        assert result.verified_until == START + 12 * HOUR
+        assert result.totals["abs_error"][0] == pytest.approx(2)
+        assert result.totals["brier"][0] == pytest.approx(0.09)
+        # Nothing read on the loop has changed yet
+        assert verifier._totals is totals
+        assert not any(totals["count"])
+        assert verifier.verified_until is None
+        assert verifier.periods == 0
+
+    asyncio.run(run())
+
+
+def test_verify_updates_summary(tmp_path) -> None:
+    """A verified batch of observations shows in the summary."""
+
+    async def run() -> None:
+        hass = HomeAssistant(str(tmp_path))
+        archive = SimpleNamespace(ended_between=lambda after, until, names: BATCH)
+        verifier = ForecastVerifier(hass, archive, SimpleNamespace(), "verification")
+        updates = []
+        verifier.async_add_listener(lambda: updates.append(verifier.summary()))
+
+        await verifier._async_verify(list(ROWS))
+
+        assert verifier.verified_until == START + 12 * HOUR
+        assert verifier.periods == 1
+        assert updates[0]["temperature_bias"] == pytest.approx(2)
+        assert updates[0]["precipitation_brier"] == pytest.approx(0.09)
+        assert updates[0]["leads"]["0-12h"]["samples"] == 1
+        await hass.async_block_till_done()
+
+    asyncio.run(run())
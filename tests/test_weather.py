@@ -0,0 +1,48 @@
+"""Tests for the weather entity forecast mapping."""
+from types import SimpleNamespace
+
+from custom_components.nwsdetailedforecast.const import FORECAST_SOURCE_ZONE
+from custom_components.nwsdetailedforecast.weather import NWSDetailedForecast
+from custom_components.nwsdetailedforecast.weather_update_coordinator import (
+    NWSForecast,
+)
+
+
+def _entity(data) -> NWSDetailedForecast:
+    coordinator = SimpleNamespace(data=data, last_update_success=True)
+    return NWSDetailedForecast("Home", "home", "twicedaily", coordinator)
+
+
+def test_zone_forecast_maps_without_humidity(zone_forecast) -> None:
+    """Zone periods have no humidity or precipitation quantity objects."""
+    entity = _entity(
+        NWSForecast({"properties": {"periods": zone_forecast}}, source=FORECAST_SOURCE_ZONE)
+    )
+
+    forecast = entity._async_forecast_twice_daily()
+
+    assert [period["native_temperature"] for period in forecast] == [65, 40, 68]
+    assert [period["is_daytime"] for period in forecast] == [True, False, True]
+    assert forecast[0]["humidity"] is None
+    assert [period["precipitation_probability"] for period in forecast] == [
+        None,
+        30,
+        None,
+    ]
+    assert forecast[0]["condition"] == "partlycloudy"
+
+
+def test_zone_forecast_restore_data(zone_forecast) -> None:
+    """Restore data of a zone forecast serializes its forecast."""
+    entity = _entity(
+        NWSForecast({"properties": {"periods": zone_forecast}}, source=FORECAST_SOURCE_ZONE)
+    )
+
+    stored = entity.extra_restore_state_data.as_dict()
+
+    assert len(stored["forecast_twicedaily"]) == 3
+
+
+def test_no_data_restores_nothing() -> None:
+    """Before the first update there is nothing to store."""
+    assert _entity(None).extra_restore_state_data is None
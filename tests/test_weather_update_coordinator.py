@@ -0,0 +1,87 @@
+"""Tests for the forecast fallback tiers of the weather coordinator."""
+import asyncio
+from datetime import timedelta
+import json
+import time
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from custom_components.nwsdetailedforecast import weather_update_coordinator
+from custom_components.nwsdetailedforecast.const import (
+    FALLBACK_MAX_AGE,
+    FORECAST_SOURCE_CACHED,
+)
+from custom_components.nwsdetailedforecast.pipeline import LoopClock
+from custom_components.nwsdetailedforecast.weather_update_coordinator import (
+    NWSForecast,
+    WeatherUpdateCoordinator,
+)
+
+GRIDPOINT_ERROR = ValueError("gridpoint failed")
+
+
+def _run_fallback(tmp_path, last_good_age: float, transform=None):
+    """Return the coordinator, its cached forecast and the fallback result."""
+
+    async def run():
+        hass = HomeAssistant(str(tmp_path))
+        coordinator = WeatherUpdateCoordinator(
+            "key", "PHI", "50,75", timedelta(hours=1), hass, zone_cache=object()
+        )
+        coordinator.data = cached = NWSForecast({"properties": {"periods": []}})
+        coordinator._last_good = last_good = time.monotonic() - last_good_age
+        if transform is not None:
+            coordinator._async_transform = transform
+        try:
+            result = await coordinator._async_fallback(GRIDPOINT_ERROR, LoopClock())
+        except UpdateFailed as err:
+            result = err
+        assert coordinator._last_good == last_good
+        return coordinator, cached, result
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize(
+    "error",
+    [ValueError("bad body"), json.JSONDecodeError("bad", "", 0), UpdateFailed("x")],
+)
+def test_zone_fetch_errors_use_cached(tmp_path, monkeypatch, error) -> None:
+    """Any failure of the zone fetch falls through to the cached forecast."""
+
+    async def zone_fallback(*args):
+        raise error
+
+    monkeypatch.setattr(
+        weather_update_coordinator, "async_zone_fallback", zone_fallback
+    )
+
+    coordinator, cached, result = _run_fallback(tmp_path, 60)
+
+    assert result is cached
+    assert coordinator.source == FORECAST_SOURCE_CACHED
+    assert coordinator.perf_stats.counters["zone_errors"] == 1
+
+
+def test_zone_transform_error_keeps_cached_age(tmp_path, monkeypatch) -> None:
+    """A zone forecast that cannot be modelled leaves the cached one aging."""
+
+    async def zone_fallback(*args):
+        return {"periods": []}
+
+    async def transform(value, stages=None):
+        raise KeyError("periods")
+
+    monkeypatch.setattr(
+        weather_update_coordinator, "async_zone_fallback", zone_fallback
+    )
+
+    age = FALLBACK_MAX_AGE.total_seconds() + 60
+    coordinator, _, result = _run_fallback(tmp_path, age, transform)
+
+    assert isinstance(result, UpdateFailed)
+    assert result.__cause__ is GRIDPOINT_ERROR
+    assert coordinator.perf_stats.counters["zone_errors"] == 1
@@ -0,0 +1,85 @@
+"""Tests for reading zone forecasts as gridpoint periods."""
+from datetime import datetime
+
+import pytest
+
+from custom_components.nwsdetailedforecast.zones import zone_periods
+
+from .conftest import NEW_YORK
+
+
+def test_period_times(zone_forecast: list[dict]) -> None:
+    """Periods run from now and then alternate at 6 AM and 6 PM."""
+    assert [(period["startTime"], period["endTime"]) for period in zone_forecast] == [
+        ("2024-05-06T14:00:00-04:00", "2024-05-06T18:00:00-04:00"),
+        ("2024-05-06T18:00:00-04:00", "2024-05-07T06:00:00-04:00"),
+        ("2024-05-07T06:00:00-04:00", "2024-05-07T18:00:00-04:00"),
+    ]
+    assert [period["isDaytime"] for period in zone_forecast] == [True, False, True]
+
+
+def test_values_read_from_text(zone_forecast: list[dict]) -> None:
+    """Temperature, precipitation chance and wind are read from the text."""
+    assert [period["temperature"] for period in zone_forecast] == [65, 40, 68]
+    assert [
+        period["probabilityOfPrecipitation"]["value"] for period in zone_forecast
+    ] == [None, 30, None]
+    assert [period["windDirection"] for period in zone_forecast] == ["SW", None, "NNW"]
+    assert [period["windSpeed"] for period in zone_forecast] == [
+        "5 to 10 mph",
+        None,
+        "15 mph",
+    ]
+    assert [period["shortForecast"] for period in zone_forecast] == [
+        "Mostly Sunny",
+        "A Chance Of Showers",
+        "Sunny",
+    ]
+
+
+def test_periods_ingested(zone_forecast: list[dict]) -> None:
+    """Zone periods carry the fields derived for gridpoint periods."""
+    assert [period["conditionKey"] for period in zone_forecast] == [
+        "partly-cloudy-day",
+        "rain",
+        "clear-day",
+    ]
+    assert zone_forecast[0]["windSpeedMean"] == 7.5
+    assert zone_forecast[0]["windBearing"] == 225.0
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("Cloudy, with a high near 52.", 52),
+        ("Clear, with lows around 28.", 28),
+        ("Sunny, with highs in the lower 70s.", 72),
+        ("Sunny, with highs in the mid 70s.", 75),
+        ("Sunny, with highs in the 70s.", 75),
+        ("Patchy fog.", None),
+    ],
+)
+def test_temperature(text: str, expected: int | None) -> None:
+    """Exact and decade temperatures are read, absent ones are None."""
+    (period,) = zone_periods(
+        [{"name": "Today", "detailedForecast": text}],
+        datetime(2024, 5, 6, 9, 0, tzinfo=NEW_YORK),
+    )
+
+    assert period["temperature"] == expected
+
+
+def test_overnight_starts_at_night() -> None:
+    """A forecast read after midnight starts with a night period ending at 6 AM."""
+    periods = zone_periods(
+        [
+            {"name": "Overnight", "detailedForecast": "Clear."},
+            {"name": "Monday", "detailedForecast": "Sunny."},
+        ],
+        datetime(2024, 5, 6, 1, 30, tzinfo=NEW_YORK),
+    )
+
+    assert periods[0]["isDaytime"] is False
+    assert periods[0]["endTime"] == "2024-05-06T06:00:00-04:00"
+    assert periods[1]["endTime"] == "2024-05-06T18:00:00-04:00"
+    assert [period["number"] for period in periods] == [1, 2]